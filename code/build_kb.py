@@ -0,0 +1,488 @@
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# 知识库一键构建：按声明的依赖图 (DAG) 依次执行各 Linter 的抓取 / 处理脚本。
+# - 输入文件 (default.yml、ruff.json、cppcheck_rules.xml ...) 作为独立节点，缺失或 --refresh 时重新获取
+# - 每个节点以 "脚本内容 + 输入文件内容 + 上游产物内容" 的哈希判断是否需要重建
+# - 各 Linter 互不依赖，并发构建；某个 Linter 失败只跳过它的下游节点
+# - 全部完成后重新生成类别分片并执行完整性检查（只检查本次重建的 Linter，未改动数据中的已知问题不影响结果），最后打印耗时汇总
+# 脚本在 build/kb/ 工作区中运行（与手动运行时的工作目录一致），产物再同步到 skills/LintConfig/data/。
+# 用法示例:
+# python code/build_kb.py
+# python code/build_kb.py --linter RuboCop --linter Ruff --jobs 4
+# python code/build_kb.py --refresh --dry-run
+
+# --- 配置 ---
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+CRAWL_DIR = os.path.join(CODE_DIR, "crawl")
+REPO_DIR = os.path.dirname(CODE_DIR)
+SCRIPTS_DIR = os.path.join(REPO_DIR, "skills", "LintConfig", "scripts")
+DATA_DIR = os.path.join(REPO_DIR, "skills", "LintConfig", "data")
+WORKSPACE = os.path.join(REPO_DIR, "build", "kb")
+STATE_FILE = "build_state.json"
+# 抓取脚本的运行指标 (crawl/crawl_metrics.py) 统一写到这里，而不是各自工作目录下的 metrics/
+METRICS_DIR = os.path.join(REPO_DIR, "build", "metrics")
+# 以发行包为输入的 Linter，升级时修改版本号（--refresh 重新下载）
+PMD_VERSION = "7.8.0"
+CHECKSTYLE_VERSION = "10.20.1"
+
+# 每个 Linter 的构建定义:
+#   workdir : 脚本的工作目录（相对工作区）；PMD 脚本直接写 <Language>/，因此在 PMD/ 下运行
+#   inputs  : 输入文件 -> 获取方式 (url / command)，保存在 code/crawl/<dir>/ 中；
+#             command 默认取 stdout，creates 表示命令在当前目录生成单个文件（如 npm pack）
+#   steps   : 按顺序执行的脚本；network 表示需要联网抓取，只有产物缺失或 --refresh 时才重新运行
+#   produces: 步骤完成后必须存在的文件（脚本出错时往往只打印错误而退出码为 0）
+#   args    : 传给脚本的参数，{data_dir} 替换为 data/ 目录
+#   packages: 步骤读取的本机 Python 包，其版本（连同 entry_points 分组中的插件版本）参与哈希，升级后重新生成
+#   outputs : 工作区中的产物目录 -> data/ 中的目标目录
+# Pylint / Flake8 由本机安装的 pylint / flake8 在进程内生成，需先 pip install；Checkstyle 由 jar 自带的元数据生成。
+BUILDS = {
+    "ESLint": {
+        "workdir": ".",
+        # 规则 meta 从包内源码静态解析，无需安装依赖；Rule Details 与示例沿用 data/ 中已有的规则文件
+        "inputs": {"ESLint/eslint.tgz": {"command": ["npm", "pack", "eslint", "--silent"], "creates": True}},
+        "steps": [
+            {"name": "ingest", "script": "ESLint/ingest_eslint_package.py",
+             "args": ["eslint.tgz", "--previous", "{data_dir}"],
+             "inputs": ["ESLint/eslint.tgz"], "produces": ["ESLint/ESLintIndex.json", "ESLint/rules"]},
+        ],
+        "outputs": {"ESLint": "ESLint"},
+    },
+    "Biome": {
+        "workdir": ".",
+        "steps": [
+            {"name": "crawl", "script": "biome/biome_process.py", "network": True,
+             "produces": ["Biome/JavaScript/BiomeIndex.json"]},
+        ],
+        "outputs": {"Biome/JavaScript": "Biome/JavaScript"},
+    },
+    "ClangTidy": {
+        "workdir": ".",
+        "steps": [
+            {"name": "index", "script": "clang-tidy/craw_clang_tidy.py", "network": True,
+             "produces": ["ClangTidy/ClangTidyIndex.json"]},
+            {"name": "details", "script": "clang-tidy/process_clang_tidy.py", "network": True,
+             "produces": ["ClangTidy/rules"]},
+        ],
+        "outputs": {"ClangTidy": "ClangTidy"},
+    },
+    "Cppcheck": {
+        "workdir": ".",
+        "inputs": {"cppcheck/cppcheck_rules.xml": {"command": ["cppcheck", "--errorlist", "--xml"]}},
+        "steps": [
+            {"name": "process", "script": "cppcheck/process_cppcheck.py", "network": True,
+             "inputs": ["cppcheck/cppcheck_rules.xml"], "produces": ["Cppcheck/cppcheckIndex.json"]},
+        ],
+        "outputs": {"Cppcheck": "Cppcheck"},
+    },
+    "RuboCop": {
+        "workdir": ".",
+        "inputs": {
+            "RuboCop/default.yml": {
+                "url": "https://raw.githubusercontent.com/rubocop/rubocop/master/config/default.yml"},
+            "RuboCop/rubocop-rails.yml": {
+                "url": "https://raw.githubusercontent.com/rubocop/rubocop-rails/master/config/default.yml"},
+            "RuboCop/rubocop-rspec.yml": {
+                "url": "https://raw.githubusercontent.com/rubocop/rubocop-rspec/master/config/default.yml"},
+            "RuboCop/rubocop-performance.yml": {
+                "url": "https://raw.githubusercontent.com/rubocop/rubocop-performance/master/config/default.yml"},
+        },
+        "steps": [
+            {"name": "process", "script": "RuboCop/rubocop_process.py",
+             "inputs": ["RuboCop/default.yml", "RuboCop/rubocop-rails.yml", "RuboCop/rubocop-rspec.yml",
+                        "RuboCop/rubocop-performance.yml"],
+             "produces": ["RuboCop/RuboCopIndex.json"]},
+        ],
+        "outputs": {"RuboCop": "RuboCop"},
+    },
+    "Checkstyle": {
+        "workdir": ".",
+        # jar 中的 meta/checks/**/*.xml；元数据没有的可选 tokens 沿用 data/Checkstyle 中已有的规则文件
+        "inputs": {"Checkstyle/checkstyle.jar": {
+            "url": "https://repo1.maven.org/maven2/com/puppycrawl/tools/checkstyle/"
+                   f"{CHECKSTYLE_VERSION}/checkstyle-{CHECKSTYLE_VERSION}.jar"}},
+        "steps": [
+            {"name": "metadata", "script": "Checkstyle/checkstyle_process.py",
+             "args": ["checkstyle.jar", "--previous", "{data_dir}/Checkstyle"],
+             "inputs": ["Checkstyle/checkstyle.jar"],
+             "produces": ["Checkstyle/CheckstyleIndex.json", "Checkstyle/CheckstyleCompleteInformation.json"]},
+        ],
+        "outputs": {"Checkstyle": "Checkstyle"},
+    },
+    "Ruff": {
+        "workdir": ".",
+        "inputs": {
+            "ruff/ruff.json": {"url": "https://json.schemastore.org/ruff.json"},
+            "ruff/ruff_rules.json": {"command": ["ruff", "rule", "--all", "--output-format", "json"]},
+            "ruff/ruff_config.json": {"command": ["ruff", "config", "--output-format", "json"]},
+        },
+        "steps": [
+            {"name": "rules", "script": "ruff/ruff_rules.py",
+             "inputs": ["ruff/ruff.json", "ruff/ruff_rules.json", "ruff/ruff_config.json"],
+             "produces": ["Ruff/RuffIndex.json"]},
+        ],
+        "outputs": {"Ruff": "Ruff"},
+    },
+    "PMD": {
+        "workdir": "PMD",
+        # 规则与 XPath 规则的属性取自发行包 jar 中的 category XML；Java 类实现的规则沿用 data/PMD 中已有的属性表
+        "inputs": {"PMD/pmd-dist-bin.zip": {
+            "url": f"https://github.com/pmd/pmd/releases/download/pmd_releases%2F{PMD_VERSION}/pmd-dist-{PMD_VERSION}-bin.zip"}},
+        "steps": [
+            {"name": "ingest", "script": "PMD/ingest_pmd_dist.py", "args": ["pmd-dist-bin.zip", "--previous", "{data_dir}/PMD"],
+             "inputs": ["PMD/pmd-dist-bin.zip"], "produces": ["PMD/Java/PMD_JavaIndex.json"]},
+        ],
+        "outputs": {"PMD": "PMD"},
+    },
+    "Python": {
+        "workdir": ".",
+        "steps": [
+            {"name": "introspect", "script": "python/python_linters_process.py",
+             "args": ["--previous", "{data_dir}"],
+             "packages": ["pylint", "flake8", "pyflakes", "pycodestyle"],
+             "entry_points": ["flake8.extension", "flake8.report"],
+             "produces": ["Pylint/PylintIndex.json", "Flake8/Flake8Index.json"]},
+        ],
+        "outputs": {"Pylint": "Pylint", "Flake8": "Flake8"},
+    },
+    "Reek": {
+        "workdir": ".",
+        # 源码归档中的 docs/*.md 直接解析，不再逐页抓取
+        "inputs": {"reek/reek.tar.gz": {"url": "https://github.com/troessner/reek/archive/refs/heads/master.tar.gz"}},
+        "steps": [
+            {"name": "ingest", "script": "reek/ingest_reek_docs.py", "args": ["reek.tar.gz"],
+             "inputs": ["reek/reek.tar.gz"], "produces": ["Reek/ReekIndex.json", "Reek/rules"]},
+        ],
+        "outputs": {"Reek": "Reek"},
+    },
+}
+
+# 所有 Linter 完成后执行；check_kb 失败时整个构建以非零退出。scoped 的步骤只作用于本次重建的 Linter
+POST_STEPS = [
+    {"name": "shards", "command": ["shard_index.py"]},
+    {"name": "examples", "command": ["verify_mappings.py", "build"]},
+    {"name": "equivalence", "command": ["equivalence_index.py", "build"]},
+    # 最后生成：前面的步骤不修改 *Index.json，.idx 不会再变旧
+    {"name": "binary_index", "command": ["binary_index.py", "build"]},
+    {"name": "check", "command": ["check_kb.py"], "scoped": True},
+]
+
+
+# --- 哈希 ---
+def hash_file(path, h):
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+
+
+def hash_tree(path):
+    """文件或目录内容的哈希（目录按相对路径排序），不存在时返回 None"""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    if os.path.isfile(path):
+        hash_file(path, h)
+        return h.hexdigest()
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, path).encode("utf-8") + b"\0")
+            hash_file(full, h)
+    return h.hexdigest()
+
+
+def installed_versions(packages, groups=()):
+    """本机安装的包及 entry point 分组中各插件所属包的版本，未安装的包记为 missing"""
+    versions = {}
+    for package in packages:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = "missing"
+    for group in groups:
+        for ep in importlib.metadata.entry_points(group=group):
+            if ep.dist is not None:
+                versions[ep.dist.name] = ep.dist.version
+    return json.dumps(versions, sort_keys=True)
+
+
+# --- 依赖图 ---
+class Node:
+    def __init__(self, name, linter, action, deps=(), network=False, sources=(), produces=(), versions=None):
+        self.name = name
+        self.linter = linter
+        self.action = action        # 无参可调用对象，失败时抛出 RuntimeError
+        self.deps = list(deps)
+        self.network = network
+        self.sources = list(sources)    # 参与哈希的本地文件（脚本、输入）
+        self.produces = list(produces)  # 产物路径，用于 up-to-date 判断与结果哈希
+        self.versions = versions        # 无参可调用对象，返回参与哈希的本机包版本
+        self.status = "pending"
+        self.seconds = 0.0
+        self.message = ""
+
+
+def fetch_input(path, spec):
+    """下载 / 生成输入文件；先写临时文件，失败时不破坏已有输入"""
+    tmp_path = path + ".tmp"
+    if "url" in spec:
+        with urllib.request.urlopen(spec["url"], timeout=60) as resp, open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(resp, f)
+    elif spec.get("creates"):
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                subprocess.run(spec["command"], cwd=tmp, stdout=subprocess.DEVNULL, check=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                raise RuntimeError(f"{' '.join(spec['command'])} 执行失败: {e}")
+            created = os.listdir(tmp)
+            if len(created) != 1:
+                raise RuntimeError(f"{' '.join(spec['command'])} 应生成 1 个文件，实际为: {created}")
+            shutil.move(os.path.join(tmp, created[0]), tmp_path)
+    else:
+        try:
+            with open(tmp_path, 'wb') as f:
+                subprocess.run(spec["command"], stdout=f, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            os.remove(tmp_path)
+            raise RuntimeError(f"{' '.join(spec['command'])} 执行失败: {e}")
+    os.replace(tmp_path, path)
+
+
+def run_script(script, workdir, inputs, log_path, args=()):
+    """把输入文件复制到工作目录后运行抓取脚本，输出写入日志"""
+    os.makedirs(workdir, exist_ok=True)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    for rel in inputs:
+        shutil.copy2(os.path.join(CRAWL_DIR, rel), os.path.join(workdir, os.path.basename(rel)))
+    with open(log_path, 'w', encoding='utf-8') as log:
+        proc = subprocess.run([sys.executable, os.path.join(CRAWL_DIR, script), *args], cwd=workdir,
+                              stdout=log, stderr=subprocess.STDOUT,
+                              env={**os.environ, "LINTCONFIG_METRICS_DIR": METRICS_DIR})
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} 退出码 {proc.returncode}，日志: {log_path}")
+
+
+def sync_output(src, dst):
+    """
+    把工作区产物同步到 data/：复制新增或变化的文件，删除 rules/ 中已不存在的规则；
+    data/ 中其他文件（CompleteInformation、分片等）保持不变
+    """
+    changed = 0
+    for root, _, names in os.walk(src):
+        rel_root = os.path.relpath(root, src)
+        os.makedirs(os.path.join(dst, rel_root), exist_ok=True)
+        for name in names:
+            s, d = os.path.join(root, name), os.path.join(dst, rel_root, name)
+            if not os.path.exists(d) or hash_tree(s) != hash_tree(d):
+                shutil.copy2(s, d)
+                changed += 1
+        if os.path.basename(root) == "rules":
+            target = os.path.join(dst, rel_root)
+            for stale in set(os.listdir(target)) - set(names):
+                os.remove(os.path.join(target, stale))
+                changed += 1
+    return changed
+
+
+def build_graph(linters, workspace, data_dir):
+    nodes = {}
+    for linter in linters:
+        spec = BUILDS[linter]
+        workdir = os.path.normpath(os.path.join(workspace, spec["workdir"]))
+        for rel, fetch in spec.get("inputs", {}).items():
+            path = os.path.join(CRAWL_DIR, rel)
+            nodes[f"{linter}:input:{os.path.basename(rel)}"] = Node(
+                f"{linter}:input:{os.path.basename(rel)}", linter,
+                lambda path=path, fetch=fetch: fetch_input(path, fetch),
+                network=True, produces=[path])
+
+        previous = None
+        for step in spec["steps"]:
+            name = f"{linter}:{step['name']}"
+            deps = [f"{linter}:input:{os.path.basename(rel)}" for rel in step.get("inputs", [])]
+            deps += [previous] if previous else []
+            log_path = os.path.join(workspace, "logs", f"{linter}-{step['name']}.log")
+            args = [a.format(data_dir=data_dir) for a in step.get("args", [])]
+            versions = None
+            if step.get("packages"):
+                versions = lambda step=step: installed_versions(step["packages"], step.get("entry_points", ()))
+            nodes[name] = Node(
+                name, linter,
+                lambda step=step, workdir=workdir, log_path=log_path, args=args:
+                    run_script(step["script"], workdir, step.get("inputs", []), log_path, args),
+                deps=deps, network=step.get("network", False),
+                sources=[os.path.join(CRAWL_DIR, step["script"])],
+                produces=[os.path.join(workspace, p) for p in step["produces"]], versions=versions)
+            previous = name
+
+        install = f"{linter}:install"
+        pairs = [(os.path.join(workspace, s), os.path.join(data_dir, d)) for s, d in spec["outputs"].items()]
+        nodes[install] = Node(
+            install, linter,
+            lambda pairs=pairs: [sync_output(s, d) for s, d in pairs],
+            deps=[previous], produces=[d for _, d in pairs])
+    return nodes
+
+
+# --- 执行 ---
+class Builder:
+    def __init__(self, nodes, workspace, jobs, refresh, force, dry_run):
+        self.nodes = nodes
+        self.workspace = workspace
+        self.jobs = jobs
+        self.refresh = refresh
+        self.force = force
+        self.dry_run = dry_run
+        self.state_path = os.path.join(workspace, STATE_FILE)
+        self.state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        self.lock = threading.Lock()
+
+    def key(self, node):
+        """节点的输入哈希：源文件内容 + 本机包版本 + 上游节点产物的哈希"""
+        h = hashlib.sha256(node.name.encode("utf-8"))
+        for path in node.sources:
+            h.update((hash_tree(path) or "missing").encode())
+        if node.versions:
+            h.update(node.versions().encode())
+        for dep in node.deps:
+            h.update((self.state.get(dep, {}).get("result") or "missing").encode())
+        return h.hexdigest()
+
+    def up_to_date(self, node):
+        if self.force or any(not os.path.exists(p) for p in node.produces):
+            return False
+        if node.network and self.refresh:
+            return False
+        if node.name.split(":")[1] == "input":
+            # 输入文件已存在且未要求刷新
+            return True
+        return self.state.get(node.name, {}).get("key") == self.key(node)
+
+    def run_node(self, node):
+        start = time.perf_counter()
+        try:
+            if self.up_to_date(node):
+                node.status = "up-to-date"
+            elif self.dry_run:
+                node.status = "would-build"
+            else:
+                node.action()
+                missing = [p for p in node.produces if not os.path.exists(p)]
+                if missing:
+                    raise RuntimeError(f"未生成 {', '.join(os.path.relpath(p, REPO_DIR) for p in missing)}")
+                node.status = "built"
+        except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+            node.status = "failed"
+            node.message = str(e)
+        node.seconds = time.perf_counter() - start
+        if node.status in ("built", "up-to-date"):
+            result = hashlib.sha256("".join(hash_tree(p) or "" for p in node.produces).encode()).hexdigest()
+            with self.lock:
+                key = self.key(node)
+                self.state[node.name] = {"key": key, "result": result}
+        return node
+
+    def run(self):
+        pending = dict(self.nodes)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    deps = [self.nodes[d] for d in node.deps]
+                    if any(d.status in ("failed", "skipped") for d in deps):
+                        node.status = "skipped"
+                        node.message = "上游失败"
+                        del pending[name]
+                    elif all(d.status in ("built", "up-to-date", "would-build") for d in deps):
+                        running[pool.submit(self.run_node, node)] = node
+                        del pending[name]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    flag = f"  ({node.message.splitlines()[0]})" if node.message else ""
+                    print(f"  [{node.status}] {node.name} {node.seconds:.1f}s{flag}", flush=True)
+        if not self.dry_run:
+            os.makedirs(self.workspace, exist_ok=True)
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=4)
+
+
+def run_post_steps(data_dir, rebuilt):
+    """rebuilt: 本次有产物同步到 data/ 的目录名（如 Pylint、Flake8）"""
+    results = []
+    for step in POST_STEPS:
+        start = time.perf_counter()
+        cmd = [sys.executable, os.path.join(SCRIPTS_DIR, step["command"][0]), *step["command"][1:],
+               "--data-dir", data_dir]
+        if step.get("scoped"):
+            cmd += [arg for name in sorted(rebuilt) for arg in ("--linter", name)]
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        status = "built" if proc.returncode == 0 else "failed"
+        results.append((f"KB:{step['name']}", status, time.perf_counter() - start))
+        print(f"  [{status}] KB:{step['name']} {results[-1][2]:.1f}s", flush=True)
+        if proc.returncode != 0:
+            print("\n".join("    " + line for line in proc.stdout.strip().splitlines()[-8:]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按依赖图构建知识库")
+    parser.add_argument("--linter", action="append", default=[], choices=sorted(BUILDS), help="只构建指定 Linter")
+    # 抓取步骤以网络等待为主，默认每个 Linter 一个并发
+    parser.add_argument("--jobs", type=int, default=len(BUILDS), help="并发节点数")
+    parser.add_argument("--refresh", action="store_true", help="重新获取输入文件并重新运行联网抓取步骤")
+    parser.add_argument("--force", action="store_true", help="忽略 up-to-date 判断，全部重建")
+    parser.add_argument("--dry-run", action="store_true", help="只打印需要执行的节点")
+    parser.add_argument("--workspace", default=WORKSPACE)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    linters = args.linter or list(BUILDS)
+    nodes = build_graph(linters, os.path.abspath(args.workspace), os.path.abspath(args.data_dir))
+    print(f"构建 {len(linters)} 个 Linter，共 {len(nodes)} 个节点，并发 {args.jobs}")
+    start = time.perf_counter()
+    builder = Builder(nodes, os.path.abspath(args.workspace), args.jobs, args.refresh, args.force, args.dry_run)
+    builder.run()
+
+    post = []
+    installed = [n for n in nodes.values() if n.name.endswith(":install") and n.status == "built"]
+    if installed and not args.dry_run:
+        rebuilt = {target.split("/")[0] for n in installed for target in BUILDS[n.linter]["outputs"].values()}
+        post = run_post_steps(os.path.abspath(args.data_dir), rebuilt)
+    total = time.perf_counter() - start
+
+    print(f"\n{'Linter':<16}{'状态':<14}{'耗时(s)':>10}  节点")
+    for linter in linters:
+        own = [n for n in nodes.values() if n.linter == linter]
+        failed = [n for n in own if n.status in ("failed", "skipped")]
+        status = "failed" if failed else ("built" if any(n.status == "built" for n in own) else
+                                          "would-build" if any(n.status == "would-build" for n in own) else "up-to-date")
+        detail = ", ".join(f"{n.name.split(':', 1)[1]}={n.status}" for n in own)
+        print(f"{linter:<16}{status:<14}{sum(n.seconds for n in own):>10.1f}  {detail}")
+    for name, status, seconds in post:
+        print(f"{name:<16}{status:<14}{seconds:>10.1f}")
+    print(f"\n总耗时: {total:.1f}s")
+
+    failed = [n for n in nodes.values() if n.status == "failed"] + [p for p in post if p[1] == "failed"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
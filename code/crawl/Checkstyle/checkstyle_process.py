@@ -0,0 +1,160 @@
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+# 从本地 checkstyle jar（checkstyle-x.y-all.jar 或 checkstyle-x.y.jar）自带的元数据 XML 一次性生成
+#   Checkstyle/CheckstyleIndex.json               索引（含 parent：该 Check 必须放在 Checker 还是 TreeWalker 下）
+#   Checkstyle/CheckstyleCompleteInformation.json 全部规则文档
+#   Checkstyle/rules/<Check>.json                 单条规则文档
+# 元数据位于 jar 中 com/puppycrawl/tools/checkstyle/meta/checks/**/<Name>Check.xml，包含描述、属性名、类型、默认值和父模块。
+# 元数据不记录 tokens 的可选集合；已有知识库（--previous，默认同 --output）中有规则文件时沿用其中的可选 tokens。
+# 用法示例:
+# python checkstyle_process.py ~/.m2/repository/com/puppycrawl/tools/checkstyle/10.20.1/checkstyle-10.20.1.jar
+# python checkstyle_process.py checkstyle-10.20.1-all.jar --output Checkstyle
+# python checkstyle_process.py checkstyle-10.20.1.jar --previous ../../../skills/LintConfig/data/Checkstyle
+
+# --- 配置 ---
+META_PREFIX = "com/puppycrawl/tools/checkstyle/meta/checks/"
+OUTPUT_DIR = "Checkstyle"
+CHECK_URL = "https://checkstyle.org/checks/{category}/{page}.html#{name}"
+# 包名与文档目录不一致的情况（checks 根包与 indentation 包的 Check 在文档中都归入 misc）
+CATEGORY_ALIASES = {"": "misc", "indentation": "misc"}
+TOKEN_TYPES = {"tokens": "subset of tokens", "javadocTokens": "subset of javadoc tokens"}
+BLOCK_TAGS = re.compile(r'</?(div|p|ul|ol|li|pre|br|h\d)\b[^>]*>', re.IGNORECASE)
+
+
+def html_to_text(text):
+    """元数据中的描述是 HTML 片段：块级标签换行，其余标签去掉，段落之间空一行"""
+    text = BLOCK_TAGS.sub("\n\n", text or "")
+    text = html.unescape(re.sub(r'<[^>]+>', '', text))
+    paragraphs = re.split(r'\n\s*\n', text)
+    return "\n\n".join("\n".join(l.strip() for l in p.strip().splitlines()) for p in paragraphs if p.strip())
+
+
+def first_sentence(text):
+    text = " ".join(text.split())
+    m = re.match(r'(.+?\.)(\s|$)', text)
+    return m.group(1) if m else text
+
+
+def simple_type(java_type):
+    """java.util.regex.Pattern[] -> Pattern[]，...AnnotationUseStyleCheck$ElementStyleOption -> ElementStyleOption"""
+    return re.split(r'[.$]', java_type or "")[-1]
+
+
+def token_list(tokens):
+    return "\n,\n".join(tokens) + "\n."
+
+
+def previous_acceptable_tokens(path, name):
+    """从已有规则文件的 option 中取各 tokens 属性的可选集合"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        option = json.load(f).get(name, {}).get("option", "")
+    result = {}
+    for prop in TOKEN_TYPES:
+        m = re.search(rf'(?:^|\n){prop}, .*?, subset of[^\n]*\n\n(.*?)\n\.\n,\n', option, re.DOTALL)
+        if m:
+            result[prop] = [t.strip() for t in m.group(1).split("\n,\n")]
+    return result
+
+
+def option_text(properties, acceptable):
+    """与已有规则文件相同的格式: 每行 "name, description, type, default"；tokens 属性附可选集合与默认集合"""
+    lines = []
+    for prop in properties:
+        name = prop.get("name")
+        description_el = prop.find("description")
+        description = " ".join(html_to_text(description_el.text if description_el is not None else "").split())
+        default = prop.get("default-value", "")
+        if name in TOKEN_TYPES and prop.get("validation-type"):
+            defaults = [t.strip() for t in default.split(",") if t.strip()]
+            lines.append(f"{name}, {description}, {TOKEN_TYPES[name]}\n\n"
+                         f"{token_list(acceptable.get(name, []))}\n,\n\n{token_list(defaults)}")
+        else:
+            lines.append(f"{name}, {description}, {simple_type(prop.get('type'))}, {default}")
+    return "\n" + "\n".join(lines) if lines else ""
+
+
+def parse_check(xml_bytes):
+    """返回 (名称, 父模块, 文档目录, 描述, 属性元素列表)；不是 check 元数据时返回 None"""
+    root = ET.fromstring(xml_bytes)
+    check = root.find("module/check")
+    if check is None:
+        return None
+    m = re.search(r'\.checkstyle\.checks\.(?:(\w+)\.)?\w+$', check.get("fully-qualified-name", ""))
+    sub_package = (m.group(1) or "") if m else ""
+    category = CATEGORY_ALIASES.get(sub_package, sub_package)
+    description_el = check.find("description")
+    description = html_to_text(description_el.text if description_el is not None else "")
+    properties = check.findall("properties/property")
+    return check.get("name"), simple_type(check.get("parent")), category, description, properties
+
+
+def read_metadata(jar_path):
+    with zipfile.ZipFile(jar_path) as jar:
+        members = sorted(n for n in jar.namelist() if n.startswith(META_PREFIX) and n.endswith(".xml"))
+        return [(member, jar.read(member)) for member in members]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从 checkstyle jar 的元数据生成 Checkstyle 知识库")
+    parser.add_argument("jar", help="checkstyle-x.y.jar 或 checkstyle-x.y-all.jar")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--previous", default=None, help="已有 Checkstyle 知识库目录（其下有 rules/），默认同 --output")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        metadata = read_metadata(args.jar)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"错误: 无法读取 {args.jar}: {e}")
+        return 1
+    if not metadata:
+        print(f"错误: {args.jar} 中没有 {META_PREFIX} 元数据（checkstyle 8.38 之前的版本不带元数据）")
+        return 1
+
+    rules_dir = os.path.join(args.output, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    index, complete, parents = {}, {}, {}
+    for member, data in metadata:
+        parsed = parse_check(data)
+        if parsed is None:
+            continue
+        name, parent, category, description, properties = parsed
+        path = os.path.join(rules_dir, f"{name}.json")
+        acceptable = previous_acceptable_tokens(os.path.join(args.previous or args.output, "rules", f"{name}.json"), name)
+        index[name] = {
+            "description": first_sentence(description),
+            "url": CHECK_URL.format(category=category, page=name.lower(), name=name),
+            "parent": parent,
+        }
+        complete[name] = {
+            "description": f"Description\n\n{description}\n\nParent module: {parent}",
+            "option": option_text(properties, acceptable),
+        }
+        parents[parent] = parents.get(parent, 0) + 1
+
+    for name, rule in complete.items():
+        with open(os.path.join(rules_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump({name: rule}, f, ensure_ascii=False)
+    index = dict(sorted(index.items()))
+    with open(os.path.join(args.output, "CheckstyleIndex.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    with open(os.path.join(args.output, "CheckstyleCompleteInformation.json"), 'w', encoding='utf-8') as f:
+        json.dump(complete, f, ensure_ascii=False)
+
+    print(f"共 {len(index)} 个 Check ({', '.join(f'{p}: {n}' for p, n in sorted(parents.items()))})，"
+          f"已写入 {args.output}/ ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,12 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("craw_ESLint")
 
 
 def scrape_eslint_rules():
@@ -22,58 +28,61 @@ def scrape_eslint_rules():
         response = requests.get(url, headers=headers)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        rules_index = {}
-
-        # 2. 查找所有的 <article class="rule">
-        # 这涵盖了 Possible Problems, Suggestions, Layout, Deprecated 等所有分类
-        articles = soup.find_all('article', class_='rule')
-
-        for article in articles:
-            # --- 提取规则名称和 URL ---
-            name_wrapper = article.find(class_='rule__name')
-            if not name_wrapper:
-                # 兼容一些特殊结构的 rule 元素
-                name_wrapper = article.find('a', class_='rule__name')
-
-            if not name_wrapper:
-                continue
-
-            # 克隆节点以防修改原始 soup，去除内部状态标签（如 "deprecated" 标志）
-            import copy
-            temp_name_node = copy.copy(name_wrapper)
-            status_span = temp_name_node.find('span', class_='rule__status')
-            if status_span:
-                status_span.decompose()  # 移除 "deprecated" 或 "removed" 文字
-
-            rule_name = temp_name_node.get_text(strip=True)
-
-            # --- 提取 URL ---
-            if name_wrapper.name == 'a':
-                relative_url = name_wrapper.get('href', '')
-            else:
-                # 如果 rule__name 是 p 标签（通常见于 deprecated 列表），寻找其内部的链接或手动拼接
-                link = name_wrapper.find('a')
-                relative_url = link.get('href', '') if link else f"/docs/latest/rules/{rule_name}"
-
-            full_url = f"{base_url}{relative_url}" if relative_url.startswith('/') else relative_url
-
-            # --- 提取描述 ---
-            desc_tag = article.find('p', class_='rule__description')
-            # 过滤掉描述内部可能存在的 visually-hidden 或多余空白
-            description = desc_tag.get_text(strip=True) if desc_tag else ""
-
-            # 3. 填充字典
-            rules_index[rule_name] = {
-                "description": description,
-                "url": full_url
-            }
+        with metrics.stage("parse"):
+            soup = BeautifulSoup(response.text, 'html.parser')
+            rules_index = {}
+
+            # 2. 查找所有的 <article class="rule">
+            # 这涵盖了 Possible Problems, Suggestions, Layout, Deprecated 等所有分类
+            articles = soup.find_all('article', class_='rule')
+
+            for article in articles:
+                # --- 提取规则名称和 URL ---
+                name_wrapper = article.find(class_='rule__name')
+                if not name_wrapper:
+                    # 兼容一些特殊结构的 rule 元素
+                    name_wrapper = article.find('a', class_='rule__name')
+
+                if not name_wrapper:
+                    continue
+
+                # 克隆节点以防修改原始 soup，去除内部状态标签（如 "deprecated" 标志）
+                import copy
+                temp_name_node = copy.copy(name_wrapper)
+                status_span = temp_name_node.find('span', class_='rule__status')
+                if status_span:
+                    status_span.decompose()  # 移除 "deprecated" 或 "removed" 文字
+
+                rule_name = temp_name_node.get_text(strip=True)
+
+                # --- 提取 URL ---
+                if name_wrapper.name == 'a':
+                    relative_url = name_wrapper.get('href', '')
+                else:
+                    # 如果 rule__name 是 p 标签（通常见于 deprecated 列表），寻找其内部的链接或手动拼接
+                    link = name_wrapper.find('a')
+                    relative_url = link.get('href', '') if link else f"/docs/latest/rules/{rule_name}"
+
+                full_url = f"{base_url}{relative_url}" if relative_url.startswith('/') else relative_url
+
+                # --- 提取描述 ---
+                desc_tag = article.find('p', class_='rule__description')
+                # 过滤掉描述内部可能存在的 visually-hidden 或多余空白
+                description = desc_tag.get_text(strip=True) if desc_tag else ""
+
+                # 3. 填充字典
+                rules_index[rule_name] = {
+                    "description": description,
+                    "url": full_url
+                }
 
         # 4. 保存为 JSON
-        file_path = os.path.join(output_dir, "ESLintIndex.json")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(rules_index, f, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            file_path = os.path.join(output_dir, "ESLintIndex.json")
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(rules_index, f, ensure_ascii=False, indent=4)
 
+        metrics.count("rules_written", len(rules_index))
         print(f"成功抓取 {len(rules_index)} 条规则！")
         print(f"文件已存至: {file_path}")
 
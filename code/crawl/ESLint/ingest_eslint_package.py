@@ -0,0 +1,406 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import time
+
+# 从本地 eslint 安装目录或 npm 包 (eslint-x.y.z.tgz) 批量生成 ESLintIndex.json 与 rules/*.json，无需联网。
+# 规则信息来自 lib/rules/*.js 的 meta 对象：
+#   meta.docs.description -> 索引描述
+#   meta.schema / meta.defaultOptions -> 选项（原样保存 JSON Schema）
+#   meta.deprecated / meta.replacedBy -> 弃用说明
+# 解析方式:
+#   node   : 用 node require 每个规则文件，schema 与运行时完全一致（需要完整安装，含依赖）
+#   static : 直接解析 JS 源码中的对象字面量，并展开文件顶层的 const 常量；无法静态求值的部分记为 null
+#   auto   : 目录且可用 node 时先用 node，失败再退回 static（默认）
+# 用法示例:
+# python ingest_eslint_package.py node_modules/eslint
+# python ingest_eslint_package.py eslint-9.17.0.tgz --engine static
+# python ingest_eslint_package.py eslint-9.17.0.tgz --previous ../../skills/LintConfig/data
+# 包中只有 meta，没有 Rule Details 与正误代码示例；默认沿用已有规则文件（--previous 下的 ESLint/rules，默认同 --output）中的详细描述，
+# verify_mappings.py 的示例语料依赖这些内容。--no-keep-details 只输出 meta 生成的描述。
+
+# --- 配置 ---
+OUTPUT_DIR = "ESLint"
+RULE_URL = "https://eslint.org/docs/latest/rules/{}"
+NO_OPTIONS = "This rule has no specific options."
+
+NODE_SCRIPT = r"""
+const fs = require("fs"), path = require("path");
+const dir = process.argv[1], out = {};
+for (const file of fs.readdirSync(dir).sort()) {
+    if (!file.endsWith(".js") || file === "index.js") continue;
+    const rule = require(path.join(dir, file));
+    if (rule && rule.meta) out[file.slice(0, -3)] = rule.meta;
+}
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+# --- 读取包内容 ---
+def read_package(source):
+    """返回 (版本号, {规则名: JS 源码}, lib/rules 目录或 None)；支持包目录、node_modules 目录与 .tgz"""
+    if os.path.isfile(source):
+        sources, version = {}, None
+        with tarfile.open(source, "r:*") as tar:
+            for member in tar.getmembers():
+                parts = member.name.split("/")
+                if parts[1:] == ["package.json"]:
+                    version = json.load(tar.extractfile(member)).get("version")
+                elif len(parts) == 4 and parts[1:3] == ["lib", "rules"] and parts[3].endswith(".js") \
+                        and parts[3] != "index.js" and member.isfile():
+                    sources[parts[3][:-3]] = tar.extractfile(member).read().decode("utf-8")
+        return version, sources, None
+
+    if os.path.isdir(os.path.join(source, "eslint", "lib", "rules")):
+        source = os.path.join(source, "eslint")
+    rules_dir = os.path.join(source, "lib", "rules")
+    if not os.path.isdir(rules_dir):
+        raise FileNotFoundError(f"{source} 中没有 lib/rules 目录")
+    version = None
+    if os.path.exists(os.path.join(source, "package.json")):
+        with open(os.path.join(source, "package.json"), 'r', encoding='utf-8') as f:
+            version = json.load(f).get("version")
+    sources = {}
+    for filename in sorted(os.listdir(rules_dir)):
+        if filename.endswith(".js") and filename != "index.js":
+            with open(os.path.join(rules_dir, filename), 'r', encoding='utf-8') as f:
+                sources[filename[:-3]] = f.read()
+    return version, sources, rules_dir
+
+
+def metas_with_node(rules_dir):
+    proc = subprocess.run(["node", "-e", NODE_SCRIPT, rules_dir], capture_output=True, text=True)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if re.match(r'\w*Error\b', line)]
+        raise RuntimeError(errors[0] if errors else "node 执行失败")
+    return json.loads(proc.stdout)
+
+
+# --- 静态解析 JS 对象字面量 ---
+TOKEN = re.compile(r'''
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<template>`(?:\\.|[^`\\])*`)
+  | (?P<number>(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?|\.\d+)n?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>\.\.\.|=>|[=!]==?|&&|\|\||\?\?|\?\.|[{}()\[\];,:.?=<>+\-*%&|^!~/])
+''', re.VERBOSE | re.DOTALL)
+REGEX = re.compile(r'/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*')
+# 出现在这些记号之后的 "/" 是正则字面量而不是除号
+REGEX_PREFIX = {"(", ",", "=", ":", "[", "!", "&&", "||", "??", "?", "{", "}", ";", "=>", "return", "typeof", None}
+UNKNOWN = object()
+STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+def tokenize(src):
+    tokens, pos, previous = [], 0, None
+    while pos < len(src):
+        if src[pos] == "/" and previous in REGEX_PREFIX and src[pos + 1:pos + 2] not in ("/", "*"):
+            m = REGEX.match(src, pos)
+            if m:
+                tokens.append(("regex", m.group()))
+                pos, previous = m.end(), "regex"
+                continue
+        m = TOKEN.match(src, pos)
+        if not m:
+            pos += 1
+            continue
+        pos = m.end()
+        if m.lastgroup == "space":
+            continue
+        tokens.append((m.lastgroup, m.group()))
+        previous = m.group() if m.lastgroup in ("punct", "name") else m.lastgroup
+    return tokens
+
+
+def unquote(text):
+    body = text[1:-1]
+    return re.sub(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)',
+                  lambda m: chr(int(m.group(1).strip("u{}x"), 16)) if m.group(1)[0] in "ux" and len(m.group(1)) > 1
+                  else "" if m.group(1) == "\n" else STRING_ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+class ModuleEvaluator:
+    """对单个规则文件求值 module.exports 中的字面量部分；函数、调用等无法求值的表达式返回 UNKNOWN"""
+
+    def __init__(self, src):
+        self.tokens = tokenize(src)
+        self.constants = self.find_constants()
+        self.resolved, self.resolving = {}, set()
+
+    def find_constants(self):
+        constants, depth = {}, 0
+        for i, (kind, text) in enumerate(self.tokens):
+            if text in ("{", "(", "["):
+                depth += 1
+            elif text in ("}", ")", "]"):
+                depth -= 1
+            elif depth == 0 and text in ("const", "let", "var") and i + 2 < len(self.tokens) \
+                    and self.tokens[i + 1][0] == "name" and self.tokens[i + 2][1] == "=":
+                constants[self.tokens[i + 1][1]] = i + 3
+        return constants
+
+    def text(self, i):
+        return self.tokens[i][1] if i < len(self.tokens) else None
+
+    def skip_expression(self, i):
+        """跳过一个表达式，停在同层的 , ; ) ] } 处"""
+        depth = 0
+        while i < len(self.tokens):
+            text = self.tokens[i][1] if self.tokens[i][0] == "punct" else None
+            if text in ("{", "(", "["):
+                depth += 1
+            elif text in ("}", ")", "]"):
+                if depth == 0:
+                    return i
+                depth -= 1
+            elif text in (",", ";") and depth == 0:
+                return i
+            i += 1
+        return i
+
+    def skip_balanced(self, i):
+        depth = 0
+        while i < len(self.tokens):
+            text = self.text(i)
+            if text in ("{", "(", "["):
+                depth += 1
+            elif text in ("}", ")", "]"):
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return i
+
+    def constant(self, name):
+        if name in self.resolved:
+            return self.resolved[name]
+        if name not in self.constants or name in self.resolving:
+            return UNKNOWN
+        self.resolving.add(name)
+        value, _ = self.value(self.constants[name])
+        self.resolving.discard(name)
+        self.resolved[name] = value
+        return value
+
+    def value(self, i):
+        """返回 (值, 下一个位置)；值后面还有运算 / 调用时整体视为 UNKNOWN"""
+        value, j = self.primary(i)
+        if self.text(j) not in (",", "}", "]", ")", ";", None):
+            return UNKNOWN, self.skip_expression(j)
+        return value, j
+
+    def primary(self, i):
+        kind, text = self.tokens[i]
+        if text == "{":
+            return self.object(i + 1)
+        if text == "[":
+            return self.array(i + 1)
+        if kind == "string":
+            return unquote(text), i + 1
+        if kind == "template":
+            return (UNKNOWN if "${" in text else text[1:-1]), i + 1
+        if kind == "number":
+            number = text.replace("_", "").rstrip("n")
+            return (float(number) if re.search(r'[.eE]', number) and not number.startswith("0x")
+                    else int(number, 0)), i + 1
+        if text == "-" and self.tokens[i + 1][0] == "number":
+            value, j = self.primary(i + 1)
+            return -value, j
+        if kind == "name":
+            literals = {"true": True, "false": False, "null": None, "undefined": None}
+            if text in literals:
+                return literals[text], i + 1
+            if text not in ("function", "async", "class", "new") and self.text(i + 1) != "=>":
+                return self.constant(text), i + 1
+        return UNKNOWN, self.skip_expression(i)
+
+    def object(self, i):
+        result = {}
+        while self.text(i) not in ("}", None):
+            if self.text(i) == "...":
+                spread, i = self.value(i + 1)
+                if isinstance(spread, dict):
+                    result.update(spread)
+            else:
+                kind, key = self.tokens[i]
+                if key == "[":
+                    i, key = self.skip_balanced(i), None
+                else:
+                    key, i = (unquote(key) if kind == "string" else key), i + 1
+                if key in ("get", "set", "async") and self.text(i) not in (":", ",", "(", "}"):
+                    key, i = self.tokens[i][1], i + 1
+                if self.text(i) == ":":
+                    value, i = self.value(i + 1)
+                elif self.text(i) == "(":
+                    value, i = UNKNOWN, self.skip_balanced(self.skip_balanced(i))
+                else:
+                    value = self.constant(key)
+                if key is not None and value is not UNKNOWN:
+                    result[key] = value
+            if self.text(i) == ",":
+                i += 1
+        return result, i + 1
+
+    def array(self, i):
+        result = []
+        while self.text(i) not in ("]", None):
+            if self.text(i) == "...":
+                spread, i = self.value(i + 1)
+                if isinstance(spread, list):
+                    result.extend(spread)
+            else:
+                value, i = self.value(i)
+                result.append(None if value is UNKNOWN else value)
+            if self.text(i) == ",":
+                i += 1
+        return result, i + 1
+
+    def exports(self):
+        for i in range(len(self.tokens) - 3):
+            if [t[1] for t in self.tokens[i:i + 4]] == ["module", ".", "exports", "="]:
+                value, _ = self.value(i + 4)
+                return value if isinstance(value, dict) else {}
+        return {}
+
+
+def meta_from_source(src):
+    meta = ModuleEvaluator(src).exports().get("meta")
+    return meta if isinstance(meta, dict) else None
+
+
+# --- 生成知识库 ---
+def deprecation_note(meta):
+    deprecated = meta.get("deprecated")
+    if not deprecated:
+        return None
+    replaced = meta.get("replacedBy") or []
+    if isinstance(deprecated, dict) and deprecated.get("replacedBy"):
+        # v9 起为 [{"plugin": {"name"}, "rule": {"name"}}]，插件规则写成 插件/规则
+        replaced = []
+        for r in deprecated["replacedBy"]:
+            rule = (r.get("rule") or {}).get("name")
+            plugin = (r.get("plugin") or {}).get("name")
+            replaced.append(f"{plugin}/{rule}" if plugin and rule else rule or plugin)
+    note = "This rule is deprecated"
+    if isinstance(deprecated, dict) and deprecated.get("deprecatedSince"):
+        note += f" since v{deprecated['deprecatedSince']}"
+    note += "."
+    if isinstance(deprecated, dict) and deprecated.get("message"):
+        note += f" {deprecated['message'].rstrip('.')}."
+    names = [r for r in replaced if r]
+    if names:
+        note += f" Replaced by: {', '.join(names)}."
+    return note
+
+
+def option_text(meta):
+    schema = meta.get("schema")
+    if not schema:
+        return NO_OPTIONS
+    text = "Options schema (JSON Schema, from meta.schema):\n" + json.dumps(schema, ensure_ascii=False, indent=2)
+    if meta.get("defaultOptions"):
+        text += "\n\nDefault options:\n" + json.dumps(meta["defaultOptions"], ensure_ascii=False, indent=2)
+    return text
+
+
+def build_entries(metas):
+    index, rules = {}, {}
+    for name in sorted(metas):
+        meta = metas[name]
+        docs = meta.get("docs") if isinstance(meta.get("docs"), dict) else {}
+        description = docs.get("description") or ""
+        note = deprecation_note(meta)
+        index[name] = {
+            "description": description,
+            "url": docs.get("url") or RULE_URL.format(name),
+        }
+        details = "\n\n".join(t for t in (description, note) if t)
+        if meta.get("type"):
+            details += f"\n\nType: {meta['type']}"
+        if docs.get("recommended"):
+            details += "\nIncluded in eslint:recommended."
+        rules[name] = {name: {"description": f"Description\n\n{details}", "option": option_text(meta)}}
+    return index, rules
+
+
+def keep_existing_details(rules, rules_dir):
+    """保留已抓取规则文件中的详细描述（Rule Details），只替换选项；抓取失败的描述不保留"""
+    kept = 0
+    for name, data in rules.items():
+        path = os.path.join(rules_dir, f"{name}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            old = json.load(f).get(name, {})
+        description = old.get("description", "")
+        if description.strip() not in ("", "Description") and "FAILED_TO_FETCH" not in description:
+            data[name]["description"] = description
+            kept += 1
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从本地 eslint 包离线生成 ESLint 知识库")
+    parser.add_argument("source", help="eslint 包目录、node_modules 目录或 npm pack 得到的 .tgz")
+    parser.add_argument("--engine", choices=["auto", "node", "static"], default="auto")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--previous", default=None, help="已有知识库根目录（其下有 ESLint/rules）；默认沿用 --output 中的 rules/")
+    parser.add_argument("--no-keep-details", action="store_true", help="不沿用已有规则文件中的详细描述")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        version, sources, rules_dir = read_package(args.source)
+    except (OSError, tarfile.TarError) as e:
+        print(f"错误: 无法读取 {args.source}: {e}")
+        return 1
+    if not sources:
+        print(f"错误: {args.source} 中没有找到规则文件")
+        return 1
+
+    metas, engine = None, "static"
+    if args.engine in ("auto", "node") and rules_dir and shutil.which("node"):
+        try:
+            metas, engine = metas_with_node(rules_dir), "node"
+        except (RuntimeError, ValueError) as e:
+            print(f"node 解析失败 ({e})，改用静态解析")
+    elif args.engine == "node":
+        print("node 不可用或输入为压缩包，改用静态解析")
+    if metas is None:
+        metas, failed = {}, []
+        for name, src in sources.items():
+            meta = meta_from_source(src)
+            if meta is None:
+                failed.append(name)
+            else:
+                metas[name] = meta
+        if failed:
+            print(f"以下文件未找到 meta，已跳过: {', '.join(failed)}")
+
+    index, rules = build_entries(metas)
+    rules_out = os.path.join(args.output, "rules")
+    os.makedirs(rules_out, exist_ok=True)
+    previous_rules = os.path.join(args.previous, "ESLint", "rules") if args.previous else rules_out
+    kept = 0 if args.no_keep_details else keep_existing_details(rules, previous_rules)
+    with open(os.path.join(args.output, "ESLintIndex.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+    for name, data in rules.items():
+        with open(os.path.join(rules_out, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+    with_schema = sum(1 for m in metas.values() if m.get("schema"))
+    deprecated = sum(1 for m in metas.values() if m.get("deprecated"))
+    print(f"eslint {version or '?'} ({engine}): {len(index)} 条规则，{with_schema} 条带选项 schema，{deprecated} 条已弃用"
+          + ("" if args.no_keep_details else f"，沿用 {kept} 条已有描述"))
+    print(f"已写入 {args.output}/ ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
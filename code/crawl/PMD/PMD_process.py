@@ -2,10 +2,16 @@ import json
 import os
 import requests
 from bs4 import BeautifulSoup
+import sys
 import time
 import re
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("PMD_process")
+
 # --- 配置参数 ---
 MAX_RETRIES = 5
 BACKOFF_FACTOR = 2
@@ -56,10 +62,15 @@ def get_soup_with_retry(url):
     for attempt in range(MAX_RETRIES):
         try:
             resp = requests.get(url, headers=HEADERS, timeout=20)
+            if resp.status_code == 429:
+                metrics.count("http_429")
             resp.raise_for_status()
-            return BeautifulSoup(resp.text, 'html.parser')
+            with metrics.stage("parse"):
+                return BeautifulSoup(resp.text, 'html.parser')
         except Exception as e:
             wait = BACKOFF_FACTOR ** attempt
+            if attempt < MAX_RETRIES - 1:
+                metrics.count("retries")
             print(f"  [Retry] 访问 {url} 失败: {e}. {wait}s后重试...")
             time.sleep(wait)
     return None
@@ -73,34 +84,36 @@ def scrape_language_index(lang_slug, folder_name):
     soup = get_soup_with_retry(index_url)
     if not soup: return None
 
-    rules_index = {}
-    content_div = soup.find('div', class_='post-content')
-    if not content_div: return None
+    with metrics.stage("parse"):
+        rules_index = {}
+        content_div = soup.find('div', class_='post-content')
+        if not content_div: return None
 
-    toc_div = content_div.find('div', id='toc')
-    for li in content_div.find_all('li'):
-        if toc_div and toc_div.contains(li): continue
+        toc_div = content_div.find('div', id='toc')
+        for li in content_div.find_all('li'):
+            if toc_div and toc_div.contains(li): continue
 
-        a_tag = li.find('a')
-        if not a_tag or not a_tag.get('href'): continue
+            a_tag = li.find('a')
+            if not a_tag or not a_tag.get('href'): continue
 
-        rule_name = a_tag.get_text(strip=True)
-        relative_url = a_tag.get('href')
-        full_url = urljoin(BASE_URL, relative_url)
+            rule_name = a_tag.get_text(strip=True)
+            relative_url = a_tag.get('href')
+            full_url = urljoin(BASE_URL, relative_url)
 
-        full_text = li.get_text(strip=True)
-        description = full_text.split(":", 1)[1].strip() if ":" in full_text else ""
+            full_text = li.get_text(strip=True)
+            description = full_text.split(":", 1)[1].strip() if ":" in full_text else ""
 
-        rules_index[rule_name] = {
-            "description": description,
-            "url": full_url
-        }
+            rules_index[rule_name] = {
+                "description": description,
+                "url": full_url
+            }
 
     # 保存索引文件
-    os.makedirs(folder_name, exist_ok=True)
-    index_path = os.path.join(folder_name, f"PMD_{folder_name}Index.json")
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(rules_index, f, ensure_ascii=False, indent=4)
+    with metrics.stage("write"):
+        os.makedirs(folder_name, exist_ok=True)
+        index_path = os.path.join(folder_name, f"PMD_{folder_name}Index.json")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(rules_index, f, ensure_ascii=False, indent=4)
 
     return rules_index
 
@@ -120,46 +133,56 @@ def enrich_language_details(folder_name, rules_index):
     for base_page, rule_names in url_groups.items():
         # 检查是否还有需要抓取的
         if all(os.path.exists(os.path.join(rules_dir, f"{n}.json")) for n in rule_names):
+            metrics.count("cache_hits", len(rule_names))
             continue
 
         print(f"  正在处理组页面: {base_page}")
         soup = get_soup_with_retry(base_page)
-        if not soup: continue
+        if not soup:
+            metrics.count("failed_rules", len(rule_names))
+            continue
 
         for rule_name in rule_names:
             save_path = os.path.join(rules_dir, f"{rule_name}.json")
-            if os.path.exists(save_path): continue
+            if os.path.exists(save_path):
+                metrics.count("cache_hits")
+                continue
 
             header = soup.find('h2', id=lambda x: x and x.lower() == rule_name.lower())
-            if not header: continue
-
-            desc_parts = []
-            options_text = "This rule has no specific options."
-
-            for sibling in header.find_next_siblings():
-                if sibling.name == 'h2': break
-                if sibling.name == 'p':
-                    txt = sibling.get_text(strip=True)
-                    if any(txt.startswith(x) for x in ["Since:", "Priority:", "This rule is defined by"]): continue
-                    if "following properties" in txt: continue
-                    if sibling.find('a', href=re.compile("github\.com")): continue
-                    desc_parts.append(txt)
-                if sibling.name == 'table':
-                    prev = sibling.find_previous_sibling('p')
-                    if prev and "properties" in prev.get_text().lower():
-                        options_text = format_table_to_text(sibling)
-
-            full_desc = "\n\n".join(desc_parts).strip() or rules_index[rule_name]['description']
-
-            final_data = {
-                rule_name: {
-                    "description": f"Description\n\n{full_desc}",
-                    "option": options_text
+            if not header:
+                metrics.count("failed_rules")
+                continue
+
+            with metrics.stage("parse"):
+                desc_parts = []
+                options_text = "This rule has no specific options."
+
+                for sibling in header.find_next_siblings():
+                    if sibling.name == 'h2': break
+                    if sibling.name == 'p':
+                        txt = sibling.get_text(strip=True)
+                        if any(txt.startswith(x) for x in ["Since:", "Priority:", "This rule is defined by"]): continue
+                        if "following properties" in txt: continue
+                        if sibling.find('a', href=re.compile("github\.com")): continue
+                        desc_parts.append(txt)
+                    if sibling.name == 'table':
+                        prev = sibling.find_previous_sibling('p')
+                        if prev and "properties" in prev.get_text().lower():
+                            options_text = format_table_to_text(sibling)
+
+                full_desc = "\n\n".join(desc_parts).strip() or rules_index[rule_name]['description']
+
+                final_data = {
+                    rule_name: {
+                        "description": f"Description\n\n{full_desc}",
+                        "option": options_text
+                    }
                 }
-            }
 
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(final_data, f, ensure_ascii=False, indent=4)
+            with metrics.stage("write"):
+                with open(save_path, 'w', encoding='utf-8') as f:
+                    json.dump(final_data, f, ensure_ascii=False, indent=4)
+            metrics.count("rules_written")
 
         time.sleep(0.5)
 
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+# 从本地 PMD 发行包离线生成 <Language>/PMD_<Language>Index.json 与 <Language>/rules/*.json（与 PMD_process.py 输出相同的目录结构）。
+# 规则定义直接读取各语言 jar 中的 category/<lang>/<category>.xml：
+#   - 用 iterparse 流式解析，每条 <rule> 处理完即释放，不把整个 XML 读入内存
+#   - 描述、since、priority、message、示例，以及 <properties> 中带类型 / 取值范围 / 默认值的属性
+#   - 各语言在独立进程中并行处理
+# 以 Java 类实现的规则，其属性定义在 Java 代码中、不在 XML 里；这类规则沿用已有知识库（--previous，默认同 --output）
+# 规则文件中的属性表（如果有）。PMD_process.py 抓取的三列表补上空的 Type 列，所有规则使用同一表头。
+# 用法示例（在 PMD 目录下运行，与 PMD_process.py 相同）:
+# python ingest_pmd_dist.py ~/opt/pmd-bin-7.8.0
+# python ingest_pmd_dist.py pmd-dist-7.8.0-bin.zip --language java --language apex
+# python ingest_pmd_dist.py ~/.m2/repository/net/sourceforge/pmd/pmd-java/7.8.0/pmd-java-7.8.0.jar
+# python ingest_pmd_dist.py pmd-dist-7.8.0-bin.zip --previous ../../../skills/LintConfig/data/PMD
+
+# --- 配置 ---
+# category/<lang>/ 目录名 -> 输出文件夹名（与 PMD_process.py 的 LANG_CONFIG 一致，另加旧版目录名）
+LANG_CONFIG = {
+    "apex": "Apex",
+    "html": "Html",
+    "java": "Java",
+    "jsp": "JSP",
+    "ecmascript": "JavaScript",
+    "kotlin": "Kotlin",
+    "pom": "MavenPOM",
+    "modelica": "Modelica",
+    "plsql": "PLSQL",
+    "visualforce": "Salesforce_Visual_force",
+    "vf": "Salesforce_Visual_force",
+    "swift": "Swift",
+    "velocity": "VTL",
+    "vm": "VTL",
+    "xml": "XML",
+    "xsl": "XSL",
+}
+WEBSITE_URL = "https://pmd.github.io/pmd"
+PRIORITIES = {"1": "High", "2": "Medium High", "3": "Medium", "4": "Medium Low", "5": "Low"}
+# XPath 规则的实现本身也是属性，不属于用户可配置项
+INTERNAL_PROPERTIES = {"xpath", "version"}
+NO_OPTIONS = "This rule has no specific options."
+OPTION_HEADER = ("Name", "Type", "Default Value", "Description")
+# PMD_process.py 从网页抓取的属性表没有类型列
+CRAWLED_HEADER = ("Name", "Default Value", "Description")
+CATEGORY_PATH = re.compile(r'^category/([a-z]+)/([a-z]+)\.xml$')
+
+
+# --- 定位规则 XML ---
+def open_archives(source):
+    """返回 [(jar 或外层 zip 路径, 内层 jar 路径或 None)]；支持 PMD 发行包目录 (lib/*.jar)、发行包 zip（内含 jar）或单个 jar"""
+    if os.path.isdir(source):
+        lib = os.path.join(source, "lib") if os.path.isdir(os.path.join(source, "lib")) else source
+        return [(os.path.join(lib, n), None) for n in sorted(os.listdir(lib)) if n.startswith("pmd-") and n.endswith(".jar")]
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        if any(CATEGORY_PATH.match(n) for n in names):
+            return [(source, None)]
+        return [(source, n) for n in names if re.search(r'/pmd-[\w.-]+\.jar$', n)]
+
+
+def open_jar(source, member):
+    """打开 jar；发行包 zip 中的 jar 直接从外层 zip 流式读取，不解压到磁盘"""
+    if member is None:
+        return zipfile.ZipFile(source)
+    return zipfile.ZipFile(zipfile.ZipFile(source).open(member))
+
+
+def find_categories(source):
+    """返回 {语言目录名: [(jar, 内层 jar, XML 路径)]}"""
+    languages = {}
+    for jar, member in open_archives(source):
+        try:
+            with open_jar(jar, member) as archive:
+                for name in archive.namelist():
+                    m = CATEGORY_PATH.match(name)
+                    if m:
+                        languages.setdefault(m.group(1), []).append((jar, member, name))
+        except zipfile.BadZipFile:
+            print(f"  [Warning] 无法读取 {member or jar}")
+    return languages
+
+
+# --- 流式解析 ---
+def local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def clean_text(text):
+    """去掉 XML 文本的公共缩进与首尾空行"""
+    lines = (text or "").strip("\n").splitlines()
+    indent = min((len(l) - len(l.lstrip()) for l in lines if l.strip()), default=0)
+    return "\n".join(l[indent:].rstrip() for l in lines).strip()
+
+
+def iter_rules(stream):
+    """逐条产出 ruleset 下的 <rule> 元素；处理完的元素随即清空"""
+    depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if local(elem.tag) == "rule" and depth == 1:
+            yield elem
+            elem.clear()
+
+
+def property_row(prop):
+    """属性 -> (名称, 类型, 默认值, 说明)；取值范围 / 分隔符附在说明后"""
+    value = prop.get("value")
+    if value is None:
+        child = next((c for c in prop if local(c.tag) == "value"), None)
+        value = clean_text(child.text) if child is not None else ""
+    notes = []
+    if prop.get("min") is not None or prop.get("max") is not None:
+        notes.append(f"Range: {prop.get('min', '')}..{prop.get('max', '')}")
+    if prop.get("delimiter"):
+        notes.append(f"Delimiter: {prop.get('delimiter')}")
+    description = " ".join((prop.get("description") or "").split())
+    return prop.get("name"), prop.get("type", ""), value, " ".join([description] + notes).strip()
+
+
+def option_table(rows):
+    return "\n".join("\t".join(row) for row in [OPTION_HEADER, *rows])
+
+
+def widen_table(option):
+    """已抓取的三列属性表 -> 与 XML 属性相同的四列表（Type 留空）"""
+    lines = option.splitlines()
+    if not lines or tuple(lines[0].split("\t")) != CRAWLED_HEADER:
+        return option
+    rows = []
+    for line in lines[1:]:
+        name, _, rest = line.partition("\t")
+        rows.append((name, "", rest))
+    return option_table(rows)
+
+
+def parse_rule(elem, language, category):
+    name = elem.get("name")
+    fields = {local(c.tag): c for c in elem}
+    description = clean_text(fields["description"].text) if "description" in fields else ""
+    properties = [property_row(p) for p in fields["properties"]
+                  if local(p.tag) == "property" and p.get("name") not in INTERNAL_PROPERTIES] \
+        if "properties" in fields else []
+    examples = [clean_text(c.text) for c in elem if local(c.tag) == "example" and (c.text or "").strip()]
+    url = (elem.get("externalInfoUrl") or f"{WEBSITE_URL}/pmd_rules_{language}_{category}.html#{name.lower()}") \
+        .replace("${pmd.website.baseurl}", WEBSITE_URL)
+
+    details = [description]
+    facts = [f"Since: PMD {elem.get('since')}" if elem.get("since") else None]
+    priority = fields["priority"].text.strip() if "priority" in fields and fields["priority"].text else None
+    if priority:
+        facts.append(f"Priority: {PRIORITIES.get(priority, priority)} ({priority})")
+    if elem.get("message"):
+        facts.append(f"Message: {elem.get('message')}")
+    if elem.get("deprecated") == "true":
+        facts.append("Deprecated: true")
+    details.append("\n".join(f for f in facts if f))
+    if examples:
+        details.append("Example(s):\n\n" + "\n\n".join(examples))
+
+    option = None
+    if properties:
+        option = option_table(properties)
+    return name, {
+        "index": {"description": " ".join(description.split()), "url": url},
+        "rule": {"description": "Description\n\n" + "\n\n".join(d for d in details if d), "option": option},
+        "java_class": "XPathRule" not in (elem.get("class") or ""),
+        "typed": bool(properties),
+    }
+
+
+def ingest_language(language, sources, output_root, previous_root):
+    """在子进程中解析一种语言的全部 category XML 并写出索引与规则文件；返回统计"""
+    folder = LANG_CONFIG.get(language, language.capitalize())
+    rules, references = {}, 0
+    for jar, member, name in sources:
+        category = CATEGORY_PATH.match(name).group(2)
+        with open_jar(jar, member) as archive, archive.open(name) as stream:
+            for elem in iter_rules(stream):
+                if elem.get("ref"):
+                    references += 1    # 规则改名 / 移动后保留的引用，不是独立规则
+                    continue
+                rule_name, record = parse_rule(elem, language, category)
+                rules[rule_name] = record
+
+    out_dir = os.path.join(output_root, folder)
+    rules_dir = os.path.join(out_dir, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    kept = 0
+    for rule_name, record in rules.items():
+        path = os.path.join(rules_dir, f"{rule_name}.json")
+        previous_path = os.path.join(previous_root, folder, "rules", f"{rule_name}.json")
+        option = record["rule"]["option"]
+        if option is None and record["java_class"] and os.path.exists(previous_path):
+            with open(previous_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get(rule_name, {}).get("option")
+            if previous and previous != NO_OPTIONS:
+                option, kept = widen_table(previous), kept + 1
+        record["rule"]["option"] = option or NO_OPTIONS
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({rule_name: record["rule"]}, f, ensure_ascii=False, indent=4)
+
+    index = {name: rules[name]["index"] for name in sorted(rules)}
+    with open(os.path.join(out_dir, f"PMD_{folder}Index.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+    typed = sum(1 for r in rules.values() if r["typed"])
+    return folder, len(rules), typed, kept, references
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从本地 PMD 发行包离线生成 PMD 知识库")
+    parser.add_argument("source", help="PMD 发行包目录、发行包 zip 或单个 pmd-<lang> jar")
+    parser.add_argument("--language", action="append", default=None, help="只处理这些语言（category 目录名，如 java）")
+    parser.add_argument("--output", default=".", help="输出根目录，默认当前目录（与 PMD_process.py 相同）")
+    parser.add_argument("--previous", default=None, help="已有 PMD 知识库根目录（其下有 <Language>/rules），默认同 --output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        languages = find_categories(args.source)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"错误: 无法读取 {args.source}: {e}")
+        return 1
+    if args.language:
+        languages = {k: v for k, v in languages.items() if k in args.language}
+    if not languages:
+        print(f"错误: {args.source} 中没有找到 category/<lang>/*.xml")
+        return 1
+
+    print(f"共 {len(languages)} 种语言: {', '.join(sorted(languages))}")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(ingest_language, lang, sources, args.output, args.previous or args.output) for lang, sources in sorted(languages.items())]
+        for future in futures:
+            folder, count, typed, kept, references = future.result()
+            print(f"  {folder:<26}{count:>5} 条规则  {typed:>4} 条带 XML 属性  {kept:>4} 条沿用已有属性表"
+                  + (f"  (跳过 {references} 个引用)" if references else ""))
+    print(f"完成 ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,51 @@
+import argparse
+import glob
 import yaml
 import json
 import os
-
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 从 RuboCop 及其插件 gem (rubocop-rails、rubocop-rspec、rubocop-performance ...) 各自的 config/default.yml 生成一个合并的知识库。
+# - 各 gem 的配置文件在独立进程中并行解析，使用 libyaml 的 CSafeLoader（未编译 libyaml 时退回纯 Python 的 SafeLoader）
+# - 索引中每个 Cop 记录来源 gem（gem / gem_version）；选项默认值只取定义该 Cop 的 gem，
+#   插件对其他 gem 中 Cop 的配置覆盖按 gem 分别记入 overrides，在规则文件中作为单独的选项行列出（只在加载该插件时生效）
+# - 不带参数运行时读取当前目录的 default.yml（核心 RuboCop）以及 rubocop-*.yml（以文件名作为 gem 名）
 # 获取default.yml :
 # curl -L https://raw.githubusercontent.com/rubocop/rubocop/master/config/default.yml -o default.yml
+# curl -L https://raw.githubusercontent.com/rubocop/rubocop-rails/master/config/default.yml -o rubocop-rails.yml
+# 用法示例:
+# python rubocop_process.py
+# python rubocop_process.py default.yml ~/.gem/ruby/3.3.0/gems/rubocop-rails-2.27.0 ~/.gem/ruby/3.3.0/gems/rubocop-rspec-3.2.0
+# python rubocop_process.py rubocop=vendor/rubocop/config/default.yml rubocop-performance=perf.yml
+
 # --- 配置 ---
 INPUT_FILE = "default.yml"
+PLUGIN_FILES = "rubocop-*.yml"
 BASE_DIR = "RuboCop"
 RULES_DIR = os.path.join(BASE_DIR, "rules")
+CORE_GEM = "rubocop"
+# 定义哪些键是"元数据"，不属于 Options
+META_KEYS = {
+    'Description', 'Enabled', 'StyleGuide', 'Reference', 'Safe',
+    'SafeAutoCorrect', 'VersionAdded', 'VersionChanged',
+    'Exclude', 'Include', 'Details', 'InheritEnv'
+}
 
 
 # --- 处理 Ruby 特有标签 ---
+class RubyLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """SafeLoader 的子类，只在本脚本中识别 !ruby/regexp 与 !ruby/symbol，不修改全局 SafeLoader"""
+
+
 def ruby_constructor(loader, node):
     return loader.construct_scalar(node)
 
 
-yaml.SafeLoader.add_constructor('!ruby/regexp', ruby_constructor)
-yaml.SafeLoader.add_constructor('!ruby/symbol', ruby_constructor)
+RubyLoader.add_constructor('!ruby/regexp', ruby_constructor)
+RubyLoader.add_constructor('!ruby/symbol', ruby_constructor)
 
 
 def sanitize_filename(name):
@@ -24,48 +53,104 @@ def sanitize_filename(name):
     return name.replace('/', '_').replace(':', '').replace('*', 'Any')
 
 
-def get_rubocop_doc_url(cop_name):
-    """根据 Cop 名字生成官方文档链接"""
+def get_rubocop_doc_url(cop_name, gem=CORE_GEM):
+    """根据 Cop 名字与所属 gem 生成官方文档链接（RSpec/Rails/AvoidSetupHook 这类多级部门对应 cops_rspec_rails.html）"""
     if '/' in cop_name:
-        dept, name = cop_name.split('/')
+        dept = cop_name.rsplit('/', 1)[0]
         # 官方文档锚点通常是部门+名称，且全小写无斜杠
         anchor = cop_name.replace('/', '').lower()
-        return f"https://docs.rubocop.org/rubocop/cops_{dept.lower()}.html#{anchor}"
-    return "https://docs.rubocop.org/rubocop/cops.html"
+        return f"https://docs.rubocop.org/{gem}/cops_{dept.replace('/', '_').lower()}.html#{anchor}"
+    return f"https://docs.rubocop.org/{gem}/cops.html"
+
+
+# --- 输入 ---
+def resolve_source(arg):
+    """参数 -> (gem 名, 版本或 None, 配置文件路径)；支持 name=path、gem 目录、gem 内的 config/default.yml 与单独保存的 yml"""
+    name = None
+    if '=' in arg and not os.path.exists(arg):
+        name, arg = arg.split('=', 1)
+    path = arg
+    if os.path.isdir(arg):
+        path = os.path.join(arg, "config", "default.yml")
+        gem_dir = arg
+    elif os.path.basename(os.path.dirname(os.path.abspath(arg))) == "config":
+        gem_dir = os.path.dirname(os.path.dirname(os.path.abspath(arg)))
+    else:
+        gem_dir = None
+    if gem_dir:
+        # 安装后的 gem 目录名形如 rubocop-rails-2.27.0
+        m = re.match(r'^(.*?)-(\d[\w.]*)$', os.path.basename(os.path.normpath(gem_dir)))
+        base, version = (m.group(1), m.group(2)) if m else (os.path.basename(os.path.normpath(gem_dir)), None)
+    else:
+        stem = os.path.splitext(os.path.basename(arg))[0]
+        base, version = (CORE_GEM if stem == "default" else stem), None
+    return name or base, version, path
+
+
+def parse_config(path):
+    """在子进程中解析一个 default.yml"""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=RubyLoader)
+
+
+def parse_all(sources, workers):
+    """并行解析全部配置文件，按参数顺序返回 [(gem, 版本, 数据)]"""
+    if len(sources) == 1 or workers <= 1:
+        return [(gem, version, parse_config(path)) for gem, version, path in sources]
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as pool:
+        futures = [pool.submit(parse_config, path) for _, _, path in sources]
+        return [(gem, version, future.result()) for (gem, version, _), future in zip(sources, futures)]
+
+
+# --- 合并 ---
+def merge_cops(parsed):
+    """
+    返回 {Cop 名: {"gem", "version", "config", "overrides"}}，overrides 为 {插件 gem: {键: 值}}。
+    带 Description 的条目是 Cop 的定义；插件中对其他 gem 的 Cop 只写部分键（如 Include）的条目是配置覆盖，
+    不修改定义中的默认值（只使用核心 gem 的用户看到的仍是原默认值）。没有任何 gem 定义的条目按原样作为 Cop。
+    """
+    cops, overrides, departments = {}, [], 0
+    for gem, version, data in parsed:
+        for cop_name, config in (data or {}).items():
+            if cop_name == 'AllCops' or not isinstance(config, dict):
+                continue
+            if '/' not in cop_name:
+                departments += 1    # 插件的部门级配置（如 RSpec: Include）
+                continue
+            if 'Description' in config and cop_name not in cops:
+                cops[cop_name] = {"gem": gem, "version": version, "config": dict(config), "overrides": {}}
+            else:
+                overrides.append((gem, version, cop_name, config))
+
+    for gem, version, cop_name, config in overrides:
+        if cop_name not in cops:
+            cops[cop_name] = {"gem": gem, "version": version, "config": dict(config), "overrides": {}}
+            continue
+        cop = cops[cop_name]
+        if gem == cop["gem"]:
+            cop["config"].update(config)
+        else:
+            cop["overrides"].setdefault(gem, {}).update(config)
+    return cops, departments
 
 
-def process_rubocop():
+def option_line(key, value, gem=None):
+    """格式化选项：名字: 默认值 (类型)；插件覆盖的值注明来源 gem"""
+    source = f", set by {gem}" if gem else ""
+    return f"{key}: {value} (type: {type(value).__name__}{source})"
+
+
+def process_rubocop(cops):
     # 1. 初始化目录
     if not os.path.exists(RULES_DIR):
         os.makedirs(RULES_DIR)
 
-    if not os.path.exists(INPUT_FILE):
-        print(f"错误: 找不到 {INPUT_FILE}")
-        return
-
-    # 2. 加载 YAML
-    print(f"正在加载并解析 {INPUT_FILE}...")
-    try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            raw_data = yaml.load(f, Loader=yaml.SafeLoader)
-    except Exception as e:
-        print(f"解析失败: {e}")
-        return
-
-    # 定义哪些键是“元数据”，不属于 Options
-    meta_keys = {
-        'Description', 'Enabled', 'StyleGuide', 'Reference', 'Safe',
-        'SafeAutoCorrect', 'VersionAdded', 'VersionChanged',
-        'Exclude', 'Include', 'Details', 'InheritEnv'
-    }
-
     index_data = {}
 
     print("开始组织文件结构...")
-    for cop_name, config in raw_data.items():
-        # 过滤全局配置项
-        if cop_name == 'AllCops' or not isinstance(config, dict):
-            continue
+    for cop_name in cops:
+        cop = cops[cop_name]
+        config = cop["config"]
 
         # --- A. 提取描述 ---
         # 结合 Description 和 Details (详情)
@@ -77,24 +162,31 @@ def process_rubocop():
             full_description += f"\n\nDetails:\n{details}"
 
         # --- B. 提取 Options ---
-        options_list = []
-        for key, value in config.items():
-            if key not in meta_keys:
-                # 格式化选项：名字 (默认值)
-                options_list.append(f"{key}: {value} (type: {type(value).__name__})")
+        options_list = [option_line(key, value) for key, value in config.items() if key not in META_KEYS]
 
         if options_list:
             option_field = "This rule supports the following parameters in your configuration:\n\n" + "\n".join(
                 options_list)
         else:
             option_field = "This rule has no specific options."
-
-        # --- C. 组织 Index 数据 ---
-        url = get_rubocop_doc_url(cop_name)
-        index_data[cop_name] = {
+        # 插件覆盖包括 Include / Enabled 等元数据键，它们改变的是加载插件后的实际行为
+        override_lines = [option_line(key, value, gem)
+                          for gem, overrides in cop["overrides"].items() for key, value in overrides.items()]
+        if override_lines:
+            option_field += "\n\nPlugin gems override the following settings when they are loaded:\n\n" + \
+                            "\n".join(override_lines)
+
+        # --- C. 组织 Index 数据（含来源 gem） ---
+        entry = {
             "description": desc_main,
-            "url": url
+            "url": get_rubocop_doc_url(cop_name, cop["gem"]),
+            "gem": cop["gem"],
         }
+        if cop["version"]:
+            entry["gem_version"] = cop["version"]
+        if cop["overrides"]:
+            entry["overrides"] = cop["overrides"]
+        index_data[cop_name] = entry
 
         # --- D. 生成规则文件 ---
         rule_content = {
@@ -112,12 +204,50 @@ def process_rubocop():
     # 3. 写入 Index 文件
     index_file_path = os.path.join(BASE_DIR, "RuboCopIndex.json")
     with open(index_file_path, 'w', encoding='utf-8') as ifile:
-        json.dump(index_data, ifile, ensure_ascii=False, indent=4)
+        # 覆盖值来自 YAML，可能含日期等非 JSON 类型
+        json.dump(index_data, ifile, ensure_ascii=False, indent=4, default=str)
 
     print(f"\n处理完成！")
     print(f"索引文件: {index_file_path}")
     print(f"规则总数: {len(index_data)}")
+    return index_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从 RuboCop 及插件 gem 的 default.yml 生成合并的 RuboCop 知识库")
+    parser.add_argument("configs", nargs="*",
+                        help="gem 目录、config/default.yml 或 name=path；默认读取 default.yml 与 rubocop-*.yml")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    configs = args.configs or [INPUT_FILE] + sorted(glob.glob(PLUGIN_FILES))
+    sources = [resolve_source(c) for c in configs]
+    missing = [path for _, _, path in sources if not os.path.exists(path)]
+    if missing:
+        print(f"错误: 找不到 {', '.join(missing)}")
+        return 1
+
+    # 2. 加载 YAML
+    loader = "CSafeLoader (libyaml)" if RubyLoader.__mro__[1] is not yaml.SafeLoader else "SafeLoader"
+    print(f"正在并行解析 {len(sources)} 个配置文件 ({loader})...")
+    start = time.perf_counter()
+    try:
+        parsed = parse_all(sources, args.workers)
+    except yaml.YAMLError as e:
+        print(f"解析失败: {e}")
+        return 1
+    print(f"解析耗时 {time.perf_counter() - start:.2f}s")
+
+    cops, departments = merge_cops(parsed)
+    index_data = process_rubocop(cops)
+    for gem, version, _ in sources:
+        count = sum(1 for entry in index_data.values() if entry["gem"] == gem)
+        print(f"  {gem}{' ' + version if version else ''}: {count} 个 Cop")
+    overridden = sum(1 for entry in index_data.values() if "overrides" in entry)
+    if overridden or departments:
+        print(f"  {overridden} 个 Cop 被其他 gem 覆盖配置，跳过 {departments} 个部门级配置")
+    return 0
 
 
 if __name__ == "__main__":
-    process_rubocop()
\ No newline at end of file
+    sys.exit(main())
@@ -1,11 +1,17 @@
 import os
 import json
 import re
+import sys
 import time
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("biome_process")
+
 # --- 配置 ---
 BASE_INDEX_URL = "https://biomejs.dev/linter/javascript/rules/"
 BASE_DOMAIN = "https://biomejs.dev"
@@ -24,6 +30,9 @@ def fetch_with_retry(url, max_retries=5):
         try:
             response = requests.get(url, headers=HEADERS, timeout=15)
             if response.status_code == 429:
+                metrics.count("http_429")
+                if attempt < max_retries - 1:
+                    metrics.count("retries")
                 wait = (attempt + 1) * 5
                 print(f"  [Wait] 服务器限流 (429)，等待 {wait}s...")
                 time.sleep(wait)
@@ -33,6 +42,7 @@ def fetch_with_retry(url, max_retries=5):
         except (requests.exceptions.RequestException, Exception) as e:
             wait = (attempt + 1) * 2
             if attempt < max_retries - 1:
+                metrics.count("retries")
                 print(f"  [Retry] 请求失败: {str(e)[:50]}... 正在尝试第 {attempt + 2} 次 (等待{wait}s)")
                 time.sleep(wait)
             else:
@@ -68,25 +78,26 @@ def scrape_index():
     html = fetch_with_retry(BASE_INDEX_URL)
     if not html: return None
 
-    soup = BeautifulSoup(html, 'html.parser')
-    index_map = {}
-    tables = soup.find_all('table')
-
-    for table in tables:
-        for row in table.find_all('tr')[1:]:  # 跳过表头
-            cols = row.find_all('td')
-            if len(cols) >= 2:
-                a_tag = cols[0].find('a')
-                if a_tag:
-                    name = a_tag.get_text(strip=True)
-                    url = urljoin(BASE_DOMAIN, a_tag.get('href'))
-                    # 这里的摘要来自索引页表格
-                    summary = cols[1].get_text(strip=True)
-                    index_map[name] = {
-                        "description": summary,
-                        "url": url
-                    }
-    return index_map
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(html, 'html.parser')
+        index_map = {}
+        tables = soup.find_all('table')
+
+        for table in tables:
+            for row in table.find_all('tr')[1:]:  # 跳过表头
+                cols = row.find_all('td')
+                if len(cols) >= 2:
+                    a_tag = cols[0].find('a')
+                    if a_tag:
+                        name = a_tag.get_text(strip=True)
+                        url = urljoin(BASE_DOMAIN, a_tag.get('href'))
+                        # 这里的摘要来自索引页表格
+                        summary = cols[1].get_text(strip=True)
+                        index_map[name] = {
+                            "description": summary,
+                            "url": url
+                        }
+        return index_map
 
 
 # --- 核心逻辑 2：爬取详情 ---
@@ -94,43 +105,44 @@ def get_rule_details(url, rule_name):
     html = fetch_with_retry(url)
     if not html: return None, None
 
-    soup = BeautifulSoup(html, 'html.parser')
-
-    def get_section_text(target_id):
-        h2_tag = soup.find('h2', id=target_id)
-        if not h2_tag: return None
-
-        # 寻找包装容器
-        header_wrapper = h2_tag.find_parent('div', class_='sl-heading-wrapper') or h2_tag
-        content_blocks = []
-
-        for sibling in header_wrapper.find_next_siblings():
-            # 遇到下一个大标题 level-h2 则停止
-            if sibling.name == 'div' and 'level-h2' in sibling.get('class', []):
-                break
-
-            # 处理代码块：精准提取 .code 避开行号 .ln
-            if sibling.get('class') and 'expressive-code' in sibling.get('class'):
-                # 记录文件名如 biome.json
-                caption = sibling.find('figcaption')
-                if caption: content_blocks.append(caption.get_text().strip())
-
-                # 核心改进：只拿代码行内容
-                code_parts = sibling.select('.code')
-                if code_parts:
-                    content_blocks.append("\n".join([c.get_text() for c in code_parts]))
-            elif sibling.name == 'ul':
-                for li in sibling.find_all('li'):
-                    content_blocks.append(f"- {li.get_text(strip=True)}")
-            else:
-                txt = sibling.get_text(strip=True)
-                if txt: content_blocks.append(txt)
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(html, 'html.parser')
+
+        def get_section_text(target_id):
+            h2_tag = soup.find('h2', id=target_id)
+            if not h2_tag: return None
+
+            # 寻找包装容器
+            header_wrapper = h2_tag.find_parent('div', class_='sl-heading-wrapper') or h2_tag
+            content_blocks = []
+
+            for sibling in header_wrapper.find_next_siblings():
+                # 遇到下一个大标题 level-h2 则停止
+                if sibling.name == 'div' and 'level-h2' in sibling.get('class', []):
+                    break
+
+                # 处理代码块：精准提取 .code 避开行号 .ln
+                if sibling.get('class') and 'expressive-code' in sibling.get('class'):
+                    # 记录文件名如 biome.json
+                    caption = sibling.find('figcaption')
+                    if caption: content_blocks.append(caption.get_text().strip())
+
+                    # 核心改进：只拿代码行内容
+                    code_parts = sibling.select('.code')
+                    if code_parts:
+                        content_blocks.append("\n".join([c.get_text() for c in code_parts]))
+                elif sibling.name == 'ul':
+                    for li in sibling.find_all('li'):
+                        content_blocks.append(f"- {li.get_text(strip=True)}")
+                else:
+                    txt = sibling.get_text(strip=True)
+                    if txt: content_blocks.append(txt)
 
-        return "\n\n".join(content_blocks)
+            return "\n\n".join(content_blocks)
 
-    desc = get_section_text("description")
-    opts = get_section_text("options")
-    return desc, opts
+        desc = get_section_text("description")
+        opts = get_section_text("options")
+        return desc, opts
 
 
 # --- 主函数 ---
@@ -153,12 +165,14 @@ def main():
 
         # 断点续爬检查
         if os.path.exists(save_path):
+            metrics.count("cache_hits")
             continue
 
         print(f"[{i + 1}/{total}] 正在处理: {name}")
         raw_desc, raw_opts = get_rule_details(info['url'], name)
 
         if raw_desc is None:
+            metrics.count("failed_rules")
             print(f"  [Skip] 无法获取 {name} 的详细页面")
             continue
 
@@ -174,15 +188,18 @@ def main():
         }
 
         # 写入详情文件
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(rule_file_content, f, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            with open(save_path, 'w', encoding='utf-8') as f:
+                json.dump(rule_file_content, f, ensure_ascii=False, indent=4)
+        metrics.count("rules_written")
 
         # 频率控制
         time.sleep(0.5)
 
     # 4. 写入最终索引文件 (更新 description 为索引页摘要)
-    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, ensure_ascii=False, indent=4)
+    with metrics.stage("write"):
+        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(index_data, f, ensure_ascii=False, indent=4)
 
     print(f"\n任务全部完成！")
     print(f"- 索引文件: {INDEX_FILE}")
@@ -2,8 +2,14 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("craw_clang_tidy")
+
 # --- 配置 ---
 BASE_URL = "https://clang.llvm.org/extra/clang-tidy/checks/"
 INDEX_URL = BASE_URL + "list.html"
@@ -24,38 +30,41 @@ def get_detail_description(url, rule_name):
         time.sleep(0.1)
         resp = requests.get(url, headers=HEADERS, timeout=10)
         if resp.status_code != 200:
+            metrics.count("failed_rules")
             return "No description available."
 
-        detail_soup = BeautifulSoup(resp.text, 'html.parser')
+        with metrics.stage("parse"):
+            detail_soup = BeautifulSoup(resp.text, 'html.parser')
 
-        # 1. 尝试查找新版结构：以规则名为 id 的 section 标签
-        # 例如: <section id="abseil-cleanup-ctad">
-        content_area = detail_soup.find('section', id=rule_name)
+            # 1. 尝试查找新版结构：以规则名为 id 的 section 标签
+            # 例如: <section id="abseil-cleanup-ctad">
+            content_area = detail_soup.find('section', id=rule_name)
 
-        # 2. 如果没找到，尝试旧版结构：class 为 section 的 div
-        if not content_area:
-            content_area = detail_soup.find('div', class_='section')
+            # 2. 如果没找到，尝试旧版结构：class 为 section 的 div
+            if not content_area:
+                content_area = detail_soup.find('div', class_='section')
 
-        # 3. 兜底逻辑：查找页面主要内容区域
-        if not content_area:
-            content_area = detail_soup.find('div', role='main')
+            # 3. 兜底逻辑：查找页面主要内容区域
+            if not content_area:
+                content_area = detail_soup.find('div', role='main')
 
-        if content_area:
-            # 找到 content_area 下的所有段落
-            # 我们需要的是第一个非空的、且不是“Offers fixes”提示的段落
-            paragraphs = content_area.find_all('p', recursive=True)
-            for p in paragraphs:
-                text = p.get_text().strip()
-                # 移除 Sphinx 可能带入的锚点符号 ¶
-                text = text.replace('¶', '')
+            if content_area:
+                # 找到 content_area 下的所有段落
+                # 我们需要的是第一个非空的、且不是“Offers fixes”提示的段落
+                paragraphs = content_area.find_all('p', recursive=True)
+                for p in paragraphs:
+                    text = p.get_text().strip()
+                    # 移除 Sphinx 可能带入的锚点符号 ¶
+                    text = text.replace('¶', '')
 
-                # 过滤掉空的段落或自动生成的“修复”提示语
-                if text and not text.lower().startswith("offers fixes"):
-                    # 返回第一段话
-                    return text
+                    # 过滤掉空的段落或自动生成的“修复”提示语
+                    if text and not text.lower().startswith("offers fixes"):
+                        # 返回第一段话
+                        return text
 
-        return "No description available."
+            return "No description available."
     except Exception as e:
+        metrics.count("failed_rules")
         print(f"  [Warning] Fetching description failed for {url}: {e}")
         return "Failed to fetch description."
 
@@ -68,11 +77,12 @@ def scrape_clang_tidy_index():
     try:
         response = requests.get(INDEX_URL, headers=HEADERS)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with metrics.stage("parse"):
+            soup = BeautifulSoup(response.text, 'html.parser')
 
-        index_data = {}
-        # 定位 tbody 中的所有 tr
-        rows = soup.select('tbody tr')
+            index_data = {}
+            # 定位 tbody 中的所有 tr
+            rows = soup.select('tbody tr')
         total = len(rows)
         print(f"发现 {total} 条规则，开始抓取详细描述...")
 
@@ -110,13 +120,16 @@ def scrape_clang_tidy_index():
 
             # 实时保存，每10个保存一次防止崩掉
             if (i + 1) % 10 == 0:
-                with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(index_data, f, ensure_ascii=False, indent=4)
+                with metrics.stage("write"):
+                    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+                        json.dump(index_data, f, ensure_ascii=False, indent=4)
 
         # 最终保存
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+                json.dump(index_data, f, ensure_ascii=False, indent=4)
 
+        metrics.count("rules_written", len(index_data))
         print(f"\n抓取完成！索引文件已保存至: {OUTPUT_FILE}")
 
     except Exception as e:
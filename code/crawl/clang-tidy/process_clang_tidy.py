@@ -2,9 +2,15 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import sys
 import time
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("process_clang_tidy")
+
 # --- 配置参数 ---
 BASE_URL = "https://clang.llvm.org/extra/clang-tidy/checks/"
 INDEX_FILE = os.path.join("ClangTidy", "ClangTidyIndex.json")
@@ -41,62 +47,66 @@ def get_rule_details_and_options(url, rule_name):
         try:
             time.sleep(0.3)
             resp = requests.get(url, headers=HEADERS, timeout=20)
+            if resp.status_code == 429:
+                metrics.count("http_429")
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-
-            # 1. 定位主容器
-            # 现代 Clang-Tidy 文档结构: <section id="rule-name">
-            content_area = soup.find('section', id=rule_name)
-            if not content_area:
-                # 兼容性备选
-                content_area = soup.find('div', role='main') or soup.find('div', class_='section')
-
-            if not content_area:
-                return None, None
-
-            description_parts = []
-            options_parts = []
-            found_options_start = False
-
-            # 2. 遍历 content_area 的子节点
-            # 注意：新版 Sphinx 会把 Options 放在嵌套的 <section id="options-..."> 里
-            for child in content_area.find_all(recursive=False):
-                if child.name == 'h1':
-                    continue
-
-                # 检测是否进入 Options 区域
-                # 逻辑：如果是标题且包含 options，或者是子 section 且 id/标题包含 options
-                child_id = child.get('id', '').lower()
-                child_text = child.get_text().lower()
-
-                if (child.name in ['h2', 'h3', 'section']) and ('options' in child_id or 'options' in child_text):
-                    found_options_start = True
-                    # 如果是子 section，其内容都在内部，直接提取
-                    if child.name == 'section':
-                        options_parts.append(clean_node_text(child))
+            with metrics.stage("parse"):
+                soup = BeautifulSoup(resp.content, 'html.parser')
+
+                # 1. 定位主容器
+                # 现代 Clang-Tidy 文档结构: <section id="rule-name">
+                content_area = soup.find('section', id=rule_name)
+                if not content_area:
+                    # 兼容性备选
+                    content_area = soup.find('div', role='main') or soup.find('div', class_='section')
+
+                if not content_area:
+                    return None, None
+
+                description_parts = []
+                options_parts = []
+                found_options_start = False
+
+                # 2. 遍历 content_area 的子节点
+                # 注意：新版 Sphinx 会把 Options 放在嵌套的 <section id="options-..."> 里
+                for child in content_area.find_all(recursive=False):
+                    if child.name == 'h1':
                         continue
 
-                # 3. 收集内容
-                content_text = clean_node_text(child)
-                if not content_text:
-                    continue
-
-                if found_options_start:
-                    options_parts.append(content_text)
-                else:
-                    # 过滤掉详情页重复的 "Offers fixes" 提示
-                    if content_text.lower().startswith("offers fixes"):
+                    # 检测是否进入 Options 区域
+                    # 逻辑：如果是标题且包含 options，或者是子 section 且 id/标题包含 options
+                    child_id = child.get('id', '').lower()
+                    child_text = child.get_text().lower()
+
+                    if (child.name in ['h2', 'h3', 'section']) and ('options' in child_id or 'options' in child_text):
+                        found_options_start = True
+                        # 如果是子 section，其内容都在内部，直接提取
+                        if child.name == 'section':
+                            options_parts.append(clean_node_text(child))
+                            continue
+
+                    # 3. 收集内容
+                    content_text = clean_node_text(child)
+                    if not content_text:
                         continue
-                    description_parts.append(content_text)
 
-            desc_final = "\n\n".join(description_parts).strip()
-            opt_final = "\n\n".join(options_parts).strip()
+                    if found_options_start:
+                        options_parts.append(content_text)
+                    else:
+                        # 过滤掉详情页重复的 "Offers fixes" 提示
+                        if content_text.lower().startswith("offers fixes"):
+                            continue
+                        description_parts.append(content_text)
+
+                desc_final = "\n\n".join(description_parts).strip()
+                opt_final = "\n\n".join(options_parts).strip()
 
-            return desc_final or "No detailed description found.", opt_final
+                return desc_final or "No detailed description found.", opt_final
 
         except Exception as e:
             wait = RETRY_DELAY * (attempt + 1)
             if attempt < MAX_RETRIES - 1:
+                metrics.count("retries")
                 print(f"  [Retry] {rule_name} 失败: {e}. {wait}s 后重试...")
                 time.sleep(wait)
             else:
@@ -124,6 +134,7 @@ def enrich_clang_tidy():
 
         # 因为你删除了 rules 文件夹，这里会重新抓取所有内容
         if os.path.exists(save_path):
+            metrics.count("cache_hits")
             continue
 
         print(f"[{i + 1}/{total}] 处理中: {rule_name}")
@@ -132,6 +143,7 @@ def enrich_clang_tidy():
 
         if desc is None:
             # 这种通常是 404 或 结构完全对不上的规则
+            metrics.count("failed_rules")
             final_desc = "FAILED_TO_FETCH"
             final_opts = ""
         else:
@@ -153,8 +165,10 @@ def enrich_clang_tidy():
             }
         }
 
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(final_json, f, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            with open(save_path, 'w', encoding='utf-8') as f:
+                json.dump(final_json, f, ensure_ascii=False, indent=4)
+        metrics.count("rules_written")
 
     print("\n[Done] 所有规则已重新组织到 ClangTidy/rules/ 目录下。")
 
@@ -3,9 +3,17 @@ import json
 import xml.etree.ElementTree as ET
 import requests
 from bs4 import BeautifulSoup
+import sys
 import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
 # 获取cppcheck.xml :
 # 指令cppcheck --errorlist --xml > cppcheck_rules.xml
+
+metrics = instrument("process_cppcheck")
+
 # --- 配置参数 ---
 INPUT_FILE = 'cppcheck_rules.xml'
 BASE_DIR = 'Cppcheck'
@@ -40,26 +48,31 @@ def fetch_detailed_description(url, fallback_msg, rule_id):
             resp = requests.get(url, headers=HEADERS, timeout=15)
 
             # 如果服务器返回 429 或其他非 200 状态，抛出异常进入重试
+            if resp.status_code == 429:
+                metrics.count("http_429")
             resp.raise_for_status()
 
-            soup = BeautifulSoup(resp.content, 'html.parser')
+            with metrics.stage("parse"):
+                soup = BeautifulSoup(resp.content, 'html.parser')
 
-            # 定位 CWE 页面中的 Description 部分
-            desc_div = soup.find('div', id='Description')
-            if desc_div:
-                detail_text = desc_div.find('div', class_='detail')
-                if detail_text:
-                    return detail_text.get_text(strip=True)
+                # 定位 CWE 页面中的 Description 部分
+                desc_div = soup.find('div', id='Description')
+                if desc_div:
+                    detail_text = desc_div.find('div', class_='detail')
+                    if detail_text:
+                        return detail_text.get_text(strip=True)
 
-            # 如果解析不到特定的 div，返回 fallback
-            return fallback_msg
+                # 如果解析不到特定的 div，返回 fallback
+                return fallback_msg
 
         except (requests.exceptions.RequestException, Exception) as e:
             wait_time = RETRY_DELAY * (2 ** attempt)  # 指数退避：2, 4, 8...
             if attempt < MAX_RETRIES - 1:
+                metrics.count("retries")
                 print(f"  [Retry] {rule_id} 访问失败: {e}. {wait_time}s 后进行第 {attempt + 2} 次尝试...")
                 time.sleep(wait_time)
             else:
+                metrics.count("failed_rules")
                 print(f"  [Error] {rule_id} 达到最大重试次数，使用本地描述。错误原因: {e}")
                 return fallback_msg
 
@@ -73,10 +86,11 @@ def process_cppcheck():
         return
 
     try:
-        tree = ET.parse(INPUT_FILE)
-        root = tree.getroot()
-        errors_node = root.find('errors')
-        errors = errors_node.findall('error') if errors_node is not None else root.findall('error')
+        with metrics.stage("parse"):
+            tree = ET.parse(INPUT_FILE)
+            root = tree.getroot()
+            errors_node = root.find('errors')
+            errors = errors_node.findall('error') if errors_node is not None else root.findall('error')
 
         index_data = {}
         total = len(errors)
@@ -104,6 +118,7 @@ def process_cppcheck():
 
             if os.path.exists(save_path):
                 # print(f"[{i + 1}/{total}] 跳过已存在: {rule_id}")
+                metrics.count("cache_hits")
                 continue
 
             print(f"[{i + 1}/{total}] 正在处理: {rule_id}")
@@ -132,12 +147,15 @@ def process_cppcheck():
             }
 
             # 4. 写入规则文件
-            with open(save_path, 'w', encoding='utf-8') as rf:
-                json.dump(rule_content, rf, ensure_ascii=False, indent=4)
+            with metrics.stage("write"):
+                with open(save_path, 'w', encoding='utf-8') as rf:
+                    json.dump(rule_content, rf, ensure_ascii=False, indent=4)
+            metrics.count("rules_written")
 
         # 5. 写入索引文件
-        with open(os.path.join(BASE_DIR, "cppcheckIndex.json"), 'w', encoding='utf-8') as ifile:
-            json.dump(index_data, ifile, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            with open(os.path.join(BASE_DIR, "cppcheckIndex.json"), 'w', encoding='utf-8') as ifile:
+                json.dump(index_data, ifile, ensure_ascii=False, indent=4)
 
         print(f"\n全部处理完成！文件存放在 '{BASE_DIR}' 目录下。")
 
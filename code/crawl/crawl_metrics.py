@@ -0,0 +1,247 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+try:
+    import requests
+except ImportError:  # 只处理本地文件的脚本不需要 requests
+    requests = None
+
+# 抓取脚本的运行指标：分阶段计时 (fetch / parse / write)、下载字节数（线路上压缩后的大小）、重试、429、缓存命中、失败规则数，
+# 以及按主机统计的请求耗时直方图。运行结束时写出
+#   metrics/<crawler>.json     本次运行的 JSON 汇总
+#   metrics/<crawler>.prom     Prometheus textfile collector 格式（原子替换，可直接放到 node_exporter 的 textfile 目录）
+#   metrics/history.jsonl      每次运行追加一行汇总，用于跨运行对比
+# 输出目录默认为当前工作目录下的 metrics/，可用环境变量 LINTCONFIG_METRICS_DIR 指定。
+# 用法（在抓取脚本中）:
+#   metrics = instrument("enrich_eslint")      # 之后所有 requests 请求自动计入 fetch 阶段与主机直方图
+#   with metrics.stage("parse"): ...
+#   metrics.count("cache_hits")
+#   metrics.count("retries") / metrics.count("http_429")   # 在抓取脚本的重试 / 限流分支中显式计数
+
+# --- 配置 ---
+METRICS_DIR_ENV = "LINTCONFIG_METRICS_DIR"
+DEFAULT_METRICS_DIR = "metrics"
+HISTORY_FILE = "history.jsonl"
+PROM_PREFIX = "lintconfig_crawl"
+STAGES = ("fetch", "parse", "write")
+COUNTERS = ("requests", "bytes_downloaded", "retries", "http_429", "cache_hits", "failed_rules", "rules_written")
+# 请求耗时直方图的桶上限（秒）
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CrawlMetrics:
+    """一次抓取运行的指标；阶段计时是独占的：嵌套阶段（parse 中发起请求）只计入最内层"""
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.hosts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._local.__dict__.setdefault("stack", [])
+        now = time.perf_counter()
+        if stack:
+            self._add_stage(stack[-1][0], now - stack[-1][1])
+        stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            stage, since = stack.pop()
+            self._add_stage(stage, now - since)
+            if stack:
+                stack[-1][1] = now
+
+    def _add_stage(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_request(self, url, seconds, status, nbytes):
+        """记录一次 HTTP 请求（重试与 429 由抓取脚本在对应分支中计数，同一 URL 可能被多条规则正常共用）"""
+        host = urlsplit(url).netloc or "unknown"
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["bytes_downloaded"] += nbytes
+            stats = self.hosts.setdefault(host, {"requests": 0, "bytes": 0, "status": {}, "seconds_sum": 0.0,
+                                                 "buckets": [0] * len(BUCKETS)})
+            stats["requests"] += 1
+            stats["bytes"] += nbytes
+            stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+            stats["seconds_sum"] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+
+    # --- 输出 ---
+    def summary(self):
+        wall = time.perf_counter() - self._start
+        stages = {k: round(v, 3) for k, v in self.stages.items()}
+        # 多线程抓取时各阶段为所有线程之和，other 可能为负，按 0 处理
+        stages["other"] = round(max(0.0, wall - sum(self.stages.values())), 3)
+        return {
+            "crawler": self.crawler,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "wall_seconds": round(wall, 3),
+            "stages": stages,
+            "counters": dict(self.counters),
+            "hosts": {host: {**stats, "seconds_sum": round(stats["seconds_sum"], 3),
+                             "buckets": dict(zip([str(b) for b in BUCKETS], stats["buckets"]))}
+                      for host, stats in sorted(self.hosts.items())},
+        }
+
+    def prometheus(self, summary):
+        label = f'crawler="{self.crawler}"'
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PROM_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{name} {kind}")
+            lines.extend(f"{PROM_PREFIX}_{name}{{{labels}}} {value}" for labels, value in samples)
+
+        metric("last_run_timestamp_seconds", "gauge", "Unix time the crawler run started.",
+               [(label, int(self.started))])
+        metric("run_seconds", "gauge", "Wall-clock duration of the last crawler run.",
+               [(label, summary["wall_seconds"])])
+        metric("stage_seconds", "gauge", "Time spent per stage in the last run.",
+               [(f'{label},stage="{stage}"', seconds) for stage, seconds in summary["stages"].items()])
+        for name in COUNTERS:
+            metric(name, "gauge", f"{name.replace('_', ' ').capitalize()} in the last run.",
+                   [(label, self.counters.get(name, 0))])
+        samples = []
+        for host, stats in sorted(self.hosts.items()):
+            host_label = f'{label},host="{host}"'
+            samples += [(f'{host_label},le="{bound}"', n) for bound, n in zip(BUCKETS, stats["buckets"])]
+            samples.append((f'{host_label},le="+Inf"', stats["requests"]))
+        lines.append(f"# HELP {PROM_PREFIX}_request_duration_seconds HTTP request latency per host in the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_request_duration_seconds histogram")
+        lines.extend(f"{PROM_PREFIX}_request_duration_seconds_bucket{{{labels}}} {value}" for labels, value in samples)
+        for host, stats in sorted(self.hosts.items()):
+            host_label = f'{label},host="{host}"'
+            lines.append(f"{PROM_PREFIX}_request_duration_seconds_sum{{{host_label}}} {stats['seconds_sum']:.3f}")
+            lines.append(f"{PROM_PREFIX}_request_duration_seconds_count{{{host_label}}} {stats['requests']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=None):
+        directory = directory or os.environ.get(METRICS_DIR_ENV) or DEFAULT_METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        outputs = {f"{self.crawler}.json": json.dumps(summary, ensure_ascii=False, indent=4),
+                   f"{self.crawler}.prom": self.prometheus(summary)}
+        for name, text in outputs.items():
+            # textfile collector 可能随时读取，先写临时文件再替换
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, os.path.join(directory, name))
+        with open(os.path.join(directory, HISTORY_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+        return summary
+
+    def report(self):
+        summary = self.write()
+        stages = "  ".join(f"{k} {v:.1f}s" for k, v in summary["stages"].items())
+        c = summary["counters"]
+        print(f"[Metrics] {self.crawler}: {summary['wall_seconds']:.1f}s ({stages})；{c['requests']} 次请求 "
+              f"{c['bytes_downloaded'] / 1024:.0f} KB，重试 {c['retries']}，429 {c['http_429']}，"
+              f"缓存命中 {c['cache_hits']}，失败规则 {c['failed_rules']}")
+
+
+class _CountingReader:
+    """包装 http.client 读取的底层连接文件对象，累计从连接读出的原始字节（含压缩与分块帧）"""
+
+    def __init__(self, fp):
+        self._fp = fp
+        self.count = 0
+
+    def _counted(self, data):
+        self.count += len(data)
+        return data
+
+    def read(self, *args):
+        return self._counted(self._fp.read(*args))
+
+    def read1(self, *args):
+        return self._counted(self._fp.read1(*args))
+
+    def readline(self, *args):
+        return self._counted(self._fp.readline(*args))
+
+    def readinto(self, buffer):
+        n = self._fp.readinto(buffer)
+        self.count += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+
+def _count_wire(response, *args, **kwargs):
+    """response 钩子：requests 在读取响应体之前调用，换上计数的连接文件对象"""
+    connection = getattr(getattr(response.raw, "_fp", None), "fp", None)
+    if connection is not None and not isinstance(connection, _CountingReader):
+        response.raw._fp.fp = response._wire_counter = _CountingReader(connection)
+    return response
+
+
+def _wire_bytes(method, response):
+    """响应体在线路上的字节数（gzip 等压缩后的大小，不是解码后的 len(response.content)）：
+    已读取的响应体取连接上实际读出的字节数；stream=True 尚未读取时退回 Content-Length"""
+    if method.upper() == "HEAD":
+        return 0
+    counter = getattr(response, "_wire_counter", None)
+    if counter is not None and counter.count:
+        return counter.count
+    length = response.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else 0
+
+
+def _patch_requests(metrics):
+    """包装 requests.Session.request（requests.get 等也经由它），记录每个请求的耗时、状态码与下载字节数"""
+    original = requests.Session.request
+
+    def request(session, method, url, *args, **kwargs):
+        # 计数钩子排在调用方的钩子之前，保证在任何读取响应体的操作之前生效
+        hooks = dict(kwargs.get("hooks") or {})
+        existing = hooks.get("response") or []
+        hooks["response"] = [_count_wire] + (list(existing) if isinstance(existing, (list, tuple)) else [existing])
+        kwargs["hooks"] = hooks
+        start = time.perf_counter()
+        with metrics.stage("fetch"):
+            try:
+                response = original(session, method, url, *args, **kwargs)
+            except Exception:
+                metrics.record_request(url, time.perf_counter() - start, "error", 0)
+                raise
+        metrics.record_request(url, time.perf_counter() - start, response.status_code, _wire_bytes(method, response))
+        return response
+
+    requests.Session.request = request
+
+
+_active = None
+
+
+def instrument(crawler):
+    """为当前抓取脚本启用指标；返回 CrawlMetrics，进程退出时写出汇总"""
+    global _active
+    if _active is None:
+        _active = CrawlMetrics(crawler)
+        if requests is not None:
+            _patch_requests(_active)
+        atexit.register(_active.report)
+    return _active
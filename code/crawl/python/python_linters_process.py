@@ -0,0 +1,411 @@
+import argparse
+import configparser
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import pkgutil
+import re
+import sys
+import time
+
+try:
+    import pylint
+    from pylint.lint import PyLinter
+except ImportError:
+    pylint = None
+
+try:
+    import flake8
+    from flake8.main import options as flake8_options
+    from flake8.options.manager import OptionManager
+    from flake8.plugins import finder
+except ImportError:
+    flake8 = None
+
+# 直接 import 本机安装的 pylint / flake8，在进程内枚举消息与配置项，生成
+#   Pylint/PylintIndex.json、Pylint/PylintCompleteInformation.json、Pylint/rules/<msgid>.json
+#   Flake8/Flake8Index.json、Flake8/Flake8CompleteInformation.json、Flake8/rules/<code>.json
+# 不联网、不解析文档网页，输出与安装的版本一一对应：
+#   - Pylint: PyLinter 注册全部内置 checker 与 pylint.extensions 中的可选 checker，消息来自 msgs_store，
+#     配置项来自各 checker 的 options（类型、默认值、可选值），只挂到与之相关的消息上（见 option_applies）
+#   - Flake8: 用 flake8 自己的插件发现机制加载 flake8.extension 入口点；pyflakes 的码表来自 flake8，
+#     其余插件（pycodestyle、mccabe 与第三方插件）的码与消息模板从插件模块源码中的 "<CODE> message" 字面量提取，
+#     配置项来自插件 add_options 注册到 OptionManager 的选项
+# option 的格式与 Ruff 相同: {配置名: {option_description, option_data_type, default_value, option_values}}
+# 安装包中没有的文档内容从已有知识库 (--previous) 沿用：
+#   - Pylint 规则的 "Problematic code / Correct code / Additional details / Related links"（来自 pylint 文档仓库的示例）
+#   - Flake8 中消息在源码里动态拼接的规则描述
+# 用法示例:
+# python python_linters_process.py
+# python python_linters_process.py --linter Pylint --output build --previous ../../skills/LintConfig/data
+# python python_linters_process.py --no-extensions
+
+# --- 配置 ---
+PYLINT_DIR = "Pylint"
+FLAKE8_DIR = "Flake8"
+PYLINT_URL = "https://pylint.readthedocs.io/en/stable/user_guide/messages/{category}/{symbol}.html"
+PYLINT_CATEGORIES = {"C": "convention", "R": "refactor", "W": "warning", "E": "error", "F": "fatal", "I": "info"}
+# optparse 风格的类型名 -> 文档中的类型记法
+PYLINT_TYPES = {
+    "int": "int", "float": "float", "string": "str", "non_empty_string": "str", "yn": "bool",
+    "csv": "list[str]", "regexp": "regex", "regexp_csv": "list[regex]", "regexp_paths_csv": "list[regex]",
+    "glob_paths_csv": "list[str]", "paths_csv": "list[str]", "py_version": "str", "confidence": "list[str]",
+}
+FLAKE8_URL = "https://flake8.pycqa.org/en/latest/user/error-codes.html"
+PYCODESTYLE_URL = "https://pycodestyle.pycqa.org/en/latest/intro.html"
+# 由 flake8 本身注册、实际传给 pycodestyle 的配置项 -> 受影响的规则码
+CORE_OPTION_CODES = {
+    "max-line-length": ["E501"],
+    "max-doc-length": ["W505"],
+    "hang-closing": ["E133"],
+    "indent-size": ["E111", "E114", "E117"],
+}
+# flake8 自身报告的码（读取失败、语法错误）定义在 flake8.checker 中
+FLAKE8_CORE_MODULE = "flake8.checker"
+FLAKE8_CODE = re.compile(r'^[A-Z]{1,3}\d{3}$')
+# 已有 Pylint 规则描述中来自文档仓库的章节，位于 "Description: ..." 之后、"Created by the ... checker." 之前
+PYLINT_DOC_SECTIONS = re.compile(
+    r' ((?:Problematic code|Correct code|Additional details|Related links): .*?)(?: Created by the [\w-]+ checker\.)?$',
+    re.DOTALL)
+# 配置名 / 消息名中不区分规则的词
+OPTION_STOPWORDS = {"max", "min", "ignore", "ignored", "allow", "allowed", "check", "too", "many", "few", "bad",
+                    "use", "used", "consider"}
+# 名称与说明都看不出作用于哪条消息的 Pylint 配置项 -> 受影响的消息
+PYLINT_OPTION_MESSAGES = {
+    "max-line-length": ["line-too-long"],
+    "max-module-lines": ["too-many-lines"],
+    "max-statements": ["too-many-statements"],
+    "single-line-if-stmt": ["multiple-statements"],
+    "single-line-class-stmt": ["multiple-statements"],
+    "good-names": ["invalid-name"],
+    "good-names-rgxs": ["invalid-name"],
+    "name-group": ["invalid-name"],
+    "known-standard-library": ["wrong-import-order"],
+    "known-first-party": ["wrong-import-order"],
+    "known-third-party": ["wrong-import-order"],
+    "generated-members": ["no-member"],
+    "ignore-mixin-members": ["no-member"],
+    "mixin-class-rgx": ["no-member"],
+    "missing-member-hint": ["no-member"],
+    "missing-member-hint-distance": ["no-member"],
+    "missing-member-max-choices": ["no-member"],
+    "signature-mutators": ["no-value-for-parameter", "unexpected-keyword-arg"],
+    "notes-rgx": ["fixme"],
+    "exclude-too-few-public-methods": ["too-few-public-methods"],
+    "additional-builtins": ["undefined-variable"],
+    "callbacks": ["unused-argument"],
+}
+# <type>-naming-style / <type>-rgx 只用于 invalid-name
+PYLINT_NAMING_OPTION = re.compile(r'^[a-z-]+-(naming-style|rgx)$')
+
+
+# --- 配置项 ---
+def jsonable(value):
+    """默认值中的 tuple / set / 正则 / Path 转为 JSON 可表示的值"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [jsonable(v) for v in value]
+        return sorted(items, key=str) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, re.Pattern):
+        return value.pattern
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def option_record(description, data_type, default, choices=()):
+    return {
+        "option_description": " ".join((description or "").split()),
+        "option_data_type": data_type,
+        "default_value": json.dumps(jsonable(default), ensure_ascii=False) if default is not None else "",
+        "option_values": {"valuelist": [str(c) for c in choices or ()]},
+    }
+
+
+def value_type(default):
+    if isinstance(default, bool):
+        return "bool"
+    if isinstance(default, (list, tuple, set)):
+        return "list[str]"
+    return {int: "int", float: "float"}.get(type(default), "str")
+
+
+# --- Pylint ---
+def pylint_option_type(optdict):
+    kind = optdict.get("type")
+    choices = optdict.get("choices") or ()
+    if kind == "choice":
+        return " | ".join(json.dumps(c) for c in choices)
+    if kind == "multiple_choice":
+        return f"list[{' | '.join(json.dumps(c) for c in choices)}]"
+    if kind in PYLINT_TYPES:
+        return PYLINT_TYPES[kind]
+    if optdict.get("action") in ("store_true", "store_false"):
+        return "bool"
+    return value_type(optdict.get("default"))
+
+
+def load_pylint(extensions):
+    """返回注册好全部 checker 的 PyLinter；extensions 为 True 时同时加载 pylint.extensions 中的可选 checker"""
+    linter = PyLinter()
+    linter.load_default_plugins()
+    failed = []
+    if extensions:
+        import pylint.extensions
+        for module in pkgutil.iter_modules(pylint.extensions.__path__):
+            if module.name.startswith("_"):
+                continue
+            try:
+                linter.load_plugin_modules([f"pylint.extensions.{module.name}"])
+            except (ImportError, AttributeError) as e:
+                # 个别扩展依赖未安装的第三方包 (如 enchant)，或不是 checker 模块
+                failed.append(f"{module.name} ({e})")
+    return linter, failed
+
+
+def previous_doc_sections(previous, msgid):
+    match = PYLINT_DOC_SECTIONS.search(previous.get(msgid, {}).get("description", ""))
+    return match.group(1) if match else None
+
+
+def name_words(name):
+    """max-line-length -> {"line", "length"}；去掉复数 s"""
+    words = (w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+             for w in re.split(r'[^a-z0-9]+', name.lower()) if w)
+    return {w for w in words if w not in OPTION_STOPWORDS}
+
+
+def same_word(a, b):
+    """args / argument、bool / boolean、indent / indentation 按前缀视为同一个词"""
+    return a == b or (min(len(a), len(b)) >= 3 and (a.startswith(b) or b.startswith(a)))
+
+
+def option_applies(option, help_text, message, text, checker_options):
+    """
+    配置项是否与消息相关（同一 checker 的配置项不一定影响它的每条消息，如 max-line-length 与 trailing-whitespace）：
+    PYLINT_OPTION_MESSAGES 中列出，消息描述 / 文档中写到配置名，配置说明中写到消息名，
+    或配置名中有区分度的词（在该 checker 的配置名中不超过 2 次）出现在消息名中（max-args -> too-many-arguments），
+    或全部出现在消息描述中（max-parents -> too-many-ancestors）
+    """
+    if option in PYLINT_OPTION_MESSAGES:
+        return message.symbol in PYLINT_OPTION_MESSAGES[option]
+    if PYLINT_NAMING_OPTION.match(option) and not option.startswith(("no-docstring", "dummy-", "mixin-")):
+        return message.symbol == "invalid-name"
+    if option in text or message.symbol in (help_text or ""):
+        return True
+    words = {w for w in name_words(option)
+             if sum(1 for o in checker_options if any(same_word(w, v) for v in name_words(o))) <= 2}
+    if any(same_word(a, b) for a in words for b in name_words(message.symbol)):
+        return True
+    text_words = name_words(text)
+    return bool(words) and all(any(same_word(a, b) for b in text_words) for a in words)
+
+
+def build_pylint(extensions, previous):
+    linter, failed = load_pylint(extensions)
+    # "main" checker 即 PyLinter 本身，它的配置项是运行参数 (jobs、ignore ...)，不属于任何一条消息
+    options = {}
+    for checker in linter.get_checkers():
+        if checker is linter:
+            continue
+        for name, optdict in checker.options:
+            record = option_record(optdict.get("help"), pylint_option_type(optdict),
+                                   optdict.get("default"), optdict.get("choices"))
+            options.setdefault(checker.name, {})[name] = (record, optdict.get("help"))
+    messages_per_checker = {}
+    for message in linter.msgs_store.messages:
+        messages_per_checker[message.checker_name] = messages_per_checker.get(message.checker_name, 0) + 1
+
+    index, complete = {}, {}
+    for message in sorted(linter.msgs_store.messages, key=lambda m: m.msgid):
+        description = " ".join(message.description.split())
+        header = f"[Status: stable] [Name: {message.symbol}] [Message: {message.msg}]"
+        first = re.match(r'(.+?\.)(\s|$)', description)
+        index[message.msgid] = {
+            "description": f"{header} {first.group(1) if first else description}",
+            "ruleurl": PYLINT_URL.format(category=PYLINT_CATEGORIES.get(message.msgid[0], "info"),
+                                         symbol=message.symbol),
+        }
+        details = [header, f"Description: {description}"]
+        docs = previous_doc_sections(previous, message.msgid)
+        if docs:
+            details.append(docs)
+        if message.old_names:
+            details.append("Old names: " + ", ".join(f"{msgid} ({symbol})" for msgid, symbol in message.old_names))
+        if message.minversion or message.maxversion:
+            versions = [".".join(map(str, v)) if v else "" for v in (message.minversion, message.maxversion)]
+            details.append(f"Python versions: {versions[0]}..{versions[1]}")
+        details.append(f"Created by the {message.checker_name} checker.")
+        text = f"{message.msg} {description} {docs or ''}"
+        # 只产生一条消息的 checker，其配置项都属于这条消息
+        single = messages_per_checker[message.checker_name] == 1
+        complete[message.msgid] = {
+            "description": " ".join(details),
+            "option": {name: record for name, (record, help_text) in options.get(message.checker_name, {}).items()
+                       if single or option_applies(name, help_text, message, text, options[message.checker_name])},
+        }
+    return index, complete, f"pylint {pylint.__version__}", failed
+
+
+# --- Flake8 ---
+def load_flake8():
+    """用 flake8 的插件发现机制加载插件，并把各插件的配置项注册到 OptionManager；返回 (插件列表, {插件包名: [Option]})"""
+    plugin_opts = finder.PluginOptions.blank()
+    plugins = finder.load_plugins(finder.find_plugins(configparser.RawConfigParser(), plugin_opts), plugin_opts)
+    manager = OptionManager(version=flake8.__version__, plugin_versions=plugins.versions_str(),
+                            parents=[], formatter_names=list(plugins.reporters))
+    flake8_options.register_default_options(manager)
+    registered = {"flake8": list(manager.options)}
+    for loaded in plugins.all_plugins():
+        add_options = getattr(loaded.obj, "add_options", None)
+        if add_options is None or loaded.plugin.package in registered:
+            continue
+        before = len(manager.options)
+        add_options(manager)
+        registered[loaded.plugin.package] = manager.options[before:]
+    return [p for p in plugins.all_plugins() if p.plugin.entry_point.group == "flake8.extension"], registered
+
+
+def flake8_option_record(option):
+    # 未指定的属性是哨兵值 _ARG.NO，只取 argparse 实际收到的参数
+    _, kwargs = option.to_argparse()
+    default = kwargs.get("default")
+    if kwargs.get("action") in ("store_true", "store_false"):
+        data_type = "bool"
+    elif option.comma_separated_list:
+        data_type = "list[str]"
+    elif kwargs.get("type") in (int, float):
+        data_type = kwargs["type"].__name__
+    else:
+        data_type = value_type(default)
+    return option_record(kwargs.get("help"), data_type, default, kwargs.get("choices"))
+
+
+def source_codes(module_names, prefix):
+    """在模块源码中查找以 prefix 开头的规则码：'"E501 line too long (%d > %d characters)"' 形式带消息模板，
+    只出现码本身的（消息在别处拼接，如 "E11%d %s"，只能从 docstring 中的 "E111: a = 1" 示例行得到码）消息为空"""
+    found = {}
+    pattern = re.compile(rf'(["\'])({re.escape(prefix)}\d+)(?:\s+(.*?))?\1')
+    example = re.compile(rf'^\s+({re.escape(prefix)}\d+):\s', re.MULTILINE)
+    for name in module_names:
+        try:
+            source = inspect.getsource(importlib.import_module(name))
+        except (ImportError, OSError, TypeError):
+            continue
+        matches = pattern.findall(source) + [("", code, "") for code in example.findall(source)]
+        for _, code, message in matches:
+            # flake8 的规则码为 1~3 个大写字母加 3 位数字，排除 "prefix='E4'" 这类前缀
+            if not FLAKE8_CODE.match(code):
+                continue
+            if message or code not in found:
+                found[code] = message or found.get(code, "")
+    return found
+
+
+def plugin_modules(loaded):
+    """插件入口对象所在模块，加上插件包本身的顶层模块（flake8 自带的 pycodestyle 入口只是对 pycodestyle 的包装）"""
+    names = [inspect.getmodule(loaded.obj).__name__]
+    package = loaded.plugin.package.replace("-", "_")
+    for candidate in (package, package.replace("flake8_", "")):
+        if importlib.util.find_spec(candidate) is not None:
+            names.append(candidate)
+            break
+    return names
+
+
+def build_flake8(previous):
+    from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+    import pyflakes.messages
+
+    plugins, registered = load_flake8()
+    codes = {}    # code -> (消息, 插件包名)
+    for loaded in plugins:
+        package = loaded.plugin.package
+        if package == "pyflakes":
+            for name, code in FLAKE8_PYFLAKES_CODES.items():
+                message = getattr(getattr(pyflakes.messages, name, None), "message", "")
+                codes[code] = (message, package)
+            continue
+        for code, message in source_codes(plugin_modules(loaded), loaded.entry_name).items():
+            codes.setdefault(code, (message, package))
+    for code, message in source_codes([FLAKE8_CORE_MODULE], "E9").items():
+        codes.setdefault(code, (message, "flake8"))
+
+    options = {package: {o.long_option_name.lstrip("-"): flake8_option_record(o) for o in opts
+                         if isinstance(o.long_option_name, str)}
+               for package, opts in registered.items()}
+    index, complete = {}, {}
+    for code in sorted(codes):
+        message, package = codes[code]
+        # 消息在源码中动态拼接的码沿用已有知识库中的描述
+        description = message or previous.get(code, {}).get("description", "")
+        option = {} if package == "flake8" else dict(options.get(package, {}))
+        for name, affected in CORE_OPTION_CODES.items():
+            if code in affected and name in options["flake8"]:
+                option[name] = options["flake8"][name]
+        index[code] = {"description": description,
+                       "ruleurl": PYCODESTYLE_URL if package == "pycodestyle" else FLAKE8_URL}
+        complete[code] = {"description": description, "option": option}
+    versions = ", ".join(f"{p.plugin.package} {p.plugin.version}" for p in plugins)
+    return index, complete, f"flake8 {flake8.__version__} ({versions})", []
+
+
+# --- 输出 ---
+def read_previous(directory, name):
+    """已有知识库的完整信息 {规则: {description, option}}；没有 CompleteInformation 时退回索引"""
+    for filename in (f"{name}CompleteInformation.json", f"{name}Index.json"):
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return {}
+
+
+def write_kb(out_dir, name, index, complete):
+    rules_dir = os.path.join(out_dir, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    for code, rule in complete.items():
+        with open(os.path.join(rules_dir, f"{code}.json"), 'w', encoding='utf-8') as f:
+            json.dump(rule, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, f"{name}Index.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out_dir, f"{name}CompleteInformation.json"), 'w', encoding='utf-8') as f:
+        json.dump(complete, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在进程内枚举本机 pylint / flake8 的消息与配置项，生成知识库")
+    parser.add_argument("--linter", action="append", choices=["Pylint", "Flake8"], default=None,
+                        help="只生成这些 Linter，默认两者都生成")
+    parser.add_argument("--output", default=".", help="输出根目录，其下生成 Pylint/ 与 Flake8/")
+    parser.add_argument("--no-extensions", action="store_true", help="不加载 pylint.extensions 中的可选 checker")
+    parser.add_argument("--previous", default=None, help="已有知识库根目录（其下有 Pylint/、Flake8/），默认同 --output")
+    args = parser.parse_args()
+
+    linters = args.linter or ["Pylint", "Flake8"]
+    missing = [n for n, module in (("Pylint", pylint), ("Flake8", flake8)) if n in linters and module is None]
+    if missing:
+        print(f"错误: 当前 Python 环境未安装 {', '.join(m.lower() for m in missing)} (pip install {' '.join(m.lower() for m in missing)})")
+        return 1
+
+    for name in linters:
+        start = time.perf_counter()
+        sub_dir = PYLINT_DIR if name == "Pylint" else FLAKE8_DIR
+        out_dir = os.path.join(args.output, sub_dir)
+        previous = read_previous(os.path.join(args.previous or args.output, sub_dir), name)
+        if name == "Pylint":
+            index, complete, version, failed = build_pylint(not args.no_extensions, previous)
+        else:
+            index, complete, version, failed = build_flake8(previous)
+        write_kb(out_dir, name, index, complete)
+        typed = sum(1 for rule in complete.values() if rule["option"])
+        print(f"{version}: 共 {len(index)} 条规则，{typed} 条带配置项，已写入 {out_dir}/ "
+              f"({time.perf_counter() - start:.2f}s)")
+        for item in failed:
+            print(f"  [Warning] 未能加载扩展 {item}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
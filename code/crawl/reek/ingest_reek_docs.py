@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import re
+import sys
+import tarfile
+import time
+import zipfile
+
+# 从本地 reek 仓库（checkout、docs 目录或 GitHub 下载的 .zip / .tar.gz 归档）一次性生成 ReekIndex.json 与 rules/*.json，
+# 无需联网。Markdown 直接按块（标题 / 段落 / 列表 / 代码块）解析，不再经过 markdown -> HTML -> BeautifulSoup。
+# 规则列表取自 docs/Code-Smells.md 中的 [Name](File.md) 链接；"Configuration" / "Parameters" 标题之后的内容作为选项。
+# 用法示例:
+# python ingest_reek_docs.py ~/src/reek
+# python ingest_reek_docs.py reek-master.zip
+# python ingest_reek_docs.py reek-6.5.0.tar.gz --output Reek
+
+# --- 配置 ---
+INDEX_DOC = "Code-Smells.md"
+OUTPUT_DIR = "Reek"
+DISPLAY_URL = "https://github.com/troessner/reek/blob/master/docs/{}"
+SKIP_LINKS = {"Code Smells", "README", "Configuration"}
+NO_OPTIONS = "This rule has no specific options."
+OPTION_HEADING = re.compile(r'configuration|parameters', re.IGNORECASE)
+
+
+# --- 读取文档 ---
+def read_docs(source):
+    """返回 {文件名: Markdown 文本}，只读取包含 Code-Smells.md 的 docs 目录"""
+    def pick(names):
+        # 归档中 docs 目录可能带顶层前缀（reek-master/docs/...）
+        prefixes = [n[:-len(INDEX_DOC)] for n in names if n.endswith("/" + INDEX_DOC) or n == INDEX_DOC]
+        if not prefixes:
+            raise FileNotFoundError(f"{source} 中没有 {INDEX_DOC}")
+        prefix = min(prefixes, key=len)
+        return {n: n[len(prefix):] for n in names
+                if n.startswith(prefix) and n.endswith(".md") and "/" not in n[len(prefix):]}
+
+    if os.path.isdir(source):
+        for candidate in (source, os.path.join(source, "docs")):
+            if os.path.exists(os.path.join(candidate, INDEX_DOC)):
+                docs = {}
+                for filename in os.listdir(candidate):
+                    if filename.endswith(".md"):
+                        with open(os.path.join(candidate, filename), 'r', encoding='utf-8') as f:
+                            docs[filename] = f.read()
+                return docs
+        raise FileNotFoundError(f"{source} 中没有 {INDEX_DOC}")
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            wanted = pick(archive.namelist())
+            return {filename: archive.read(name).decode("utf-8") for name, filename in wanted.items()}
+    with tarfile.open(source, "r:*") as archive:
+        wanted = pick([m.name for m in archive.getmembers() if m.isfile()])
+        return {filename: archive.extractfile(name).read().decode("utf-8") for name, filename in wanted.items()}
+
+
+# --- Markdown 解析 ---
+def inline_text(text):
+    """去掉链接、图片与强调标记，保留行内代码"""
+    text = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'(\*\*|__)(.+?)\1', r'\2', text)
+    text = re.sub(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?!\w)', r'\1', text)
+    text = re.sub(r'(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)', r'\1', text)
+    return text
+
+
+def parse_blocks(md):
+    """把 Markdown 切成 [(类型, 级别, 文本)]，类型为 heading / paragraph / list / code / table"""
+    blocks, lines, i = [], md.splitlines(), 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        fence = re.match(r'\s*(```|~~~)\s*(\S*)', line)
+        if fence:
+            body, i = [], i + 1
+            while i < len(lines) and not lines[i].strip().startswith(fence.group(1)):
+                body.append(lines[i])
+                i += 1
+            blocks.append(("code", 0, f"{fence.group(1)}{fence.group(2)}\n" + "\n".join(body) + f"\n{fence.group(1)}"))
+            i += 1
+            continue
+        heading = re.match(r'(#{1,6})\s+(.*?)\s*#*\s*$', stripped)
+        if heading:
+            blocks.append(("heading", len(heading.group(1)), inline_text(heading.group(2))))
+            i += 1
+            continue
+        if i + 1 < len(lines) and stripped and re.match(r'^(=+|-+)\s*$', lines[i + 1]) \
+                and not re.match(r'\s*([-*+]|\d+\.)\s', line):
+            blocks.append(("heading", 1 if lines[i + 1].startswith("=") else 2, inline_text(stripped)))
+            i += 2
+            continue
+        if not stripped:
+            i += 1
+            continue
+
+        # 段落、列表、表格、缩进代码块：收集到空行为止
+        kind = "list" if re.match(r'\s*([-*+]|\d+\.)\s', line) else "table" if stripped.startswith("|") \
+            else "code" if line.startswith("    ") else "paragraph"
+        body = []
+        while i < len(lines) and lines[i].strip() and not re.match(r'\s*(```|~~~|#{1,6}\s)', lines[i]):
+            body.append(lines[i])
+            i += 1
+        if kind == "paragraph":
+            text = inline_text(" ".join(l.strip() for l in body))
+        elif kind == "list":
+            items = []
+            for l in body:
+                item = re.match(r'(\s*)([-*+]|\d+\.)\s+(.*)', l)
+                if item:
+                    items.append(f"{item.group(1)}- {inline_text(item.group(3))}")
+                elif items:
+                    items[-1] += " " + inline_text(l.strip())
+            text = "\n".join(items)
+        elif kind == "table":
+            rows = [l for l in body if not re.match(r'^\s*\|?[\s:|-]+\|?\s*$', l)]
+            text = "\n".join(inline_text(l.strip()) for l in rows)
+        else:
+            text = "```\n" + "\n".join(l[4:] for l in body) + "\n```"
+        blocks.append((kind, 0, text))
+    return blocks
+
+
+def parse_smell(md):
+    """返回 (摘要, 描述, 选项)；一级标题丢弃，配置 / 参数标题之后的内容作为选项"""
+    blocks = parse_blocks(md)
+    description, options, in_options, section = [], [], False, None
+    for kind, level, text in blocks:
+        if kind == "heading":
+            if level == 1:
+                continue
+            if level <= 3 and OPTION_HEADING.search(text):
+                in_options, section = True, level
+                continue
+            if in_options and level <= section:
+                in_options = False
+        (options if in_options else description).append(text)
+    summary = next((text for kind, _, text in blocks if kind == "paragraph"), "")
+    return summary, "\n\n".join(description).strip(), "\n\n".join(options).strip() or NO_OPTIONS
+
+
+def build_kb(docs):
+    index, rules, missing = {}, {}, []
+    for name, filename in re.findall(r'\[(.*?)\]\((.*?\.md)\)', docs[INDEX_DOC]):
+        if name in SKIP_LINKS or name in index:
+            continue
+        filename = os.path.basename(filename)
+        if filename not in docs:
+            missing.append(filename)
+            continue
+        summary, description, option = parse_smell(docs[filename])
+        index[name] = {"description": summary, "url": DISPLAY_URL.format(filename)}
+        rules[name] = {name: {"description": f"Description\n\n{description}", "option": option}}
+    return index, rules, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从本地 reek 文档离线生成 Reek 知识库")
+    parser.add_argument("source", help="reek 仓库目录、docs 目录或 .zip / .tar.gz 归档")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        docs = read_docs(args.source)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"错误: 无法读取 {args.source}: {e}")
+        return 1
+
+    index, rules, missing = build_kb(docs)
+    if missing:
+        print(f"索引中引用但文档不存在，已跳过: {', '.join(missing)}")
+    rules_dir = os.path.join(args.output, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    for name, data in rules.items():
+        with open(os.path.join(rules_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    with open(os.path.join(args.output, "ReekIndex.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+
+    print(f"共 {len(index)} 条规则，已写入 {args.output}/ ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,16 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import sys
 import time
 import re
 import markdown  # 如果没有请执行 pip install markdown
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawl_metrics import instrument  # noqa: E402
+
+metrics = instrument("reek_process")
+
 # --- 配置（使用 Raw 链接避免被封） ---
 RAW_BASE_URL = "https://raw.githubusercontent.com/troessner/reek/master/docs/"
 INDEX_RAW_URL = RAW_BASE_URL + "Code-Smells.md"
@@ -21,6 +27,9 @@ HEADERS = {
 def get_content_with_retry(url):
     """带重试的获取 Raw 内容函数"""
     for attempt in range(5):
+        # 非 200 响应与异常都会进入下一轮
+        if attempt:
+            metrics.count("retries")
         try:
             # 即使是 Raw 链接，也稍微停顿一下
             time.sleep(0.3)
@@ -28,6 +37,7 @@ def get_content_with_retry(url):
             if resp.status_code == 200:
                 return resp.text
             elif resp.status_code == 429:
+                metrics.count("http_429")
                 wait = 5 * (attempt + 1)
                 print(f"  [Wait] 触发频率限制，等待 {wait} 秒...")
                 time.sleep(wait)
@@ -68,60 +78,67 @@ def scrape_reek():
     for name, raw_url, display_url in rule_tasks:
         save_path = os.path.join(RULES_DIR, f"{name}.json")
         if os.path.exists(save_path):
+            metrics.count("cache_hits")
             continue
 
         print(f"处理中: {name}")
         md_text = get_content_with_retry(raw_url)
-        if not md_text: continue
-
-        # 将 Markdown 转为 HTML 方便解析
-        html_content = markdown.markdown(md_text)
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        description_parts = []
-        options_parts = []
-        in_config_section = False
-
-        # 2. 遍历解析
-        for child in soup.find_all(recursive=False):
-            # 判定配置部分的开始
-            text = child.get_text().strip()
-            if child.name in ['h2', 'h3'] and ('configuration' in text.lower() or 'parameters' in text.lower()):
-                in_config_section = True
-                continue
-
-            if in_config_section:
-                options_parts.append(text)
-            else:
-                # 过滤掉一级标题
-                if child.name == 'h1': continue
-                description_parts.append(text)
-
-        # 3. 整合数据
-        desc_text = "\n\n".join(description_parts).strip()
-        opt_text = "\n\n".join(options_parts).strip() if options_parts else "This rule has no specific options."
-
-        summary = description_parts[0] if description_parts else ""
-
-        rules_index[name] = {
-            "description": summary,
-            "url": display_url
-        }
-
-        # 4. 写入独立 JSON
-        final_rule_content = {
-            name: {
-                "description": f"Description\n\n{desc_text}",
-                "option": opt_text
+        if not md_text:
+            metrics.count("failed_rules")
+            continue
+
+        with metrics.stage("parse"):
+            # 将 Markdown 转为 HTML 方便解析
+            html_content = markdown.markdown(md_text)
+            soup = BeautifulSoup(html_content, 'html.parser')
+
+            description_parts = []
+            options_parts = []
+            in_config_section = False
+
+            # 2. 遍历解析
+            for child in soup.find_all(recursive=False):
+                # 判定配置部分的开始
+                text = child.get_text().strip()
+                if child.name in ['h2', 'h3'] and ('configuration' in text.lower() or 'parameters' in text.lower()):
+                    in_config_section = True
+                    continue
+
+                if in_config_section:
+                    options_parts.append(text)
+                else:
+                    # 过滤掉一级标题
+                    if child.name == 'h1': continue
+                    description_parts.append(text)
+
+            # 3. 整合数据
+            desc_text = "\n\n".join(description_parts).strip()
+            opt_text = "\n\n".join(options_parts).strip() if options_parts else "This rule has no specific options."
+
+            summary = description_parts[0] if description_parts else ""
+
+            rules_index[name] = {
+                "description": summary,
+                "url": display_url
+            }
+
+            # 4. 写入独立 JSON
+            final_rule_content = {
+                name: {
+                    "description": f"Description\n\n{desc_text}",
+                    "option": opt_text
+                }
             }
-        }
 
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(final_rule_content, f, ensure_ascii=False, indent=4)
+        with metrics.stage("write"):
+            with open(save_path, 'w', encoding='utf-8') as f:
+                json.dump(final_rule_content, f, ensure_ascii=False, indent=4)
+        metrics.count("rules_written")
 
     # 5. 保存索引
-    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-        json.dump(rules_index, f, ensure_ascii=False, indent=4)
+    with metrics.stage("write"):
+        with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(rules_index, f, ensure_ascii=False, indent=4)
 
     print(f"\n全部完成！结果已保存在 '{BASE_DIR}' 目录下。")
 
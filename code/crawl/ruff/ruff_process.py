@@ -1,35 +1,23 @@
 import json
 import os
 
+from ruff_rules import SchemaResolver, option_record
+
 # 获取ruff.json : (其中包含了所有ruff的配置项和描述等信息)
 # curl -L https://json.schemastore.org/ruff.json -o ruff.json
+# 生成配置项 (settings) 文档；Schema 递归展开，lint.* / format.* 等子表中的每个配置项各生成一个文件。
+# 按规则码组织的 Ruff 知识库由 ruff_rules.py 生成，两者输出目录不同，互不覆盖。
 # --- 配置 ---
 INPUT_FILE = "ruff.json"
-BASE_DIR = "Ruff"
+BASE_DIR = "RuffSettings"
 RULES_DIR = os.path.join(BASE_DIR, "rules")
-INDEX_FILE = os.path.join(BASE_DIR, "RuffIndex.json")
+INDEX_FILE = os.path.join(BASE_DIR, "RuffSettingsIndex.json")
 
 
 def get_ruff_setting_url(setting_name):
     """生成 Ruff 配置项的官方文档链接"""
-    # Ruff 的文档锚点通常是配置项名称
-    return f"https://docs.astral.sh/ruff/settings/#{setting_name}"
-
-
-def extract_type_info(prop_data):
-    """从 Schema 属性中提取类型信息"""
-    if "type" in prop_data:
-        t = prop_data["type"]
-        return t if isinstance(t, str) else "/".join([x for x in t if x != "null"])
-    if "anyOf" in prop_data:
-        types = []
-        for item in prop_data["anyOf"]:
-            if "type" in item:
-                types.append(item["type"])
-            elif "$ref" in item:
-                types.append(item["$ref"].split("/")[-1])
-        return "/".join(filter(None, types))
-    return "unknown"
+    # 文档锚点为配置名，子表中的配置项用下划线连接，如 lint.flake8-builtins.ignorelist -> lint_flake8-builtins_ignorelist
+    return f"https://docs.astral.sh/ruff/settings/#{setting_name.replace('.', '_')}"
 
 
 def process_ruff_schema():
@@ -41,55 +29,29 @@ def process_ruff_schema():
         print(f"错误: 找不到输入文件 {INPUT_FILE}")
         return
 
-    # 2. 加载 JSON 数据
+    # 2. 加载 JSON 数据并展开所有配置项
     with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
-
-    properties = schema.get("properties", {})
-    definitions = schema.get("definitions", {})
+        settings = SchemaResolver(json.load(f)).settings()
     index_data = {}
 
-    print(f"开始处理 Ruff 配置项，共 {len(properties)} 个...")
+    print(f"开始处理 Ruff 配置项，共 {len(settings)} 个...")
 
-    for setting_name, prop_data in properties.items():
+    for setting_name, prop_data in settings.items():
+        record = option_record(prop_data)
         # --- A. 提取描述 ---
-        raw_desc = prop_data.get("description", "No description provided.")
+        raw_desc = record["option_description"] or "No description provided."
         # 提取第一行作为摘要用于 Index
         summary = raw_desc.split('\n')[0]
 
-        # --- B. 组织 Option 字段 ---
-        # 对于 Ruff 配置项，Option 展示其类型、是否废弃以及子项
-        opt_parts = []
-
-        # 类型信息
-        type_info = extract_type_info(prop_data)
-        opt_parts.append(f"Type: {type_info}")
-
-        # 废弃状态
+        # --- B. 组织 Option 字段：类型、可选值、是否废弃 ---
+        opt_parts = [f"Type: {record['option_data_type']}"]
+        if record["option_values"]["valuelist"]:
+            opt_parts.append("Values: " + ", ".join(json.dumps(v) for v in record["option_values"]["valuelist"]))
+        if record["default_value"]:
+            opt_parts.append(f"Default: {record['default_value']}")
         if prop_data.get("deprecated"):
             opt_parts.append("Status: DEPRECATED")
-
-        # 检查是否有复杂的定义引用 (Definitions)
-        ref = None
-        if "$ref" in prop_data:
-            ref = prop_data["$ref"]
-        elif "anyOf" in prop_data:
-            for item in prop_data["anyOf"]:
-                if "$ref" in item:
-                    ref = item["$ref"]
-                    break
-
-        if ref:
-            def_name = ref.split("/")[-1]
-            if def_name in definitions:
-                sub_props = definitions[def_name].get("properties", {})
-                if sub_props:
-                    opt_parts.append("\nAvailable Sub-options:")
-                    for sub_name, sub_data in sub_props.items():
-                        sub_desc = sub_data.get("description", "").split('\n')[0]
-                        opt_parts.append(f"  - {sub_name}: {sub_desc}")
-
-        option_content = "\n".join(opt_parts) if opt_parts else "This setting has no specific sub-options."
+        option_content = "\n".join(opt_parts)
 
         # --- C. 组织 Index 数据 ---
         url = get_ruff_setting_url(setting_name)
@@ -121,4 +83,4 @@ def process_ruff_schema():
 
 
 if __name__ == "__main__":
-    process_ruff_schema()
\ No newline at end of file
+    process_ruff_schema()
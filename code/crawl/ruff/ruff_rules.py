@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# 按规则码生成 Ruff 知识库 (Ruff/RuffIndex.json + Ruff/rules/<CODE>.json)，无需联网：
+#   - 规则列表、说明、消息模板来自本地保存的 `ruff rule --all --output-format json`
+#   - 规则 "Options" 一节列出的配置项，到 ruff.json (JSON Schema) 中查类型与说明；
+#     Schema 递归展开 $ref（定义按名字缓存，只解析一次），lint.* / format.* 等子表中的配置项也能查到
+#   - ruff.json 中没有默认值，默认值取自本地保存的 `ruff config --output-format json`（所有配置项的 default）
+# 用法示例:
+# curl -L https://json.schemastore.org/ruff.json -o ruff.json
+# ruff rule --all --output-format json > ruff_rules.json
+# ruff config --output-format json > ruff_config.json
+# python ruff_rules.py
+# python ruff_rules.py --schema ruff.json --rules ruff_rules.json --defaults ruff_config.json --output Ruff
+
+# --- 配置 ---
+SCHEMA_FILE = "ruff.json"
+RULES_FILE = "ruff_rules.json"
+DEFAULTS_FILE = "ruff_config.json"
+BASE_DIR = "Ruff"
+RULE_URL = "https://docs.astral.sh/ruff/rules/{}/"
+# 取值超过这么多个的枚举（如 RuleSelector 的上千个规则码）类型只显示定义名
+MAX_ENUM = 16
+# 这些章节不放入规则描述（选项单独保存在 option 中）
+SKIP_SECTIONS = {"Options", "References"}
+SCALAR_TYPES = {"string": "str", "integer": "int", "number": "float", "boolean": "bool", "null": "None"}
+
+
+class SchemaResolver:
+    """递归解析 JSON Schema 中的 $ref；每个定义只展开一次并缓存，循环引用处停止展开"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.definitions = schema.get("definitions", {})
+        self._resolved = {}
+        self._resolving = set()
+
+    def definition(self, ref):
+        name = ref.split("/")[-1]
+        if name in self._resolved:
+            return self._resolved[name]
+        if name in self._resolving or name not in self.definitions:
+            return {"title": name}
+        self._resolving.add(name)
+        node = self.resolve(self.definitions[name])
+        self._resolving.discard(name)
+        node.setdefault("title", name)
+        self._resolved[name] = node
+        return node
+
+    def resolve(self, node):
+        """返回展开 $ref 并去掉 null 分支后的节点；引用处的 description / deprecated 优先"""
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node:
+            target = dict(self.definition(node["$ref"]))
+            target.update({k: v for k, v in node.items() if k != "$ref"})
+            return target
+        node = dict(node)
+        for key in ("anyOf", "oneOf"):
+            if key in node:
+                branches = [self.resolve(b) for b in node[key] if b.get("type") != "null"]
+                if len(branches) == 1:
+                    del node[key]
+                    merged = dict(branches[0])
+                    merged.update(node)
+                    node = merged
+                else:
+                    node[key] = branches
+        if "properties" in node:
+            node["properties"] = {k: self.resolve(v) for k, v in node["properties"].items()}
+        for key in ("items", "additionalProperties"):
+            if isinstance(node.get(key), dict):
+                node[key] = self.resolve(node[key])
+        return node
+
+    def settings(self):
+        """展开为 {完整配置名: 节点}；子表 (lint、lint.flake8-builtins ...) 继续向下展开，映射类型的配置项视为叶子"""
+        result = {}
+
+        def walk(node, prefix):
+            for name, child in node.get("properties", {}).items():
+                key = f"{prefix}.{name}" if prefix else name
+                if "properties" in child:
+                    walk(child, key)
+                else:
+                    result[key] = child
+
+        walk(self.resolve(self.schema), "")
+        return result
+
+
+def values_of(node):
+    if "enum" in node:
+        return list(node["enum"])
+    if "const" in node:
+        return [node["const"]]
+    branches = node.get("oneOf") or node.get("anyOf") or []
+    values = [v for b in branches for v in values_of(b)]
+    return values if branches and len(values) == len(branches) else []
+
+
+def type_name(node):
+    """把 Schema 节点写成 Ruff 文档中的类型记法：list[str]、int、"single" | "double"、dict[str, list[str]]"""
+    values = values_of(node)
+    if values:
+        if len(values) > MAX_ENUM:
+            return node.get("title", "str")
+        return " | ".join(json.dumps(v) for v in values)
+    branches = node.get("oneOf") or node.get("anyOf")
+    if branches:
+        return " | ".join(dict.fromkeys(type_name(b) for b in branches))
+    types = node.get("type")
+    if isinstance(types, list):
+        types = [t for t in types if t != "null"]
+        if len(types) != 1:
+            return " | ".join(type_name({**node, "type": t}) for t in types)
+        types = types[0]
+    if types == "array":
+        return f"list[{type_name(node.get('items', {}))}]"
+    if "properties" in node:
+        return node.get("title", "dict")
+    if types == "object" or "additionalProperties" in node:
+        value = node.get("additionalProperties")
+        return f"dict[str, {type_name(value)}]" if isinstance(value, dict) else "dict"
+    return SCALAR_TYPES.get(types, node.get("title", "unknown"))
+
+
+def plain_markdown(text):
+    """去掉 Markdown 链接与站内锚点（含 [`name`] 形式的引用链接），保留文字"""
+    text = re.sub(r'\[([^\]]+)\]\([^)]*\)', r'\1', text or "")
+    return re.sub(r'\[(`[^`\]]+`)\]', r'\1', text)
+
+
+def option_record(node, default=None):
+    """default: `ruff config` 给出的默认值文本（如 "88"、'["TODO", "FIXME", "XXX"]'）"""
+    if node is None:
+        return {"option_description": "", "option_data_type": "", "default_value": default or "",
+                "option_values": {"valuelist": []}}
+    values = values_of(node)
+    description = plain_markdown(node.get("description", "")).replace("`", "")
+    if node.get("deprecated"):
+        description = "Deprecated. " + description
+    return {
+        "option_description": description,
+        "option_data_type": type_name(node),
+        "default_value": default if default is not None else json.dumps(node["default"]) if "default" in node else "",
+        "option_values": {"valuelist": values if len(values) <= MAX_ENUM else []},
+    }
+
+
+# --- 规则 ---
+def split_sections(explanation):
+    """按 "## 标题" 切分规则说明，返回 [(标题, 正文)]"""
+    sections, title, body, in_code = [], None, [], False
+    for line in (explanation or "").splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        m = None if in_code else re.match(r'#+\s+(.*)', line)
+        if m:
+            sections.append((title, "\n".join(body)))
+            title, body = m.group(1).strip(), []
+        else:
+            body.append(line)
+    sections.append((title, "\n".join(body)))
+    return [(t, b) for t, b in sections if t or b.strip()]
+
+
+def flatten_text(text):
+    text = re.sub(r'^\s*```\w*\s*$', ' ', text, flags=re.MULTILINE)
+    text = plain_markdown(text).replace("`", "")
+    return " ".join(text.split())
+
+
+def rule_status(rule):
+    status = rule.get("status")
+    if isinstance(status, dict):    # 新版本: {"Preview": {"since": "0.16.5"}}
+        status = next(iter(status), None)
+    if status:
+        return str(status).lower()
+    return "preview" if rule.get("preview") else "stable"
+
+
+def rule_message(rule):
+    formats = rule.get("message_formats") or [rule.get("summary", "")]
+    return re.sub(r'`([^`]*)`', r'<code>\1</code>', formats[0])
+
+
+def build_rule(rule, settings, defaults):
+    header = f"[Status: {rule_status(rule)}] [Name: {rule['name']}] [Message: {rule_message(rule)}]"
+    body, option = [], {}
+    for title, text in split_sections(rule.get("explanation")):
+        if title == "Options":
+            for key in re.findall(r'`([\w.-]+)`', text):
+                option[key] = option_record(settings.get(key), defaults.get(key))
+        elif title not in SKIP_SECTIONS:
+            body.append(" ".join(filter(None, [title, flatten_text(text)])))
+    description = " ".join([header] + body)
+    return {"description": header, "ruleurl": RULE_URL.format(rule["name"])}, \
+        {"description": description, "option": option}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从 ruff rule --all 的 JSON 输出与 ruff.json 生成 Ruff 知识库")
+    parser.add_argument("--schema", default=SCHEMA_FILE)
+    parser.add_argument("--rules", default=RULES_FILE)
+    parser.add_argument("--defaults", default=DEFAULTS_FILE, help="ruff config --output-format json 的输出")
+    parser.add_argument("--output", default=BASE_DIR)
+    args = parser.parse_args()
+
+    for path in (args.schema, args.rules):
+        if not os.path.exists(path):
+            print(f"错误: 找不到输入文件 {path}")
+            return 1
+    start = time.perf_counter()
+    with open(args.schema, 'r', encoding='utf-8') as f:
+        settings = SchemaResolver(json.load(f)).settings()
+    with open(args.rules, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    defaults = {}
+    if os.path.exists(args.defaults):
+        with open(args.defaults, 'r', encoding='utf-8') as f:
+            defaults = {key: info.get("default") for key, info in json.load(f).items() if isinstance(info, dict)}
+    else:
+        print(f"警告: 找不到 {args.defaults}，配置项的默认值将为空")
+
+    rules_dir = os.path.join(args.output, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    index, unknown = {}, set()
+    # 新版本中有尚未分配规则码的规则，无法按规则码选择，跳过
+    for rule in sorted((r for r in rules if r.get("code")), key=lambda r: r["code"]):
+        entry, data = build_rule(rule, settings, defaults)
+        unknown.update(k for k in data["option"] if k not in settings)
+        index[rule["code"]] = entry
+        with open(os.path.join(rules_dir, f"{rule['code']}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(args.output, "RuffIndex.json"), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    print(f"共 {len(index)} 条规则，{len(settings)} 个配置项 ({time.perf_counter() - start:.2f}s)")
+    if unknown:
+        print(f"ruff.json 中找不到以下配置项（Schema 与 ruff 版本不一致？）: {', '.join(sorted(unknown))}")
+    print(f"已写入 {args.output}/")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter, OrderedDict
+
+from lint_runner import (OUTPUT_DIR, LINTERS, collect_files, resolve_linter, run_fixer, run_linter)
+
+# Step 5 的预处理：先用 Linter 原生修复 (ruff --fix / eslint --fix / rubocop -a / biome --write / clang-tidy --fix)
+# 批量修掉机械性的违规，重新 lint 后只把剩余违规交给模型给出修复建议。
+# 用法示例:
+# python scripts/autofix.py --linter Ruff --config output/ruff.toml src/
+
+
+def group_by_rule(violations):
+    """按规则分组，统计每条规则的违规数与可修复数"""
+    groups = OrderedDict()
+    for v in sorted(violations, key=lambda x: x["rule"]):
+        g = groups.setdefault(v["rule"], {"count": 0, "fixable": 0, "files": set()})
+        g["count"] += 1
+        # fixable 为 None 表示 Linter 的输出无法判断，按可尝试修复处理
+        if v["fixable"] is not False:
+            g["fixable"] += 1
+        g["files"].add(v["file"])
+    return groups
+
+
+def autofix(linter, config, files):
+    linter = resolve_linter(linter)
+    before = run_linter(linter, config, files)
+    groups = group_by_rule(before)
+
+    if not LINTERS[linter]["fix"]:
+        print(f"{linter} 没有原生自动修复能力，全部 {len(before)} 个违规交给模型处理。")
+        return build_report(linter, before, before, groups, [])
+
+    # 只对存在可修复违规的文件执行修复
+    target_files = sorted({f for g in groups.values() if g["fixable"] for f in g["files"]})
+    if not target_files:
+        print("没有可自动修复的违规。")
+        return build_report(linter, before, before, groups, [])
+
+    print(f"批量修复 {len(target_files)} 个文件 ({sum(g['fixable'] for g in groups.values())} 个可修复违规)...")
+    run_fixer(linter, config, target_files)
+
+    # 只重新检查被修改过的文件，其余文件的结果保持不变
+    target_set = set(os.path.normpath(f) for f in target_files)
+    untouched = [v for v in before if v["file"] not in target_set]
+    remaining = untouched + run_linter(linter, config, target_files)
+    return build_report(linter, before, remaining, groups, target_files)
+
+
+def build_report(linter, before, remaining, groups, fixed_files):
+    after_counts = Counter(v["rule"] for v in remaining)
+    by_rule = OrderedDict()
+    for rule, g in groups.items():
+        by_rule[rule] = {"before": g["count"], "after": after_counts.get(rule, 0)}
+    # 修复过程中可能引入新的违规（例如重新排版导致行过长）
+    for rule, count in after_counts.items():
+        if rule not in by_rule:
+            by_rule[rule] = {"before": 0, "after": count}
+    return {
+        "linter": linter,
+        "before": len(before),
+        "after": len(remaining),
+        "fixed_files": fixed_files,
+        "by_rule": by_rule,
+        "remaining": remaining,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step 5 前置的批量自动修复")
+    parser.add_argument("--linter", required=True)
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--output", default=None, help="默认 output/<LinterName>AutofixResult.json")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths, args.linter)
+    if not files:
+        print("没有找到可检查的文件。")
+        return 0
+    try:
+        report = autofix(args.linter, args.config, files)
+    except RuntimeError as e:
+        print(f"错误: {e}")
+        return 2
+
+    print(f"\n{'规则':<40}{'修复前':>8}{'修复后':>8}")
+    for rule, counts in report["by_rule"].items():
+        print(f"{rule:<40}{counts['before']:>8}{counts['after']:>8}")
+    print(f"\n违规总数: {report['before']} -> {report['after']}")
+
+    output_path = args.output or os.path.join(OUTPUT_DIR, f"{report['linter']}AutofixResult.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"剩余违规已保存至: {output_path}")
+    return 1 if report["remaining"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from equivalence_index import STOPWORDS, split_words
+from kb import load_index
+from lint_runner import LINTERS, OUTPUT_DIR, collect_files, lint_template, run_linter
+from rule_views import assemble, count_tokens, load_views
+from workflow_trace import STEPS, TRACE_ENV, span
+
+# 端到端基准：把 test/ 下的场景按 SKILL.md 的五个步骤完整跑一遍，模型后端可替换：
+#   replay            确定性的本地桩，按 (场景, 步骤) 回放 test/benchmark/recordings/ 中录制的响应（默认）
+#   command:<命令>    把 prompt 写入外部命令的 stdin，stdout 即模型响应；加 --record 时保存为新的录制
+# 每个步骤记录耗时、读取的知识库字节数、prompt / 输出 token 数与 Linter 运行时间（通过 workflow_trace 的事件统计），
+# 结果写入 output/BenchmarkReport.json；compare 对比两份报告，离线评估 prompt 或检索方式的改动。
+# 场景来源: test/test_cs/*.txt（每个文件一个 Checkstyle 场景）与 test/test_task_prompt/prompt.txt 中的各条任务。
+# 用法示例:
+# python scripts/benchmark.py list
+# python scripts/benchmark.py run
+# python scripts/benchmark.py run --scenario brace linebreak --budget 2000 --output output/budget2000.json
+# python scripts/benchmark.py run --model "command:llm -m gpt-4o" --record
+# python scripts/benchmark.py compare output/BenchmarkReport.json output/budget2000.json
+
+# --- 配置 ---
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT_DIR = os.path.join(SKILL_DIR, "prompt")
+TEST_DIR = os.path.join(SKILL_DIR, "test")
+STANDARDS_DIR = os.path.join(TEST_DIR, "test_cs")
+TASK_PROMPT = os.path.join(TEST_DIR, "test_task_prompt", "prompt.txt")
+RECORDINGS_DIR = os.path.join(TEST_DIR, "benchmark", "recordings")
+CODE_DIR = os.path.join(TEST_DIR, "benchmark", "code")
+REPORT_PATH = os.path.join(OUTPUT_DIR, "BenchmarkReport.json")
+# test_cs 中是 Google Java Style 的片段
+DEFAULT_LINTER = "Checkstyle"
+RETRIEVAL_TOP_K = 15
+RETRIEVAL_BUDGET = 4000
+CONFIG_EXTENSIONS = {"Checkstyle": ".xml", "PMD": ".xml", "ESLint": ".json", "Biome": ".json", "Ruff": ".toml",
+                     "Pylint": ".ini", "Flake8": ".ini", "ClangTidy": ".yaml", "Cppcheck": ".txt",
+                     "RuboCop": ".yml", "Reek": ".yml"}
+REPAIR_PROMPT = ("### Repair Coding Violations Based on Coding Rules\n\n"
+                 "Provide suggestions for fixing each coding violation below, based on the coding rules.")
+METRICS = ["seconds", "kb_bytes", "kb_reads", "prompt_tokens", "output_tokens", "model_seconds", "linter_seconds"]
+# 回放时 token 数与字节数是确定的，耗时不是；compare 默认只比较确定的指标
+TIMING_METRICS = {"seconds", "model_seconds", "linter_seconds"}
+
+
+# --- 场景 ---
+def split_tasks(text):
+    """prompt.txt 中的任务以 "1. " "2. " 开头"""
+    parts = re.split(r'^\s*(\d+)\.\s', text, flags=re.MULTILINE)
+    return [(int(parts[i]), parts[i + 1].strip()) for i in range(1, len(parts) - 1, 2)]
+
+
+def load_scenarios():
+    scenarios = []
+    for path in sorted(glob.glob(os.path.join(STANDARDS_DIR, "*.txt"))):
+        scenarios.append({"name": os.path.splitext(os.path.basename(path))[0],
+                          "source": os.path.relpath(path, SKILL_DIR),
+                          "request": f"Generate {DEFAULT_LINTER} configuration for {path}"})
+    if os.path.exists(TASK_PROMPT):
+        with open(TASK_PROMPT, 'r', encoding='utf-8') as f:
+            tasks = split_tasks(f.read())
+        for number, text in tasks:
+            scenarios.append({"name": f"task-{number}",
+                              "source": f"{os.path.relpath(TASK_PROMPT, SKILL_DIR)}#{number}",
+                              "request": text})
+    return scenarios
+
+
+def find_test_file(path):
+    """任务中的路径来自录制者的机器，不存在时按文件名在 test/ 下查找"""
+    if os.path.exists(path):
+        return path
+    matches = glob.glob(os.path.join(TEST_DIR, "**", os.path.basename(path)), recursive=True)
+    return matches[0] if matches else None
+
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return f.read()
+
+
+# --- 模型后端 ---
+def prompt_hash(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def recording_path(directory, scenario, step):
+    return os.path.join(directory, scenario, f"{step}.json")
+
+
+class ReplayModel:
+    """确定性的本地桩：回放录制的响应；当前 prompt 与录制时不同时在结果中标记 prompt_changed"""
+
+    name = "replay"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def complete(self, scenario, step, prompt):
+        path = recording_path(self.directory, scenario, step)
+        if not os.path.exists(path):
+            raise RuntimeError(f"没有录制的响应: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            recording = json.load(f)
+        return recording["response"], {"recorded_seconds": recording.get("seconds"),
+                                       "prompt_changed": recording.get("prompt_sha256") != prompt_hash(prompt)}
+
+
+class CommandModel:
+    """
+    调用外部命令（如 `llm -m <model>`、`claude -p`）；场景与步骤名通过环境变量 LINTCONFIG_SCENARIO / LINTCONFIG_STEP 传给命令。
+    record_dir 不为空时把响应保存为录制。
+    """
+
+    def __init__(self, command, record_dir=None):
+        self.name = f"command:{command}"
+        self.command = shlex.split(command)
+        self.record_dir = record_dir
+
+    def complete(self, scenario, step, prompt):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(self.command, input=prompt, capture_output=True, text=True,
+                                  env=dict(os.environ, LINTCONFIG_SCENARIO=scenario, LINTCONFIG_STEP=step))
+        except FileNotFoundError:
+            raise RuntimeError(f"找不到模型命令: {self.command[0]}")
+        seconds = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"模型命令失败 (exit {proc.returncode}): {proc.stderr.strip()}")
+        if self.record_dir:
+            path = recording_path(self.record_dir, scenario, step)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"scenario": scenario, "step": step, "prompt_sha256": prompt_hash(prompt),
+                           "seconds": round(seconds, 3), "response": proc.stdout}, f, ensure_ascii=False, indent=4)
+        return proc.stdout, {}
+
+
+def make_model(spec, record, recordings_dir):
+    if spec == "replay":
+        return ReplayModel(recordings_dir)
+    if spec.startswith("command:"):
+        return CommandModel(spec[len("command:"):], recordings_dir if record else None)
+    raise ValueError(f"未知模型后端 {spec}，可选: replay、command:<命令>")
+
+
+def call_model(model, scenario, step, prompt):
+    """返回 (响应, 指标)；回放时 model_seconds 取录制时的耗时（录制中没有时为回放耗时）"""
+    with span(f"model: {step}", "model", scenario=scenario) as trace:
+        start = time.perf_counter()
+        response, info = model.complete(scenario, step, prompt)
+        elapsed = time.perf_counter() - start
+        trace.update(input_tokens=count_tokens(prompt), output_tokens=count_tokens(response))
+    metrics = {"prompt_tokens": trace["input_tokens"], "output_tokens": trace["output_tokens"],
+               "model_seconds": round(info.get("recorded_seconds") or elapsed, 4)}
+    if info.get("prompt_changed"):
+        metrics["prompt_changed"] = True
+    return response, metrics
+
+
+def extract_config(response):
+    """模型通常把配置放在代码块中；没有代码块时整个响应即配置"""
+    m = re.search(r'```[\w+-]*\n(.*?)```', response, re.DOTALL)
+    return (m.group(1) if m else response).strip() + "\n"
+
+
+# --- 各步骤 ---
+def step_extraction(scenario, ctx, model, args):
+    request = scenario["request"]
+    linter = next((name for name in LINTERS if re.search(rf'\b{re.escape(name)}\b', request, re.IGNORECASE)), None)
+    if linter is None:
+        return {"status": "skipped", "reason": "请求中没有 LinterName"}
+    quoted = re.search(r'"(.+?)"', request, re.DOTALL)
+    target = re.search(r'configuration for\s+(\S.*)$', request, re.DOTALL | re.IGNORECASE)
+    if quoted:
+        standard = quoted.group(1)
+    elif target:
+        # 任务中的长路径可能被终端折行
+        path = find_test_file(re.sub(r'\s+', '', target.group(1)))
+        if path is None:
+            return {"status": "skipped", "reason": f"找不到编码规范文件 {target.group(1).strip()}"}
+        standard = read_text(path)
+    else:
+        return {"status": "skipped", "reason": "请求中没有编码规范（只检查代码的任务需要先生成配置）"}
+    ctx.update(linter=linter, language=LINTERS[linter]["language"], standard=standard.strip())
+    return {"status": "ok", "linter": linter, "standard_tokens": count_tokens(ctx["standard"])}
+
+
+def step_parse(scenario, ctx, model, args):
+    prompt = read_text(os.path.join(PROMPT_DIR, "Prompt_Parse_CodingStandard.md")) + \
+        "\n\n### Coding Standard\n\n" + ctx["standard"]
+    ctx["coding_rules"], metrics = call_model(model, scenario["name"], "Prompt_Parse_CodingStandard", prompt)
+    return {"status": "ok", **metrics}
+
+
+def select_candidates(index, coding_rules, top_k):
+    """按与编码规则的词重叠为索引中的规则打分（规则名中的词加倍），取前 top_k 条"""
+    terms = {w for w in split_words(coding_rules) if len(w) > 2 and w not in STOPWORDS}
+    scored = []
+    for name, entry in index.items():
+        name_words = set(split_words(name))
+        words = name_words | set(split_words(entry.get("description", "")))
+        score = len(terms & words) + len(terms & name_words)
+        if score:
+            scored.append((-score, name))
+    return [name for _, name in sorted(scored)[:top_k]]
+
+
+def step_configure(scenario, ctx, model, args):
+    linter = ctx["linter"]
+    candidates = select_candidates(load_index(linter), ctx["coding_rules"], args.top_k)
+    docs = assemble(linter, candidates, args.budget)
+    prompt = read_text(os.path.join(PROMPT_DIR, "Prompt_Configure_Linter.md")) + \
+        "\n\n### Coding Rules\n\n" + ctx["coding_rules"] + \
+        "\n\n### Linter Rule Documentation\n\n" + docs["text"]
+    response, metrics = call_model(model, scenario["name"], "Prompt_Configure_Linter", prompt)
+    path = os.path.join(args.workdir, scenario["name"], f"{linter}Config{CONFIG_EXTENSIONS.get(linter, '.txt')}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(extract_config(response))
+    ctx["config"] = path
+    return {"status": "ok", "candidates": len(candidates), "retrieved_tokens": docs["tokens"], **metrics}
+
+
+def step_linting(scenario, ctx, model, args):
+    linter = ctx["linter"]
+    files = collect_files([CODE_DIR], linter)
+    if not files:
+        return {"status": "skipped", "reason": f"{CODE_DIR} 中没有 {linter} 可检查的文件"}
+    executable = lint_template(linter)[0]
+    if not shutil.which(executable):
+        return {"status": "skipped", "reason": f"未安装 {executable}"}
+    ctx["files"] = files
+    ctx["violations"] = run_linter(linter, ctx["config"], files)
+    return {"status": "ok", "files": len(files), "violations": len(ctx["violations"])}
+
+
+def step_repair(scenario, ctx, model, args):
+    if not ctx.get("violations"):
+        return {"status": "skipped", "reason": "没有违规"}
+    # 路径相对于 skill 目录，使 prompt 与检出位置无关，录制的响应可在任何机器上回放
+    violations = [dict(v, file=os.path.relpath(v["file"], SKILL_DIR)) for v in ctx["violations"]]
+    code = "\n\n".join(f"// {os.path.relpath(path, SKILL_DIR)}\n{read_text(path)}" for path in ctx["files"])
+    prompt = REPAIR_PROMPT + "\n\n### Coding Rules\n\n" + ctx["coding_rules"] + \
+        "\n\n### Violations\n\n" + json.dumps(violations, ensure_ascii=False, indent=4) + \
+        "\n\n### Code\n\n" + code
+    _, metrics = call_model(model, scenario["name"], "repair", prompt)
+    return {"status": "ok", **metrics}
+
+
+STEP_FUNCTIONS = dict(zip(STEPS, [step_extraction, step_parse, step_configure, step_linting, step_repair]))
+
+
+# --- 运行 ---
+class EventMeter:
+    """读取追踪事件文件中自上次读取以来的新事件，汇总知识库读取字节数与 Linter 运行时间"""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+
+    def collect(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        events = [json.loads(line) for line in data.splitlines() if line.strip()]
+        spans = [e for e in events if e.get("ph") == "X"]
+        kb = [e for e in spans if e.get("cat") == "kb"]
+        return {"kb_reads": len(kb),
+                "kb_bytes": sum(e["args"].get("bytes", 0) for e in kb),
+                "linter_seconds": round(sum(e["dur"] for e in spans if e["name"] == "run linter") / 1e6, 4)}
+
+
+def run_scenario(scenario, model, args, meter):
+    result = {"name": scenario["name"], "source": scenario["source"], "status": "ok", "steps": {}}
+    ctx = {}
+    for step in STEPS:
+        start = time.perf_counter()
+        with span(step, "step", scenario=scenario["name"]):
+            try:
+                outcome = STEP_FUNCTIONS[step](scenario, ctx, model, args)
+            except RuntimeError as e:
+                outcome = {"status": "error", "error": str(e)}
+        seconds = time.perf_counter() - start
+        result["steps"][step] = {"seconds": round(seconds, 4), **meter.collect(), **outcome}
+        if outcome["status"] == "error":
+            result["status"] = "error"
+            break
+        # 只有提取失败时整个场景跳过；Linter 未安装等情况只跳过该步骤
+        if outcome["status"] == "skipped" and step == "extraction":
+            result["status"] = "skipped"
+            break
+    if "linter" in ctx:
+        result["linter"] = ctx["linter"]
+    return result
+
+
+def totals(scenarios):
+    result = {}
+    for scenario in scenarios:
+        for step, metrics in scenario["steps"].items():
+            bucket = result.setdefault(step, dict.fromkeys(METRICS, 0))
+            for key in METRICS:
+                bucket[key] = round(bucket[key] + metrics.get(key, 0), 4)
+    return result
+
+
+def run(args):
+    try:
+        model = make_model(args.model, args.record, args.recordings)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return 2
+    scenarios = load_scenarios()
+    if args.scenario:
+        unknown = set(args.scenario) - {s["name"] for s in scenarios}
+        if unknown:
+            print(f"错误: 未知场景 {', '.join(sorted(unknown))}")
+            return 2
+        scenarios = [s for s in scenarios if s["name"] in args.scenario]
+
+    # 步骤内的知识库读取与 Linter 运行通过追踪事件统计；--trace 指定时保留事件文件供 workflow_trace export
+    trace_path = args.trace or tempfile.mkstemp(prefix="lintconfig-bench-", suffix=".jsonl")[1]
+    os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+    open(trace_path, 'w').close()
+    os.environ[TRACE_ENV] = trace_path
+    args.workdir = os.path.join(os.path.dirname(os.path.abspath(args.output)), "benchmark")
+    meter = EventMeter(trace_path)
+    started = time.time()
+    try:
+        # 预先加载规则视图（缺失时生成），避免首个场景承担一次性开销
+        setup_start = time.perf_counter()
+        load_views(DEFAULT_LINTER)
+        setup = {"seconds": round(time.perf_counter() - setup_start, 4), **meter.collect()}
+        results = [run_scenario(s, model, args, meter) for s in scenarios]
+    finally:
+        if not args.trace:
+            os.remove(trace_path)
+
+    report = {
+        "model": model.name,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "retrieval": {"top_k": args.top_k, "budget": args.budget},
+        "setup": setup,
+        "scenarios": results,
+        "totals": totals(results),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+
+    print(f"{'场景':<22}{'状态':<9}" + "".join(f"{step[:18]:>20}" for step in STEPS))
+    for result in results:
+        cells = []
+        for step in STEPS:
+            metrics = result["steps"].get(step)
+            if metrics is None:
+                cells.append("-")
+            elif metrics["status"] != "ok":
+                cells.append(metrics["status"])
+            else:
+                tokens = metrics.get("prompt_tokens", 0) + metrics.get("output_tokens", 0)
+                cells.append(f"{metrics['seconds'] * 1000:.0f}ms" + (f"/{tokens}tok" if tokens else ""))
+        print(f"{result['name']:<22}{result['status']:<9}" + "".join(f"{c:>20}" for c in cells))
+    errors = [r for r in results if r["status"] == "error"]
+    for result in errors:
+        step, metrics = next((s, m) for s, m in result["steps"].items() if m["status"] == "error")
+        print(f"错误: {result['name']} / {step}: {metrics['error']}")
+    print(f"报告: {args.output}")
+    return 1 if errors else 0
+
+
+def compare(args):
+    """逐场景、逐步骤列出两份报告中有变化的指标"""
+    reports = []
+    for path in (args.base, args.head):
+        with open(path, 'r', encoding='utf-8') as f:
+            reports.append(json.load(f))
+    base = {s["name"]: s for s in reports[0]["scenarios"]}
+    changed = 0
+    for scenario in reports[1]["scenarios"]:
+        old = base.get(scenario["name"])
+        if old is None:
+            print(f"{scenario['name']}: 新增场景")
+            continue
+        for step, metrics in scenario["steps"].items():
+            old_metrics = old["steps"].get(step, {})
+            for key in METRICS:
+                if key in TIMING_METRICS and not args.timing:
+                    continue
+                a, b = old_metrics.get(key, 0), metrics.get(key, 0)
+                if a != b:
+                    changed += 1
+                    ratio = f" ({(b - a) / a:+.1%})" if a else ""
+                    print(f"{scenario['name']:<22}{step:<30}{key:<16}{a:>12} -> {b:<12}{ratio}")
+    print(f"共 {changed} 项指标变化" + ("" if args.timing else "（未比较耗时，加 --timing 比较）"))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按 SKILL.md 的五个步骤端到端运行测试场景并记录各步骤指标")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="列出场景")
+    p = sub.add_parser("run", help="运行场景并写出报告")
+    p.add_argument("--model", default="replay", help="replay 或 command:<命令>")
+    p.add_argument("--record", action="store_true", help="command 后端: 把响应保存为录制")
+    p.add_argument("--recordings", default=RECORDINGS_DIR)
+    p.add_argument("--scenario", nargs="+", help="只运行这些场景")
+    p.add_argument("--top-k", type=int, default=RETRIEVAL_TOP_K, help="Step 3 检索的候选规则数")
+    p.add_argument("--budget", type=int, default=RETRIEVAL_BUDGET, help="Step 3 规则文档的 token 预算")
+    p.add_argument("--output", default=REPORT_PATH)
+    p.add_argument("--trace", default=None, help="保留追踪事件文件，可用 workflow_trace.py export 导出")
+    p = sub.add_parser("compare", help="对比两份报告")
+    p.add_argument("base")
+    p.add_argument("head")
+    p.add_argument("--timing", action="store_true", help="同时比较耗时")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for scenario in load_scenarios():
+            request = " ".join(scenario["request"].split())
+            print(f"{scenario['name']:<22}{scenario['source']:<40}{request[:70]}")
+        return 0
+    if args.command == "compare":
+        return compare(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
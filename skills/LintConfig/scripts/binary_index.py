@@ -0,0 +1,241 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from collections.abc import Mapping
+
+from kb import DATA_DIR, index_prefix
+
+# 规则索引的二进制格式 (<Name>Index.idx)，通过 mmap 读取，启动时无需解析整个 JSON。
+# kb.load_index / index_entry / index_prefix 在存在不旧于 JSON 的 .idx 时直接使用它，否则退回 json.load；
+# code/build_kb.py 在每次构建后执行 build 重新生成。
+# 布局:
+#   头部   : magic "LCIX", version u16, reserved u16, count u32, table_offset u32, blob_offset u32
+#   条目表 : count 个 (name_off u32, name_len u32, value_off u32, value_len u32)，按规则名 UTF-8 字节序排序
+#   字符串区: 规则名与索引条目的 JSON（偏移相对 blob_offset）
+# 用法示例:
+# python scripts/binary_index.py build
+# python scripts/binary_index.py prefix ClangTidy bugprone-
+# python scripts/binary_index.py bench
+
+MAGIC = b"LCIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+ENTRY = struct.Struct("<IIII")
+
+
+def idx_path_for(json_path):
+    return json_path[:-len(".json")] + ".idx"
+
+
+def build_index(json_path):
+    """把 <Name>Index.json 编译为同目录下的 <Name>Index.idx，返回输出路径"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    items = sorted((name.encode("utf-8"), json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                   for name, entry in index.items())
+    blob = bytearray()
+    table = bytearray()
+    for name, value in items:
+        table += ENTRY.pack(len(blob), len(name), len(blob) + len(name), len(value))
+        blob += name + value
+
+    table_offset = HEADER.size
+    blob_offset = table_offset + len(table)
+    out_path = idx_path_for(json_path)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(items), table_offset, blob_offset))
+        f.write(table)
+        f.write(blob)
+    # 先写临时文件再替换，正在 mmap 旧文件的读者不受影响
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class BinaryIndex(Mapping):
+    """mmap 只读访问，可当作 {规则名: 索引条目} 的只读 dict 使用；打开成本与规则数量无关"""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.table_offset, self.blob_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} 不是受支持的二进制索引")
+
+    def entry(self, i):
+        return ENTRY.unpack_from(self.mm, self.table_offset + i * ENTRY.size)
+
+    def name_bytes(self, i):
+        name_off, name_len, _, _ = self.entry(i)
+        start = self.blob_offset + name_off
+        return self.mm[start:start + name_len]
+
+    def value(self, i):
+        _, _, value_off, value_len = self.entry(i)
+        start = self.blob_offset + value_off
+        return json.loads(self.mm[start:start + value_len])
+
+    def lower_bound(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.name_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, name):
+        """规则名所在的条目序号，不存在时返回 None"""
+        key = name.encode("utf-8")
+        i = self.lower_bound(key)
+        return i if i < self.count and self.name_bytes(i) == key else None
+
+    def __getitem__(self, name):
+        i = self.find(name)
+        if i is None:
+            raise KeyError(name)
+        return self.value(i)
+
+    def get(self, name, default=None):
+        i = self.find(name)
+        return default if i is None else self.value(i)
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def __iter__(self):
+        return (self.name_bytes(i).decode("utf-8") for i in range(self.count))
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        # 顺序读取，避免 Mapping 默认实现对每个名称再做一次二分查找
+        return [(self.name_bytes(i).decode("utf-8"), self.value(i)) for i in range(self.count)]
+
+    def prefix(self, prefix):
+        """按名称顺序返回所有以 prefix 开头的 (规则名, 索引条目)，例如 "bugprone-" 或 "Style/" """
+        key = prefix.encode("utf-8")
+        i = self.lower_bound(key)
+        while i < self.count:
+            name = self.name_bytes(i)
+            if not name.startswith(key):
+                break
+            yield name.decode("utf-8"), self.value(i)
+            i += 1
+
+    def names(self):
+        return [self.name_bytes(i).decode("utf-8") for i in range(self.count)]
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+
+def is_fresh(json_path):
+    path = idx_path_for(json_path)
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(json_path)
+
+
+def open_index(json_path):
+    """存在且不旧于 JSON 的 .idx 返回 BinaryIndex，否则返回 None（调用方退回 json.load）"""
+    return BinaryIndex(idx_path_for(json_path)) if is_fresh(json_path) else None
+
+
+def find_index_files(data_dir):
+    """只取各 Linter（及语言子目录）下的索引，rules/ 里恰好以 Index 结尾的规则文件除外"""
+    paths = glob.glob(os.path.join(data_dir, "**", "*Index.json"), recursive=True)
+    return sorted(p for p in paths if os.path.basename(os.path.dirname(p)) != "rules")
+
+
+def benchmark(json_path, rounds):
+    """对比 json.load 与 mmap 打开 / 单次查询 / 前缀扫描的耗时"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        names = list(json.load(f))
+    probes = random.Random(0).sample(names, min(len(names), 200))
+    prefix = names[0].split("-")[0].split("/")[0][:3] if names else ""
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.get(probes[0])
+    json_open = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        idx = BinaryIndex(idx_path_for(json_path))
+        idx.get(probes[0])
+        idx.close()
+    idx_open = (time.perf_counter() - start) / rounds
+
+    idx = BinaryIndex(idx_path_for(json_path))
+    start = time.perf_counter()
+    for name in probes:
+        idx.get(name)
+    lookup = (time.perf_counter() - start) / len(probes)
+    start = time.perf_counter()
+    matched = sum(1 for _ in idx.prefix(prefix))
+    scan = time.perf_counter() - start
+    idx.close()
+    return {
+        "file": os.path.relpath(json_path, DATA_DIR),
+        "rules": len(names),
+        "json_kb": os.path.getsize(json_path) / 1024,
+        "idx_kb": os.path.getsize(idx_path_for(json_path)) / 1024,
+        "json_open_ms": 1000 * json_open,
+        "idx_open_ms": 1000 * idx_open,
+        "lookup_us": 1e6 * lookup,
+        "prefix": prefix,
+        "prefix_hits": matched,
+        "prefix_ms": 1000 * scan,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="规则索引的 mmap 二进制格式")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="为所有 *Index.json 生成 .idx")
+    p_build.add_argument("--data-dir", default=DATA_DIR)
+    p_prefix = sub.add_parser("prefix", help="前缀扫描")
+    p_prefix.add_argument("--data-dir", default=DATA_DIR)
+    p_prefix.add_argument("linter")
+    p_prefix.add_argument("prefix")
+    p_bench = sub.add_parser("bench", help="与 JSON 索引对比启动与查询耗时")
+    p_bench.add_argument("--rounds", type=int, default=50)
+    p_bench.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for json_path in find_index_files(args.data_dir):
+            out = build_index(json_path)
+            print(f"{os.path.relpath(out, args.data_dir)}: {os.path.getsize(out) / 1024:.1f} KB")
+        return 0
+
+    if args.command == "prefix":
+        for name, entry in index_prefix(args.linter, args.prefix, data_dir=args.data_dir):
+            print(f"{name}\t{entry.get('description', '')[:80]}")
+        return 0
+
+    print(f"{'索引':<45}{'规则':>6}{'JSON KB':>9}{'json.load ms':>14}{'mmap ms':>9}{'查询 us':>9}{'前缀扫描':>16}")
+    for json_path in find_index_files(args.data_dir):
+        # 旧于 JSON 的 .idx 与当前索引内容不一致，重新生成后再比较
+        if not is_fresh(json_path):
+            build_index(json_path)
+        r = benchmark(json_path, args.rounds)
+        print(f"{r['file']:<45}{r['rules']:>6}{r['json_kb']:>9.1f}{r['json_open_ms']:>14.3f}{r['idx_open_ms']:>9.3f}"
+              f"{r['lookup_us']:>9.1f}   {r['prefix']!r:>6} {r['prefix_hits']:>3} {r['prefix_ms']:.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from kb import DATA_DIR, index_path, linter_dirs, list_linters, sanitize_filename
+
+# 知识库完整性检查：并发扫描所有 Linter 的索引与规则文件，报告
+#   - 索引与规则文件不对应（缺失 / 多余 / 包装键与索引名不一致 / 文件名经过转义）
+#   - 抓取失败（FAILED_TO_FETCH、空描述、只有 "Description" 标题）
+#   - 空选项、结构不符合约定、重复内容
+#   - 类别分片与索引不一致（data/CategoryManifest.json 存在时）
+# 压缩安装（scripts/packed_kb.py export）中没有 rules/，改为检查 rules.pack 中的记录。
+# 存在 error 时退出码为 1，可作为每次重建知识库后的检查关卡。
+# 用法示例:
+# python scripts/check_kb.py
+# python scripts/check_kb.py --strict --output output/KBIntegrityReport.json
+# python scripts/check_kb.py --linter RuboCop --linter Pylint
+
+FETCH_FAILURE = re.compile(r'FAILED_TO_FETCH|^\s*(Description)?\s*$')
+EMPTY_TEXT = re.compile(r'^\s*$')
+
+
+def issue(severity, kind, target, detail=""):
+    return {"severity": severity, "kind": kind, "target": target, "detail": detail}
+
+
+def normalize(text):
+    return " ".join(str(text).split()).lower()
+
+
+def check_index(key, index):
+    issues = []
+    if not isinstance(index, dict):
+        return [issue("error", "schema", key, "索引不是 JSON 对象")]
+    for name, entry in index.items():
+        target = f"{key}:{name}"
+        if not isinstance(entry, dict):
+            issues.append(issue("error", "schema", target, "索引条目不是 JSON 对象"))
+            continue
+        if not isinstance(entry.get("description"), str):
+            issues.append(issue("error", "schema", target, "索引条目缺少 description"))
+        elif FETCH_FAILURE.search(entry["description"]):
+            issues.append(issue("error", "fetch_failure", target, "索引描述为空或抓取失败"))
+        if not isinstance(entry.get("url", entry.get("ruleurl")), str):
+            issues.append(issue("error", "schema", target, "索引条目缺少 url / ruleurl"))
+    return issues
+
+
+def is_empty(value):
+    """空字符串、空容器，或所有值都为空的 dict（如 {"option": {}}、{"max": ""}）"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return EMPTY_TEXT.match(value) is not None
+    if isinstance(value, dict):
+        return all(is_empty(v) for v in value.values())
+    if isinstance(value, list):
+        return not value
+    return False
+
+
+def check_rule(key, stem, data):
+    """返回 (issues, 规则名, description, option)；规则名取包装键，非包装格式取文件名"""
+    target = f"{key}:{stem}"
+    if not isinstance(data, dict):
+        return [issue("error", "schema", target, "规则文件不是 JSON 对象")], stem, None, None
+    if "description" in data and not isinstance(data["description"], dict):
+        name, record = stem, data
+    elif len(data) == 1 and isinstance(next(iter(data.values())), dict):
+        name, record = next(iter(data.items()))
+    else:
+        return [issue("error", "schema", target, f"无法识别的规则文件结构: {sorted(data)[:3]}")], stem, None, None
+
+    issues = []
+    description, option = record.get("description"), record.get("option")
+    if not isinstance(description, str):
+        issues.append(issue("error", "schema", target, "缺少 description 或类型不是字符串"))
+    elif FETCH_FAILURE.search(description):
+        issues.append(issue("error", "fetch_failure", target, "描述为空或抓取失败 (FAILED_TO_FETCH)"))
+    if "option" not in record:
+        issues.append(issue("error", "schema", target, "缺少 option"))
+    elif not isinstance(option, (str, dict)):
+        issues.append(issue("error", "schema", target, f"option 类型为 {type(option).__name__}"))
+    elif is_empty(option):
+        issues.append(issue("warning", "empty_option", target,
+                            "option 为空字符串" if isinstance(option, str) else "option 为空对象或所有值为空"))
+    extra = set(record) - {"description", "option"}
+    if extra:
+        issues.append(issue("warning", "schema", target, f"多余字段: {sorted(extra)}"))
+    return issues, name, description, option
+
+
+def rule_records(directory):
+    """返回 (来源, [(文件名去掉 .json, 原始字节)])；rules/ 不存在时读取 rules.pack，两者都没有时来源为 None"""
+    rules_dir = os.path.join(directory, "rules")
+    if os.path.isdir(rules_dir):
+        records = []
+        for entry in sorted(os.scandir(rules_dir), key=lambda e: e.name):
+            if entry.name.endswith(".json"):
+                with open(entry.path, 'rb') as f:
+                    records.append((entry.name[:-len(".json")], f.read()))
+        return "rules", records
+    from packed_kb import PACK_NAME, PackedRules
+    pack_path = os.path.join(directory, PACK_NAME)
+    if not os.path.exists(pack_path):
+        return None, []
+    pack = PackedRules(pack_path)
+    try:
+        return PACK_NAME, [(stem, pack.raw(stem)) for stem in sorted(pack)]
+    finally:
+        pack.close()
+
+
+def check_directory(key, directory):
+    """检查一个索引目录（子进程中执行），返回 (issues, 规则文件数)"""
+    issues = []
+    path = index_path(directory)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        return [issue("error", "schema", key, f"索引无法读取: {e}")], 0
+    issues += check_index(key, index)
+    if not isinstance(index, dict):
+        return issues, 0
+
+    try:
+        source, records = rule_records(directory)
+    except (OSError, ValueError) as e:
+        return issues + [issue("error", "schema", key, f"规则包无法读取: {e}")], 0
+    expected = {sanitize_filename(name): name for name in index}
+    descriptions, contents = {}, {}
+
+    for stem, raw in records:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            issues.append(issue("error", "schema", f"{key}:{stem}", f"JSON 解析失败: {e}"))
+            continue
+        found, name, description, option = check_rule(key, stem, data)
+        issues += found
+
+        index_name = expected.get(stem)
+        if index_name is None:
+            # 索引中查不到，不影响查询，但会占用空间并混入检索
+            issues.append(issue("warning", "orphan_rule", f"{key}:{stem}", "规则文件在索引中没有对应条目"))
+        elif name != stem and name != index_name:
+            issues.append(issue("error", "name_mismatch", f"{key}:{stem}",
+                                f"包装键 {name!r} 与索引名 {index_name!r} 不一致"))
+        elif stem != index_name:
+            issues.append(issue("warning", "sanitized_name", f"{key}:{stem}",
+                                f"文件名经过转义，对应索引名 {index_name!r}"))
+
+        contents.setdefault(hashlib.sha1(raw).hexdigest(), []).append(stem)
+        if isinstance(description, str) and not FETCH_FAILURE.search(description):
+            descriptions.setdefault(normalize(description), []).append(stem)
+
+    present = {stem for stem, _ in records}
+    for stem, name in expected.items():
+        if stem not in present:
+            where = f"rules.pack 中的 {stem}" if source and source != "rules" else f"规则文件 rules/{stem}.json"
+            issues.append(issue("error", "missing_rule", f"{key}:{name}", f"缺少{where}"))
+
+    for stems in contents.values():
+        if len(stems) > 1:
+            issues.append(issue("error", "duplicate_file", f"{key}:{stems[0]}", f"与 {stems[1:]} 内容完全相同"))
+    for stems in descriptions.values():
+        if len(stems) > 1:
+            issues.append(issue("warning", "duplicate_description", f"{key}:{stems[0]}",
+                                f"与 {stems[1:]} 描述相同"))
+    return issues, len(records)
+
+
+def check_shards(data_dir, linters=None):
+    from shard_index import MANIFEST_NAME, check_manifest
+    if not os.path.exists(os.path.join(data_dir, MANIFEST_NAME)):
+        return []
+    return [issue("error", "stale_shards", key, "类别分片与索引不一致，请重新运行 shard_index.py")
+            for key in check_manifest(data_dir) if linters is None or key.split("/")[0] in linters]
+
+
+def check_all(data_dir, workers, linters=None):
+    """linters 不为空时只检查这些 Linter（如只重建了部分 Linter 时）"""
+    jobs = []
+    for linter in list_linters(data_dir):
+        if linters and linter not in linters:
+            continue
+        for language, directory in linter_dirs(linter, data_dir):
+            jobs.append((f"{linter}/{language}" if language else linter, directory))
+        if not linter_dirs(linter, data_dir):
+            jobs.append((linter, None))
+
+    issues, files = [], 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(key, pool.submit(check_directory, key, directory)) for key, directory in jobs if directory]
+        for key, directory in jobs:
+            if directory is None:
+                issues.append(issue("error", "schema", key, "目录中没有 *Index.json"))
+        for key, future in futures:
+            found, count = future.result()
+            issues += found
+            files += count
+    issues += check_shards(data_dir, linters or None)
+    return issues, files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="知识库完整性检查")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--strict", action="store_true", help="warning 也视为失败")
+    parser.add_argument("--verbose", action="store_true", help="逐条列出 warning")
+    parser.add_argument("--output", default=None, help="保存 JSON 报告")
+    parser.add_argument("--linter", action="append", default=[], help="只检查指定 Linter（data/ 下的目录名），可重复")
+    args = parser.parse_args()
+
+    unknown = set(args.linter) - set(list_linters(args.data_dir))
+    if unknown:
+        print(f"错误: data/ 中没有 {', '.join(sorted(unknown))}")
+        return 2
+    start = time.perf_counter()
+    issues, files = check_all(args.data_dir, args.workers, args.linter)
+    seconds = time.perf_counter() - start
+
+    errors = [i for i in issues if i["severity"] == "error"]
+    warnings = [i for i in issues if i["severity"] == "warning"]
+    for i in errors + (warnings if args.verbose else []):
+        print(f"  [{i['severity'].capitalize()}] {i['kind']:<22}{i['target']}  {i['detail']}")
+
+    kinds = {}
+    for i in issues:
+        kinds.setdefault((i["severity"], i["kind"]), 0)
+        kinds[(i["severity"], i["kind"])] += 1
+    print(f"\n已检查 {files} 个规则文件 ({seconds:.2f}s)")
+    for (severity, kind), count in sorted(kinds.items()):
+        print(f"  {severity:<8}{kind:<24}{count:>6}")
+    print(f"共 {len(errors)} 个 error, {len(warnings)} 个 warning")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"files": files, "seconds": round(seconds, 3), "issues": issues}, f, ensure_ascii=False, indent=4)
+        print(f"报告已保存至: {args.output}")
+
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
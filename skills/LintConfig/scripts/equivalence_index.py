@@ -0,0 +1,325 @@
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+
+from kb import DATA_DIR, linter_dirs, load_index, sanitize_filename, unwrap_rule
+
+# 跨 Linter 规则等价索引（离线计算）：按规则名、描述、选项名的相似度为不同 Linter 的规则
+# 计算候选等价关系并给出置信度，结果写入 data/RuleEquivalence.json。
+# 为第二个 Linter 生成配置时，先查表得到候选规则，只对低置信度的规则重新做完整映射。
+# 用法示例:
+# python scripts/equivalence_index.py build
+# python scripts/equivalence_index.py lookup --source ESLint --target Biome/JavaScript no-var eqeqeq
+# python scripts/equivalence_index.py lookup --source Checkstyle --target PMD NeedBraces  # 只有一种语言时可省略 /Java
+
+OUTPUT_NAME = "RuleEquivalence.json"
+TOP_K = 3
+SUMMARY_CHARS = 400
+DESCRIPTION_SCALE = 0.5
+MIN_CONFIDENCE = 0.4
+# 名称关键词或运算符直接命中时加分（curly -> useBlockStatements、eqeqeq -> noDoubleEquals 名称与描述都很少重合）
+KEYWORD_BONUS = 0.25
+
+# 同一语言内需要互相映射的 Linter（"Linter/Language" 对应按语言分目录的知识库）
+LINTER_GROUPS = [
+    ["ESLint", "Biome/JavaScript"],
+    ["Ruff", "Pylint", "Flake8"],
+    ["ClangTidy", "Cppcheck"],
+    ["Checkstyle", "PMD/Java"],
+]
+
+WEIGHTS = {"name": 0.45, "description": 0.45, "option": 0.10}
+
+STOPWORDS = set("""
+a an and are as at be by can code for from has have if in is it its not of on or should that the this
+to used use using when which with will you your rule rules check checks checking description status
+stable preview name message what does why bad example examples option options default
+""".split())
+
+# 规则名中表示"禁止 / 要求"的词，不作为关键词
+NAME_STOPWORDS = {"no", "use", "avoid", "need", "require", "prefer", "disallow", "enforce", "only", "consistent"}
+
+# 描述中的运算符（分词时会被丢弃）
+OPERATOR_PATTERN = re.compile(r'===|!==|==|!=|\?\?=?|\?\.|=>|\+\+')
+
+# 配置示例中的结构键，不是规则选项
+GENERIC_OPTIONS = {"Name", "options", "rules", "linter", "level", "fix", "languageOptions", "sourceType", "plugins",
+                   "extends", "env", "globals", "parserOptions", "recommended", "all"}
+
+
+# --- 规则特征 ---
+def split_words(text):
+    """noVar / no-var / no_var / NoVar -> ["no", "var"]；去掉复数 s（vars -> var）"""
+    text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text)
+    text = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1 \2', text)
+    words = [w for w in re.split(r'[^A-Za-z0-9]+', text.lower()) if w]
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+
+
+def display_name(name, entry):
+    """Ruff / Pylint 的规则码不含语义，使用描述中的 [Name: ...]"""
+    m = re.search(r'\[Name: ([^\]]+)\]', entry.get("description", ""))
+    return m.group(1) if m else name
+
+
+def description_terms(entry, rule):
+    # 规则文件的正文只取开头部分，后面的代码示例会稀释相似度
+    body = re.sub(r'^\s*Description\s*', '', rule.get("description", "") if rule else "")[:SUMMARY_CHARS]
+    text = f"{entry.get('description', '')} {body}"
+    text = re.sub(r'\[(Status|Name): [^\]]*\]', ' ', text)
+    terms = Counter(w for w in split_words(text) if len(w) > 2 and w not in STOPWORDS and not w.isdigit())
+    terms.update(OPERATOR_PATTERN.findall(text))
+    return terms
+
+
+def option_names(rule):
+    option = rule.get("option") if rule else None
+    if isinstance(option, dict):
+        return set(option)
+    if not isinstance(option, str):
+        return set()
+    # Checkstyle: "name, desc, type, default" 每行一个选项；其他 Linter 从正文中提取标识符形式的选项名
+    # PMD: "name\tdefault\tdescription" 表格
+    names = {line.split(",")[0].strip() for line in option.splitlines() if line.count(",") >= 3}
+    names |= {line.split("\t")[0].strip() for line in option.splitlines() if "\t" in line}
+    names |= set(re.findall(r'"([a-z][A-Za-z0-9]+)"\s*:', option))
+    return {n for n in names if re.fullmatch(r'[A-Za-z][A-Za-z0-9_-]*', n)} - GENERIC_OPTIONS
+
+
+def read_rules(linter, language, data_dir=DATA_DIR):
+    """读取该 Linter 的全部规则文件，返回 {文件名: {"description", "option"}}"""
+    rules = {}
+    for lang, directory in linter_dirs(linter, data_dir):
+        if language and lang != language:
+            continue
+        rules_dir = os.path.join(directory, "rules")
+        if not os.path.isdir(rules_dir):
+            continue
+        for entry in os.scandir(rules_dir):
+            if entry.name.endswith(".json"):
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                rules[entry.name[:-len(".json")]] = unwrap_rule(data)
+    return rules
+
+
+def load_features(key, data_dir=DATA_DIR):
+    linter, _, language = key.partition("/")
+    index = load_index(linter, language or None, data_dir)
+    rules = read_rules(linter, language or None, data_dir)
+    features = {}
+    for name, entry in index.items():
+        rule = rules.get(sanitize_filename(name))
+        words = set(split_words(display_name(name, entry)))
+        features[name] = {
+            "code": name,
+            "name": words,
+            "keywords": words - NAME_STOPWORDS,
+            "summary": words | set(split_words(entry.get("description", ""))),
+            "symbols": set(OPERATOR_PATTERN.findall(entry.get("description", ""))),
+            "terms": description_terms(entry, rule),
+            "options": option_names(rule),
+        }
+    return features
+
+
+# --- 相似度 ---
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def word_match(a, b):
+    """var / variable、param / parameter 这类缩写按前缀视为同一个词"""
+    return a == b or (min(len(a), len(b)) >= 3 and (a.startswith(b) or b.startswith(a)))
+
+
+def name_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    matched = sum(1 for w in a if any(word_match(w, v) for v in b))
+    return matched / max(len(a), len(b))
+
+
+def keyword_hit(source, target):
+    """源规则名中的关键词全部出现在目标规则的名称或一句话描述中（NeedBraces -> ControlStatementBraces，
+    curly -> useBlockStatements），或两者的描述中有相同的运算符（eqeqeq -> noDoubleEquals）"""
+    if source["symbols"] & target["symbols"]:
+        return True
+    return bool(source["keywords"]) and source["keywords"] <= target["summary"]
+
+
+def tfidf_vectors(groups):
+    """groups 为若干 {规则: Counter}；在两侧规则上统一计算 idf，返回单位化后的稀疏向量"""
+    docs = [terms for group in groups for terms in group.values()]
+    df = Counter(t for terms in docs for t in terms)
+    idf = {t: math.log((1 + len(docs)) / (1 + n)) + 1 for t, n in df.items()}
+    result = []
+    for group in groups:
+        vectors = {}
+        for rule, terms in group.items():
+            vec = {t: (1 + math.log(n)) * idf[t] for t, n in terms.items()}
+            norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+            vectors[rule] = {t: v / norm for t, v in vec.items()}
+        result.append(vectors)
+    return result
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b[t] for t, v in a.items() if t in b)
+
+
+def code_match(source, target, a, b):
+    """规则码直接对应：Ruff 与 Flake8 共用 E/W/F/C 码，Ruff 的 PLW0120 对应 Pylint 的 W0120"""
+    pair = {source.split("/")[0], target.split("/")[0]}
+    if pair == {"Ruff", "Flake8"}:
+        return a == b
+    if pair == {"Ruff", "Pylint"}:
+        ruff, pylint = (a, b) if source == "Ruff" else (b, a)
+        return ruff.startswith("PL") and ruff[2:] == pylint
+    return False
+
+
+def score_pair(source, target, features):
+    """返回 {源规则: [(目标规则, 置信度, 各项得分)]}，每条源规则最多 TOP_K 个候选"""
+    src, dst = features[source], features[target]
+    src_vec, dst_vec = tfidf_vectors([{r: f["terms"] for r, f in src.items()},
+                                      {r: f["terms"] for r, f in dst.items()}])
+    # 倒排表：只比较至少共享一个名称词或描述词的规则
+    postings = {}
+    for rule, f in dst.items():
+        for token in f["name"] | set(f["terms"]) | f["symbols"]:
+            postings.setdefault(token, set()).add(rule)
+
+    table = {}
+    for rule, f in src.items():
+        candidates = set()
+        for token in f["name"] | set(f["terms"]) | f["symbols"]:
+            candidates |= postings.get(token, set())
+        candidates |= {r for r in dst if code_match(source, target, rule, r)}
+
+        scored = []
+        for other in candidates:
+            g = dst[other]
+            signals = {
+                "name": name_similarity(f["name"], g["name"]),
+                # 真正等价的规则描述余弦通常在 0.3–0.6 之间，按 DESCRIPTION_SCALE 拉伸到 [0, 1]
+                "description": min(1.0, cosine(src_vec[rule], dst_vec[other]) / DESCRIPTION_SCALE),
+                "option": jaccard(f["options"], g["options"]),
+                "keyword": 1.0 if keyword_hit(f, g) else 0.0,
+            }
+            if code_match(source, target, rule, other) or signals["name"] == 1.0:
+                confidence = 1.0
+            elif f["options"] and g["options"]:
+                confidence = sum(WEIGHTS[k] * signals[k] for k in WEIGHTS)
+            else:
+                # 任一侧没有选项时不计选项得分，权重按比例分给名称与描述
+                confidence = (WEIGHTS["name"] * signals["name"] + WEIGHTS["description"] * signals["description"]) \
+                             / (WEIGHTS["name"] + WEIGHTS["description"])
+            confidence = min(1.0, confidence + KEYWORD_BONUS * signals["keyword"])
+            if confidence >= MIN_CONFIDENCE:
+                scored.append((other, confidence, signals))
+        scored.sort(key=lambda s: (-s[1], s[0]))
+        if scored:
+            table[rule] = scored[:TOP_K]
+    return table
+
+
+def build(data_dir):
+    keys = [key for group in LINTER_GROUPS for key in group]
+    features = {key: load_features(key, data_dir) for key in keys}
+    equivalence, coverage = {}, {}
+    for group in LINTER_GROUPS:
+        for source in group:
+            for target in group:
+                if source == target:
+                    continue
+                table = score_pair(source, target, features)
+                equivalence.setdefault(source, {})[target] = {
+                    rule: [{"rule": other, "confidence": round(conf, 3),
+                            "signals": {k: round(v, 3) for k, v in signals.items()}}
+                           for other, conf, signals in candidates]
+                    for rule, candidates in sorted(table.items())
+                }
+                coverage.setdefault(source, {})[target] = {"rules": len(features[source]), "with_candidates": len(table)}
+                print(f"{source:<18}-> {target:<18}{len(table):>5}/{len(features[source]):<5} 条规则有候选")
+    path = os.path.join(data_dir, OUTPUT_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"groups": LINTER_GROUPS, "min_confidence": MIN_CONFIDENCE, "top_k": TOP_K,
+                   "coverage": coverage, "equivalence": equivalence}, f, ensure_ascii=False, indent=4)
+    return path
+
+
+# --- 查询 ---
+def load_equivalence(data_dir=DATA_DIR):
+    with open(os.path.join(data_dir, OUTPUT_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_key(name, keys):
+    """"PMD" -> "PMD/Java"：只有一种语言时允许省略 /Language"""
+    if name in keys:
+        return name
+    matches = [key for key in keys if key.partition("/")[0].lower() == name.lower()]
+    return matches[0] if len(matches) == 1 else None
+
+
+def translate_rules(source, target, rules, min_confidence=0.0, data_dir=DATA_DIR):
+    """返回 ({源规则: 最佳候选}, [没有达到置信度的源规则], (源 Linter, 目标 Linter))"""
+    equivalence = load_equivalence(data_dir)["equivalence"]
+    source_key = resolve_key(source, equivalence)
+    target_key = resolve_key(target, equivalence.get(source_key, {}))
+    if target_key is None:
+        raise ValueError(f"没有 {source} -> {target} 的等价索引")
+    table = equivalence[source_key][target_key]
+    mapped, unmapped = {}, []
+    for rule in rules:
+        candidates = [c for c in table.get(rule, []) if c["confidence"] >= min_confidence]
+        if candidates:
+            mapped[rule] = candidates[0]
+        else:
+            unmapped.append(rule)
+    return mapped, unmapped, (source_key, target_key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="跨 Linter 规则等价索引")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="重新计算等价索引")
+    p_build.add_argument("--data-dir", default=DATA_DIR)
+    p_lookup = sub.add_parser("lookup", help="查询规则在另一个 Linter 中的候选等价规则")
+    p_lookup.add_argument("--data-dir", default=DATA_DIR)
+    p_lookup.add_argument("--source", required=True, help="例如 ESLint、Ruff、PMD/Java（或 PMD）")
+    p_lookup.add_argument("--target", required=True, help="例如 Biome/JavaScript（或 Biome）、Pylint")
+    p_lookup.add_argument("--min-confidence", type=float, default=0.45)
+    p_lookup.add_argument("rules", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        path = build(args.data_dir)
+        print(f"\n等价索引已保存至: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+        return 0
+
+    try:
+        mapped, unmapped, (source, target) = translate_rules(args.source, args.target, args.rules,
+                                                             args.min_confidence, args.data_dir)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return 2
+    for rule, candidate in mapped.items():
+        print(f"{rule:<40}-> {candidate['rule']:<40}{candidate['confidence']:.2f}")
+    for rule in unmapped:
+        print(f"{rule:<40}-> (无足够置信度的候选，需要完整映射)")
+    coverage = load_equivalence(args.data_dir).get("coverage", {}).get(source, {}).get(target)
+    if coverage:
+        print(f"\n{source} -> {target}: {coverage['with_candidates']}/{coverage['rules']} 条规则在索引中有候选")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import glob
+import json
+import os
+from collections import ChainMap
+from functools import lru_cache
+
+from workflow_trace import span
+
+# 知识库 (skills/LintConfig/data) 的读取工具。
+# 目录结构: data/<LinterName>/[<Language>/]<Index>.json + rules/<RuleName>.json
+# 规则文件有两种格式: {"<RuleName>": {"description", "option"}} 或直接 {"description", "option"}
+# 压缩安装（scripts/packed_kb.py export）中 rules/ 被替换为 rules.pack，读取时透明解压
+# 索引旁有不旧于它的 <Index>.idx（scripts/binary_index.py build）时通过 mmap 读取，不解析 JSON
+
+# --- 配置 ---
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SKILL_DIR, "data")
+
+
+def sanitize_filename(name):
+    """与 rubocop_process.py 一致: Style/Alias -> Style_Alias"""
+    return name.replace('/', '_').replace(':', '').replace('*', 'Any')
+
+
+def list_linters(data_dir=DATA_DIR):
+    return sorted(d for d in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, d)))
+
+
+def linter_dirs(linter, data_dir=DATA_DIR):
+    """返回 [(language, dir)]；PMD / Biome 按语言分子目录，其余 language 为 None"""
+    base = os.path.join(data_dir, linter)
+    if glob.glob(os.path.join(base, "*Index.json")):
+        return [(None, base)]
+    return [(lang, os.path.join(base, lang)) for lang in sorted(os.listdir(base))
+            if glob.glob(os.path.join(base, lang, "*Index.json"))]
+
+
+def index_path(directory):
+    paths = sorted(glob.glob(os.path.join(directory, "*Index.json")))
+    return paths[0] if paths else None
+
+
+def load_index(linter, language=None, data_dir=DATA_DIR):
+    """
+    读取索引；未指定 language 时合并该 Linter 所有语言的索引。
+    返回只读的 {规则名: 索引条目}：有最新 .idx 时为 binary_index.BinaryIndex，否则为 dict
+    """
+    from binary_index import open_index
+    parts = []
+    with span("read index", "kb", linter=linter, language=language) as trace:
+        trace["bytes"] = 0
+        for lang, directory in linter_dirs(linter, data_dir):
+            if language and lang and lang.lower() != language.lower():
+                continue
+            path = index_path(directory)
+            idx = open_index(path)
+            if idx is not None:
+                trace["source"] = "idx"
+                parts.append(idx)
+                continue
+            with open(path, 'rb') as f:
+                raw = f.read()
+            trace["bytes"] += len(raw)
+            parts.append(json.loads(raw))
+        if all(isinstance(p, dict) for p in parts):
+            index = {}
+            for part in parts:
+                index.update(part)
+        else:
+            # 与 dict.update 相同：同名规则以后面的语言为准
+            index = parts[0] if len(parts) == 1 else ChainMap(*reversed(parts))
+        trace["rules"] = len(index)
+    return index
+
+
+def index_entry(linter, name, language=None, data_dir=DATA_DIR):
+    """单条索引条目；有最新 .idx 时只做二分查找"""
+    return load_index(linter, language, data_dir).get(name)
+
+
+def index_prefix(linter, prefix, language=None, data_dir=DATA_DIR):
+    """按名称顺序返回以 prefix 开头的 [(规则名, 索引条目)]，如 "bugprone-"、"Style/" """
+    index = load_index(linter, language, data_dir)
+    parts = index.maps if isinstance(index, ChainMap) else [index]
+    found = {}
+    for part in reversed(parts):
+        found.update(part.prefix(prefix) if hasattr(part, "prefix") else
+                     ((n, e) for n, e in part.items() if n.startswith(prefix)))
+    return sorted(found.items(), key=lambda item: item[0].encode("utf-8"))
+
+
+def rule_path(linter, rule_name, language=None, data_dir=DATA_DIR):
+    for lang, directory in linter_dirs(linter, data_dir):
+        if language and lang and lang.lower() != language.lower():
+            continue
+        path = os.path.join(directory, "rules", f"{sanitize_filename(rule_name)}.json")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def unwrap_rule(data, rule_name=None):
+    """把两种规则文件格式统一为 {"description", "option"}"""
+    if "description" in data and not isinstance(data["description"], dict):
+        return data
+    if rule_name in data:
+        return data[rule_name]
+    if len(data) == 1:
+        return next(iter(data.values()))
+    return data
+
+
+@lru_cache(maxsize=None)
+def open_pack(directory):
+    """返回该目录的 rules.pack；没有时返回 None"""
+    from packed_kb import PACK_NAME, PackedRules
+    path = os.path.join(directory, PACK_NAME)
+    return PackedRules(path) if os.path.exists(path) else None
+
+
+def load_rule(linter, rule_name, language=None, data_dir=DATA_DIR):
+    with span("read rule", "kb", linter=linter, rule=rule_name) as trace:
+        return _load_rule(linter, rule_name, language, data_dir, trace)
+
+
+def _load_rule(linter, rule_name, language, data_dir, trace):
+    path = rule_path(linter, rule_name, language, data_dir)
+    if path:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        trace["bytes"] = len(raw)
+        return unwrap_rule(json.loads(raw), rule_name)
+    for lang, directory in linter_dirs(linter, data_dir):
+        if language and lang and lang.lower() != language.lower():
+            continue
+        if os.path.isdir(os.path.join(directory, "rules")):
+            continue
+        pack = open_pack(directory)
+        data = pack.get(sanitize_filename(rule_name)) if pack else None
+        if data is not None:
+            trace["source"] = "rules.pack"
+            return unwrap_rule(data, rule_name)
+    return None
@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from binary_index import idx_path_for, open_index
+from kb import DATA_DIR, index_path, linter_dirs, list_linters, unwrap_rule
+from packed_kb import PACK_NAME, PackedRules
+
+# 本地知识库查询服务：一次性把 data/ 下所有索引和规则加载到内存，
+# 多个并发的 Agent 会话通过 localhost HTTP 或 Unix socket 共享同一份数据。
+# data/ 目录变化时自动热加载；/metrics 提供各接口的请求延迟统计。
+# PMD / Biome 等按语言分目录的 Linter 中同名规则可能出现在多个语言下，所有接口都接受 language= 参数（与 kb.load_rule 一致）；
+# 规则名在多个语言中都存在而未指定 language 时 /rule、/options 返回 400。
+# 用法示例:
+# python scripts/kb_server.py --port 8765
+# curl "http://127.0.0.1:8765/search?linter=Checkstyle&q=line+length"
+# curl "http://127.0.0.1:8765/rule?linter=Checkstyle&name=LineLength"
+# curl "http://127.0.0.1:8765/rule?linter=PMD&language=Java&name=CyclomaticComplexity"
+# curl --unix-socket /tmp/lintconfig-kb.sock "http://localhost/options?linter=RuboCop&name=Style/Alias"
+
+DEFAULT_PORT = 8765
+RELOAD_INTERVAL = 2.0
+LATENCY_WINDOW = 1000
+
+
+class KnowledgeBase:
+    """内存中的知识库快照；热加载时整体替换，查询过程中不会看到半更新状态"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.indexes = {}  # linter -> {(language, rule): 索引条目}；单语言 Linter 的 language 为 None
+        self.rules = {}    # linter -> {(language, rule): {"description", "option", "language"}}
+        self.bytes_loaded = 0
+        start = time.perf_counter()
+        for linter in list_linters(data_dir):
+            self.load_linter(linter)
+        self.load_seconds = time.perf_counter() - start
+        self.loaded_at = time.time()
+
+    def read_json(self, path):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        self.bytes_loaded += len(raw)
+        return json.loads(raw)
+
+    def read_index(self, directory):
+        """有最新 .idx 时从 mmap 读取索引条目，不解析整个 *Index.json"""
+        path = index_path(directory)
+        idx = open_index(path)
+        if idx is None:
+            return self.read_json(path)
+        self.bytes_loaded += os.path.getsize(idx_path_for(path))
+        entries = dict(idx.items())
+        idx.close()
+        return entries
+
+    def rule_files(self, directory):
+        """逐个返回 (文件名去掉 .json, 规则文件内容)；压缩安装中读取 rules.pack"""
+        rules_dir = os.path.join(directory, "rules")
+        if os.path.isdir(rules_dir):
+            for entry in os.scandir(rules_dir):
+                if entry.name.endswith(".json"):
+                    yield entry.name[:-len(".json")], self.read_json(entry.path)
+            return
+        pack_path = os.path.join(directory, PACK_NAME)
+        if os.path.exists(pack_path):
+            self.bytes_loaded += os.path.getsize(pack_path)
+            pack = PackedRules(pack_path)
+            for stem in pack:
+                yield stem, pack.get(stem)
+            pack.close()
+
+    def load_linter(self, linter):
+        index, rules = {}, {}
+        for language, directory in linter_dirs(linter, self.data_dir):
+            for name, entry in self.read_index(directory).items():
+                index[(language, name)] = dict(entry, language=language) if language else entry
+            for stem, data in self.rule_files(directory):
+                # 包装格式以 JSON 键为规则名（RuboCop 的 Style/Alias 文件名为 Style_Alias）
+                wrapped = len(data) == 1 and isinstance(next(iter(data.values())), dict)
+                name = next(iter(data)) if wrapped else stem
+                record = dict(unwrap_rule(data, name))
+                if language:
+                    record["language"] = language
+                rules[(language, name)] = record
+        self.indexes[linter] = index
+        self.rules[linter] = rules
+
+    def resolve(self, linter):
+        for name in self.indexes:
+            if name.lower() == (linter or "").lower():
+                return name
+        raise KeyError(f"未知的 Linter: {linter}")
+
+    def entries(self, linter, language=None):
+        """该 Linter（指定 language 时只取该语言）的 [((language, rule), 索引条目)]"""
+        return [(key, entry) for key, entry in self.indexes[linter].items()
+                if not language or key[0] is None or key[0].lower() == language.lower()]
+
+    def rule(self, linter, name, language=None):
+        linter = self.resolve(linter)
+        keys = [key for key in self.rules[linter]
+                if key[1] == name and (not language or key[0] is None or key[0].lower() == language.lower())]
+        if not keys:
+            raise KeyError(f"{linter} 中不存在规则: {name}" + (f" (language={language})" if language else ""))
+        if len(keys) > 1:
+            languages = ", ".join(sorted(key[0] for key in keys))
+            raise ValueError(f"{linter} 的多个语言中都有规则 {name}，请用 language= 指定: {languages}")
+        key = keys[0]
+        return {"linter": linter, "name": name, "index": self.indexes[linter].get(key), **self.rules[linter][key]}
+
+    def index(self, linter, language=None):
+        """{规则: 索引条目}；多语言 Linter 未指定 language 时按语言分组为 {language: {规则: 索引条目}}"""
+        linter = self.resolve(linter)
+        entries = self.entries(linter, language)
+        if len({lang for (lang, _), _ in entries}) <= 1:
+            return {name: entry for (_, name), entry in entries}
+        grouped = {}
+        for (lang, name), entry in entries:
+            grouped.setdefault(lang, {})[name] = entry
+        return grouped
+
+    def options(self, linter, name, language=None):
+        record = self.rule(linter, name, language)
+        result = {"linter": record["linter"], "name": name, "option": record.get("option")}
+        if record["linter"] == "Checkstyle":
+            from minimize_config import parse_option_text
+            schema = parse_option_text(record.get("option"))
+            result["schema"] = {k: {kk: sorted(vv) if isinstance(vv, (set, frozenset)) else vv
+                                    for kk, vv in v.items()} for k, v in schema.items()}
+        return result
+
+    def search(self, query, linter=None, limit=20, language=None):
+        """所有关键词（不区分大小写）都出现在规则名或索引描述中的规则"""
+        terms = [t.lower() for t in query.split() if t]
+        linters = [self.resolve(linter)] if linter else list(self.indexes)
+        hits = []
+        for name_linter in linters:
+            for (_, name), entry in self.entries(name_linter, language):
+                text = f"{name} {entry.get('description', '')}".lower()
+                if all(t in text for t in terms):
+                    # 规则名命中排在描述命中之前
+                    score = sum(t in name.lower() for t in terms)
+                    hits.append((-score, name_linter, name, entry))
+        hits.sort(key=lambda h: h[:3] + (h[3].get("language") or "",))
+        return [{"linter": l, "name": n, **e} for _, l, n, e in hits[:limit]]
+
+
+def data_signature(data_dir):
+    """(文件数, 最大 mtime)，用于低成本地检测 data/ 是否变化"""
+    count, latest = 0, 0
+    stack = [data_dir]
+    while stack:
+        for entry in os.scandir(stack.pop()):
+            if entry.is_dir():
+                stack.append(entry.path)
+            else:
+                count += 1
+                latest = max(latest, entry.stat().st_mtime_ns)
+    return count, latest
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.reloads = 0
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            m = self.endpoints.setdefault(endpoint, {"count": 0, "errors": 0, "latencies": deque(maxlen=LATENCY_WINDOW)})
+            m["count"] += 1
+            m["errors"] += 0 if ok else 1
+            m["latencies"].append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            result = {}
+            for endpoint, m in self.endpoints.items():
+                values = sorted(m["latencies"])
+                pick = lambda q: round(1000 * values[min(len(values) - 1, int(q * len(values)))], 3) if values else 0
+                result[endpoint] = {"count": m["count"], "errors": m["errors"],
+                                    "p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": pick(1.0)}
+            return {"endpoints": result, "reloads": self.reloads}
+
+
+class KBService:
+    """持有当前知识库快照，并在后台线程中检测变化、热加载"""
+
+    def __init__(self, data_dir, reload_interval):
+        self.data_dir = data_dir
+        self.kb = KnowledgeBase(data_dir)
+        self.signature = data_signature(data_dir)
+        self.metrics = Metrics()
+        if reload_interval > 0:
+            threading.Thread(target=self.reload_loop, args=(reload_interval,), daemon=True).start()
+
+    def reload_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                signature = data_signature(self.data_dir)
+                if signature == self.signature:
+                    continue
+                kb = KnowledgeBase(self.data_dir)
+            except Exception as e:
+                # 重建过程中可能读到写了一半的文件或暂时没有 *Index.json 的目录；任何错误都不能结束重载线程，下一轮再试
+                print(f"  [Reload] 加载失败，保留旧数据: {type(e).__name__}: {e}", file=sys.stderr)
+                continue
+            self.kb, self.signature = kb, signature
+            self.metrics.reloads += 1
+            print(f"  [Reload] 知识库已重新加载 ({kb.load_seconds:.2f}s)", file=sys.stderr)
+
+    def handle(self, path, params):
+        kb = self.kb
+        get = lambda key, default=None: params.get(key, [default])[0]
+        if path == "/linters":
+            return {linter: len(index) for linter, index in kb.indexes.items()}
+        if path == "/index":
+            return kb.index(get("linter"), get("language"))
+        if path == "/rule":
+            return kb.rule(get("linter"), get("name"), get("language"))
+        if path == "/options":
+            return kb.options(get("linter"), get("name"), get("language"))
+        if path == "/search":
+            return kb.search(get("q", ""), get("linter"), int(get("limit", 20)), get("language"))
+        if path == "/metrics":
+            return dict(self.metrics.snapshot(), loaded_at=kb.loaded_at, load_seconds=round(kb.load_seconds, 3),
+                        bytes_loaded=kb.bytes_loaded, rules={l: len(r) for l, r in kb.rules.items()})
+        raise LookupError(path)
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            status, ok = 200, True
+            try:
+                body = service.handle(url.path, parse_qs(url.query))
+            except LookupError as e:
+                status, ok = 404, False
+                body = {"error": str(e).strip("'")}
+            except ValueError as e:
+                status, ok = 400, False
+                body = {"error": str(e)}
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            if url.path != "/metrics":
+                service.metrics.record(url.path, time.perf_counter() - start, ok)
+
+        def address_string(self):
+            # Unix socket 的 client_address 为空字符串
+            return self.client_address[0] if self.client_address else "unix"
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="共享的知识库查询服务")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", default=None, help="改为监听 Unix socket")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL, help="0 表示关闭热加载")
+    args = parser.parse_args()
+
+    service = KBService(args.data_dir, args.reload_interval)
+    kb = service.kb
+    print(f"知识库已加载: {sum(len(r) for r in kb.rules.values())} 条规则, "
+          f"{kb.bytes_loaded / 1024 / 1024:.1f} MB, {kb.load_seconds:.2f}s")
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = ThreadingUnixHTTPServer(args.socket, make_handler(service))
+        print(f"监听: {args.socket}")
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(service))
+        print(f"监听: http://127.0.0.1:{args.port}")
+    # SIGTERM 与 Ctrl+C 一样走清理流程，确保删除 socket 文件
+    signal.signal(signal.SIGTERM, raise_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
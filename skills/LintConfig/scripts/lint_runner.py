@@ -0,0 +1,396 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from workflow_trace import span
+
+# Step 4 的统一执行入口：按 LinterName 调用对应 Linter，并把输出归一化为同一种违规格式：
+# {"linter", "file", "line", "column", "rule", "message", "severity", "fixable"}
+# 用法示例:
+# python scripts/lint_runner.py --linter Ruff --config output/ruff.toml src/a.py src/b.py
+
+# --- 配置 ---
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(SKILL_DIR, "data")
+OUTPUT_DIR = os.path.join(SKILL_DIR, "output")
+
+# 单次调用传入的文件数上限，避免命令行过长
+MAX_FILES_PER_CALL = 200
+
+# lint / fix 为命令模板，"{config}" 会被替换为配置文件路径，待检查文件追加在末尾
+# fix 为 None 表示该 Linter 没有原生自动修复能力；warm 为常驻进程版本的命令（可选）
+LINTERS = {
+    "Checkstyle": {
+        "language": "Java",
+        "extensions": [".java"],
+        "lint": ["checkstyle", "-c", "{config}"],
+        "fix": None,
+    },
+    "PMD": {
+        "language": "Java",
+        "extensions": [".java"],
+        "lint": ["pmd", "check", "--no-progress", "-f", "json", "-R", "{config}", "-d"],
+        "fix": None,
+    },
+    "ESLint": {
+        "language": "JavaScript",
+        "extensions": [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"],
+        "lint": ["eslint", "-c", "{config}", "-f", "json"],
+        "warm": ["eslint_d", "-c", "{config}", "-f", "json"],
+        "fix": ["eslint", "-c", "{config}", "--fix"],
+    },
+    "Biome": {
+        "language": "JavaScript",
+        "extensions": [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"],
+        "lint": ["biome", "lint", "--config-path={config}", "--reporter=github"],
+        "fix": ["biome", "lint", "--config-path={config}", "--write"],
+    },
+    "Ruff": {
+        "language": "Python",
+        "extensions": [".py", ".pyi"],
+        "lint": ["ruff", "check", "--config", "{config}", "--output-format", "json"],
+        "fix": ["ruff", "check", "--config", "{config}", "--fix", "--quiet"],
+    },
+    "Pylint": {
+        "language": "Python",
+        "extensions": [".py"],
+        "lint": ["pylint", "--rcfile={config}", "--output-format=json"],
+        "fix": None,
+    },
+    "Flake8": {
+        "language": "Python",
+        "extensions": [".py"],
+        "lint": ["flake8", "--config={config}", "--format=%(path)s:%(row)d:%(col)d: %(code)s %(text)s"],
+        "fix": None,
+    },
+    "ClangTidy": {
+        "language": "C++",
+        "extensions": [".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp"],
+        "lint": ["clang-tidy", "--quiet", "--config-file={config}"],
+        "fix": ["clang-tidy", "--quiet", "--config-file={config}", "--fix"],
+    },
+    "Cppcheck": {
+        "language": "C++",
+        "extensions": [".c", ".cc", ".cpp", ".cxx", ".h", ".hh", ".hpp"],
+        "lint": ["cppcheck", "--quiet", "--enable=all", "--suppressions-list={config}",
+                 "--template={file}:{line}:{column}: {severity}: {message} [{id}]"],
+        "fix": None,
+    },
+    "RuboCop": {
+        "language": "Ruby",
+        "extensions": [".rb", ".rake", ".gemspec"],
+        "lint": ["rubocop", "-c", "{config}", "--format", "json"],
+        "warm": ["rubocop", "--server", "-c", "{config}", "--format", "json"],
+        "fix": ["rubocop", "-c", "{config}", "-a", "--format", "quiet"],
+    },
+    "Reek": {
+        "language": "Ruby",
+        "extensions": [".rb"],
+        "lint": ["reek", "-c", "{config}", "--format", "json"],
+        "fix": None,
+    },
+}
+
+# 常见别名 -> data/ 下的目录名
+LINTER_ALIASES = {
+    "clang-tidy": "ClangTidy",
+    "clangtidy": "ClangTidy",
+    "checktyle": "Checkstyle",
+}
+
+
+def resolve_linter(name):
+    """将用户给出的 LinterName 规范化为 LINTERS 中的键"""
+    key = name.strip()
+    if key.lower() in LINTER_ALIASES:
+        return LINTER_ALIASES[key.lower()]
+    for linter in LINTERS:
+        if linter.lower() == key.lower():
+            return linter
+    raise ValueError(f"不支持的 Linter: {name}，可选: {', '.join(LINTERS)}")
+
+
+def build_command(template, config, files):
+    """用配置文件路径填充命令模板，并把文件追加在末尾"""
+    return [part.replace("{config}", config) for part in template] + list(files)
+
+
+def chunked(items, size=MAX_FILES_PER_CALL):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def make_violation(linter, file, line, column, rule, message, severity="error", fixable=None):
+    return {
+        "linter": linter,
+        "file": os.path.normpath(file),
+        "line": int(line or 0),
+        "column": int(column or 0),
+        "rule": rule,
+        "message": message.strip(),
+        "severity": severity.lower(),
+        "fixable": fixable,
+    }
+
+
+# --- 各 Linter 输出解析 ---
+def parse_checkstyle(output):
+    # [ERROR] /path/A.java:24: Line is longer than 100 characters (found 141). [LineLength]
+    pattern = re.compile(r'^\[(\w+)\]\s+(.+?):(\d+)(?::(\d+))?:\s+(.*)\s+\[(\w+)\]\s*$')
+    violations = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if m:
+            severity, path, row, col, msg, rule = m.groups()
+            violations.append(make_violation("Checkstyle", path, row, col, rule, msg, severity))
+    return violations
+
+
+def parse_pmd(output):
+    data = json.loads(output) if output.strip() else {}
+    violations = []
+    for f in data.get("files", []):
+        for v in f.get("violations", []):
+            violations.append(make_violation(
+                "PMD", f["filename"], v.get("beginline"), v.get("begincolumn"),
+                v.get("rule", ""), v.get("description", ""), f"priority{v.get('priority', '')}"))
+    return violations
+
+
+def parse_eslint(output):
+    data = json.loads(output) if output.strip() else []
+    violations = []
+    for f in data:
+        for m in f.get("messages", []):
+            severity = "error" if m.get("severity") == 2 else "warning"
+            violations.append(make_violation(
+                "ESLint", f["filePath"], m.get("line"), m.get("column"),
+                m.get("ruleId") or "parse-error", m.get("message", ""), severity, "fix" in m))
+    return violations
+
+
+def parse_biome(output):
+    # ::error title=lint/suspicious/noDebugger,file=main.js,line=1,endLine=1,col=1,endColumn=9::This is an unexpected use of the debugger statement.
+    pattern = re.compile(r'^::(\w+) (.*?)::(.*)$')
+    violations = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if not m:
+            continue
+        severity, props, msg = m.groups()
+        attrs = dict(p.split("=", 1) for p in props.split(",") if "=" in p)
+        rule = attrs.get("title", "").split("/")[-1]
+        violations.append(make_violation(
+            "Biome", attrs.get("file", ""), attrs.get("line"), attrs.get("col"), rule, msg, severity))
+    return violations
+
+
+def parse_ruff(output):
+    data = json.loads(output) if output.strip() else []
+    violations = []
+    for v in data:
+        fix = v.get("fix")
+        fixable = bool(fix) and fix.get("applicability", "safe") == "safe"
+        location = v.get("location") or {}
+        violations.append(make_violation(
+            "Ruff", v["filename"], location.get("row"), location.get("column"),
+            v.get("code") or "syntax-error", v.get("message", ""), "error", fixable))
+    return violations
+
+
+def parse_pylint(output):
+    data = json.loads(output) if output.strip() else []
+    return [make_violation("Pylint", v["path"], v.get("line"), v.get("column"),
+                           v.get("message-id", ""), v.get("message", ""), v.get("type", "warning"), False)
+            for v in data]
+
+
+def parse_flake8(output):
+    pattern = re.compile(r'^(.+?):(\d+):(\d+): (\w+) (.*)$')
+    violations = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if m:
+            path, row, col, code, msg = m.groups()
+            violations.append(make_violation("Flake8", path, row, col, code, msg, "error", False))
+    return violations
+
+
+def parse_clang_tidy(output):
+    # /path/a.cpp:3:5: warning: use auto when ... [modernize-use-auto,-warnings-as-errors]
+    pattern = re.compile(r'^(.+?):(\d+):(\d+): (warning|error): (.*) \[([\w\-.,]+)\]$')
+    violations = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if m:
+            path, row, col, severity, msg, checks = m.groups()
+            rule = checks.split(",")[0]
+            violations.append(make_violation("ClangTidy", path, row, col, rule, msg, severity))
+    return violations
+
+
+def parse_cppcheck(output):
+    pattern = re.compile(r'^(.+?):(\d+):(\d+): (\w+): (.*) \[(\w+)\]$')
+    violations = []
+    for line in output.splitlines():
+        m = pattern.match(line.strip())
+        if m:
+            path, row, col, severity, msg, rule = m.groups()
+            violations.append(make_violation("Cppcheck", path, row, col, rule, msg, severity, False))
+    return violations
+
+
+def parse_rubocop(output):
+    data = json.loads(output) if output.strip() else {}
+    violations = []
+    for f in data.get("files", []):
+        for o in f.get("offenses", []):
+            location = o.get("location") or {}
+            violations.append(make_violation(
+                "RuboCop", f["path"], location.get("start_line", location.get("line")),
+                location.get("start_column", location.get("column")),
+                o.get("cop_name", ""), o.get("message", ""), o.get("severity", "convention"),
+                bool(o.get("correctable"))))
+    return violations
+
+
+def parse_reek(output):
+    data = json.loads(output) if output.strip() else []
+    violations = []
+    for smell in data:
+        lines = smell.get("lines") or [0]
+        message = f"{smell.get('context', '')} {smell.get('message', '')}"
+        violations.append(make_violation(
+            "Reek", smell.get("source", ""), lines[0], 0, smell.get("smell_type", ""), message, "warning", False))
+    return violations
+
+
+PARSERS = {
+    "Checkstyle": parse_checkstyle,
+    "PMD": parse_pmd,
+    "ESLint": parse_eslint,
+    "Biome": parse_biome,
+    "Ruff": parse_ruff,
+    "Pylint": parse_pylint,
+    "Flake8": parse_flake8,
+    "ClangTidy": parse_clang_tidy,
+    "Cppcheck": parse_cppcheck,
+    "RuboCop": parse_rubocop,
+    "Reek": parse_reek,
+}
+
+
+def run_command(cmd, env=None):
+    """执行命令并返回 CompletedProcess；命令不存在时抛出 RuntimeError 供上层展示诊断信息"""
+    with span(f"exec {os.path.basename(cmd[0])}", "lint", argc=len(cmd)) as trace:
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True,
+                                  env=dict(os.environ, **env) if env else None)
+        except FileNotFoundError:
+            raise RuntimeError(f"找不到可执行文件: {cmd[0]}，请先安装对应 Linter")
+        trace["returncode"] = proc.returncode
+    return proc
+
+
+def lint_template(linter, warm=False):
+    """warm=True 时优先使用常驻进程版本 (eslint_d / rubocop --server)，不可用时退回普通命令"""
+    spec = LINTERS[linter]
+    if warm and spec.get("warm") and shutil.which(spec["warm"][0]):
+        return spec["warm"]
+    return spec["lint"]
+
+
+def run_linter(linter, config, files, warm=False):
+    """对 files 执行 Linter，返回归一化后的违规列表"""
+    linter = resolve_linter(linter)
+    template = lint_template(linter, warm)
+    parser = PARSERS[linter]
+    violations = []
+    files = list(files)
+    warm = template is not LINTERS[linter]["lint"]
+    with span("run linter", "lint", linter=linter, files=len(files), warm=warm) as trace:
+        for batch in chunked(files):
+            proc = run_command(build_command(template, config, batch))
+            # 大部分 Linter 的诊断写在 stdout，clang-tidy / cppcheck 会写在 stderr
+            output = proc.stdout if linter not in ("ClangTidy", "Cppcheck") else proc.stdout + proc.stderr
+            try:
+                batch_violations = parser(output)
+            except json.JSONDecodeError:
+                raise RuntimeError(f"{linter} 输出无法解析 (exit {proc.returncode}):\n{proc.stdout}\n{proc.stderr}")
+            if not batch_violations and proc.returncode not in (0, 1) and proc.stderr.strip():
+                raise RuntimeError(f"{linter} 执行失败 (exit {proc.returncode}):\n{proc.stderr}")
+            violations.extend(batch_violations)
+        trace["violations"] = len(violations)
+    return violations
+
+
+def run_fixer(linter, config, files):
+    """批量执行 Linter 原生修复命令；不支持修复时返回 False，修复命令运行失败时抛出 RuntimeError"""
+    linter = resolve_linter(linter)
+    template = LINTERS[linter]["fix"]
+    if not template:
+        return False
+    files = list(files)
+    with span("run fixer", "repair", linter=linter, files=len(files)):
+        for batch in chunked(files):
+            proc = run_command(build_command(template, config, batch))
+            # 退出码 1 表示修复后仍有违规；其他非零退出码为参数、配置错误或崩溃
+            if proc.returncode not in (0, 1):
+                raise RuntimeError(f"{linter} 修复失败 (exit {proc.returncode}):\n"
+                                   f"{proc.stderr.strip() or proc.stdout.strip()}")
+    return True
+
+
+def collect_files(paths, linter):
+    """展开目录，只保留该 Linter 能处理的文件"""
+    extensions = tuple(LINTERS[resolve_linter(linter)]["extensions"])
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d != "node_modules"]
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(extensions))
+        elif os.path.exists(path):
+            files.append(path)
+    return files
+
+
+def save_result(linter, violations, output_path=None):
+    """保存为 <LinterName>LintResult.json"""
+    if output_path is None:
+        output_path = os.path.join(OUTPUT_DIR, f"{resolve_linter(linter)}LintResult.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(violations, f, ensure_ascii=False, indent=4)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="执行 Linter 并输出归一化结果")
+    parser.add_argument("--linter", required=True)
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--output", default=None, help="结果文件路径，默认 output/<LinterName>LintResult.json")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths, args.linter)
+    if not files:
+        print("没有找到可检查的文件。")
+        return 0
+    try:
+        violations = run_linter(args.linter, args.config, files)
+    except RuntimeError as e:
+        print(f"错误: {e}")
+        return 2
+    path = save_result(args.linter, violations, args.output)
+    print(f"共检查 {len(files)} 个文件，发现 {len(violations)} 个违规。")
+    print(f"结果文件: {path}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+import argparse
+import re
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+from kb import load_index, load_rule
+
+# Checkstyle 配置精简：利用知识库中记录的选项默认值
+# 1. 删除取值等于默认值的 property
+# 2. 合并同一父模块下重复的 module（仅 tokens 不同的实例合并为 tokens 并集）
+# 3. 去重 tokens 列表；并集等于默认 tokens 时直接删除该 property
+# 精简前后会做一致性检查：按知识库默认值补全、合并 tokens 后的模型必须相同，否则拒绝写出。
+# 该检查与删除默认值依据同一份知识库，只能发现精简逻辑本身的错误；要确认违规集合不变，
+# 需用 --code 指定代码，实际运行 Checkstyle 比较精简前后的报告。
+# Check 放错父模块（如直接放在 Checker 下的 TreeWalker 级 Check）时 Checkstyle 会拒绝加载配置，
+# 默认报错退出；--fix-nesting 把它们移到应在的父模块下（缺少 TreeWalker 时新建，根元素不是 module 时改为 Checker）再精简。
+# 用法示例:
+# python scripts/minimize_config.py output/CheckstyleConfig_long.xml --fix-nesting --code src/ --runs 3
+
+LINTER = "Checkstyle"
+TOKEN_OPTIONS = ("tokens", "javadocTokens")
+# 只对这些类型的默认值做比较，其余类型（解析不可靠）一律保留
+SIMPLE_TYPES = {"boolean", "int", "String", "Pattern", "Scope", "SeverityLevel", "String[]", "Pattern[]", "int[]"}
+TOKEN_PATTERN = re.compile(r'^[A-Z_]+(,[A-Z_]+)*$')
+# 索引没有 parent 字段时（当前随附的知识库由文档抓取生成，没有该字段）使用的回退:
+# 以下文件级 Check (FileSetCheck) 放在 Checker 下，其余 Check 都放在 TreeWalker 下（Checkstyle 8.24 起 LineLength 属于 Checker）
+CHECKER_MODULES = {"FileLength", "FileTabCharacter", "Header", "JavadocPackage", "LineLength", "NewlineAtEndOfFile",
+                   "OrderedProperties", "RegexpHeader", "RegexpMultiline", "RegexpOnFilename", "RegexpSingleline",
+                   "Translation", "UniqueProperties"}
+
+
+def parse_option_text(option_text):
+    """
+    解析 Checkstyle 规则文件的 option 字段:
+    "max, Specify the maximum line length allowed., int, 80"
+    "tokens, tokens to check, subset of tokens\n\nA\n,\nB\n.\n,\n\nA\n.\n"  (可选 tokens . 默认 tokens)
+    返回 {name: {"type", "default"}}，tokens 类选项的 default 为集合
+    """
+    options = {}
+    for entry in re.split(r'\n(?=[a-z]\w*, )', '\n' + (option_text or '')):
+        entry = entry.strip()
+        if not entry:
+            continue
+        header, _, body = entry.partition('\n')
+        name = header.split(',', 1)[0]
+        if name in TOKEN_OPTIONS and 'subset of' in header:
+            parts = re.sub(r'\s+', '', body).rstrip('.').split('.,')
+            if len(parts) == 2 and TOKEN_PATTERN.match(parts[1]):
+                acceptable = set(parts[0].split(',')) if TOKEN_PATTERN.match(parts[0]) else None
+                options[name] = {"type": "tokens", "default": set(parts[1].split(',')), "acceptable": acceptable}
+            continue
+        fields = entry.rsplit(', ', 2)
+        if len(fields) == 3 and (fields[1] in SIMPLE_TYPES or fields[1].endswith("Option")):
+            options[name] = {"type": fields[1], "default": normalize_value(fields[1], fields[2])}
+    return options
+
+
+def normalize_value(value_type, value):
+    """把取值转换为可比较的形式；无法确定的默认值返回 None"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if value_type == "boolean":
+        return value.lower()
+    if value_type == "int":
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    if value_type.endswith("[]") or value_type == "tokens":
+        if value in ("{}", "", "all files"):
+            return frozenset()
+        return frozenset(v.strip() for v in value.strip("{}").split(',') if v.strip())
+    if value_type.endswith("Option") or value_type in ("Scope", "SeverityLevel"):
+        return value.lower()
+    if value == "null":
+        return None
+    return value
+
+
+class CheckstyleKB:
+    """按需读取并缓存每个 Check 的选项定义"""
+
+    def __init__(self):
+        self.index = load_index(LINTER)
+        self.cache = {}
+
+    def options(self, module_name):
+        if module_name not in self.cache:
+            rule = load_rule(LINTER, module_name) if module_name in self.index else None
+            self.cache[module_name] = parse_option_text(rule.get("option")) if rule else {}
+        return self.cache[module_name]
+
+    def parent(self, module_name):
+        """父模块 (Checker / TreeWalker)：优先取索引的 parent 字段，没有时按 CHECKER_MODULES 回退；不是 Check 时返回 None"""
+        if module_name not in self.index:
+            return None
+        return self.index[module_name].get("parent") or \
+            ("Checker" if module_name in CHECKER_MODULES else "TreeWalker")
+
+
+def get_properties(module):
+    return [p for p in module if p.tag == "property"]
+
+
+def split_tokens(value):
+    return [t.strip() for t in value.split(',') if t.strip()]
+
+
+def module_signature(module, kb, include_tokens):
+    """module 的比较键：名称 + 非 tokens 的属性（已规范化）+ message 子元素"""
+    options = kb.options(module.get("name"))
+    props = []
+    for p in get_properties(module):
+        name = p.get("name")
+        if name in TOKEN_OPTIONS and name in options and not include_tokens:
+            continue
+        opt = options.get(name)
+        value = normalize_value(opt["type"], p.get("value", "")) if opt else p.get("value")
+        props.append((name, value))
+    for m in module:
+        if m.tag == "message":
+            props.append(("message:" + m.get("key", ""), m.get("value")))
+    return module.get("name"), frozenset(props)
+
+
+def effective_config(root, kb):
+    """
+    有效配置模型: {(父路径, 模块名, 补全默认值后的非 tokens 属性): tokens 并集}
+    两份配置的有效模型相同，即报告的违规集合相同
+    """
+    model = {}
+
+    def walk(module, path):
+        name = module.get("name")
+        options = kb.options(name)
+        values = {n: o["default"] for n, o in options.items() if o["type"] != "tokens"}
+        tokens = {n: set(o["default"]) for n, o in options.items() if o["type"] == "tokens"}
+        for p in get_properties(module):
+            pname = p.get("name")
+            opt = options.get(pname)
+            if opt and opt["type"] == "tokens":
+                tokens[pname] = set(split_tokens(p.get("value", "")))
+            else:
+                values[pname] = normalize_value(opt["type"], p.get("value", "")) if opt else p.get("value")
+        for m in module:
+            if m.tag == "message":
+                values["message:" + m.get("key", "")] = m.get("value")
+        key = (path, name, frozenset(values.items()))
+        merged = model.setdefault(key, {})
+        for tname, tset in tokens.items():
+            merged.setdefault(tname, set()).update(tset)
+        for child in module:
+            if child.tag == "module":
+                walk(child, path + (name,))
+
+    walk(root, ())
+    return model
+
+
+def misplaced_modules(root, kb):
+    """返回 [(模块名, 实际父模块, 应在的父模块)]；Checker 下的 Check 放进 TreeWalker（或相反）时 Checkstyle 会拒绝加载配置"""
+    result = []
+
+    def walk(module):
+        for child in module:
+            if child.tag != "module":
+                continue
+            expected = kb.parent(child.get("name"))
+            if expected and expected != module.get("name"):
+                result.append((child.get("name"), module.get("name") or f"<{module.tag}>", expected))
+            walk(child)
+
+    walk(root)
+    return result
+
+
+def fix_nesting(root, kb):
+    """
+    把放错父模块的 Check 移到 Checker 根模块或 TreeWalker 下；返回 [(模块名, 原父模块, 新父模块)]。
+    根元素不是 module（如 <config>）时改为 <module name="Checker">
+    """
+    if root.tag != "module":
+        root.tag, root.attrib = "module", {"name": "Checker"}
+    walkers = [c for c in root if c.tag == "module" and c.get("name") == "TreeWalker"]
+    moved = []
+    for parent in [root] + walkers:
+        for child in list(parent):
+            if child.tag != "module":
+                continue
+            expected = kb.parent(child.get("name"))
+            if expected is None or expected == parent.get("name"):
+                continue
+            parent.remove(child)
+            if expected == "Checker":
+                root.append(child)
+            else:
+                if not walkers:
+                    walkers.append(ET.SubElement(root, "module", {"name": "TreeWalker"}))
+                walkers[0].append(child)
+            moved.append((child.get("name"), parent.get("name"), expected))
+    return moved
+
+
+def minimize(root, kb):
+    stats = {"removed_properties": 0, "merged_modules": 0}
+
+    def visit(parent):
+        children = [c for c in parent if c.tag == "module"]
+        # 1. 删除默认值属性，使等价的模块拥有相同签名
+        for child in children:
+            stats["removed_properties"] += drop_default_properties(child, kb)
+
+        # 2. 合并同一父模块下签名相同的子模块
+        groups = OrderedDict()
+        for child in children:
+            has_tokens = any(t in kb.options(child.get("name")) for t in TOKEN_OPTIONS)
+            groups.setdefault(module_signature(child, kb, include_tokens=not has_tokens), []).append(child)
+        for modules in groups.values():
+            if len(modules) > 1:
+                merge_modules(modules, kb)
+                for dup in modules[1:]:
+                    parent.remove(dup)
+                stats["merged_modules"] += len(modules) - 1
+                stats["removed_properties"] += drop_default_properties(modules[0], kb)
+
+        for child in parent:
+            if child.tag == "module":
+                visit(child)
+
+    visit(root)
+    return stats
+
+
+def merge_modules(modules, kb):
+    """把 modules[1:] 的 tokens 并入 modules[0]"""
+    first = modules[0]
+    options = kb.options(first.get("name"))
+    for tname in TOKEN_OPTIONS:
+        if tname not in options:
+            continue
+        merged = []
+        for module in modules:
+            prop = next((p for p in get_properties(module) if p.get("name") == tname), None)
+            values = split_tokens(prop.get("value")) if prop is not None else sorted(options[tname]["default"])
+            merged.extend(t for t in values if t not in merged)
+        prop = next((p for p in get_properties(first) if p.get("name") == tname), None)
+        if prop is None:
+            prop = ET.SubElement(first, "property", {"name": tname})
+        prop.set("value", ",".join(merged))
+
+
+def drop_default_properties(module, kb):
+    options = kb.options(module.get("name"))
+    removed = 0
+    for p in get_properties(module):
+        opt = options.get(p.get("name"))
+        if not opt or opt["default"] is None:
+            continue
+        value = p.get("value", "")
+        if opt["type"] == "tokens":
+            tokens = split_tokens(value)
+            if set(tokens) == opt["default"]:
+                module.remove(p)
+                removed += 1
+            elif len(set(tokens)) != len(tokens):
+                p.set("value", ",".join(OrderedDict.fromkeys(tokens)))
+        elif normalize_value(opt["type"], value) == opt["default"]:
+            module.remove(p)
+            removed += 1
+    return removed
+
+
+def read_prolog(text):
+    """保留根元素之前的 XML 声明、DOCTYPE 和注释"""
+    pos = 0
+    while True:
+        m = re.compile(r'<!--.*?-->|<(?=[A-Za-z])', re.S).search(text, pos)
+        if not m or m.group() == '<':
+            return text[:m.start()] if m else ""
+        pos = m.end()
+
+
+def strip_comments(element):
+    for child in list(element):
+        if child.tag is ET.Comment:
+            element.remove(child)
+        else:
+            strip_comments(child)
+
+
+def count_elements(root, tag):
+    return sum(1 for _ in root.iter(tag))
+
+
+def measure_lint(config, paths, runs):
+    """多次运行取中位数；返回 (秒, 违规集合)"""
+    from lint_runner import collect_files, run_linter
+    files = collect_files(paths, LINTER)
+    timings, found = [], set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        violations = run_linter(LINTER, config, files)
+        timings.append(time.perf_counter() - start)
+        found = {(v["file"], v["line"], v["column"], v["rule"]) for v in violations}
+    return statistics.median(timings), found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="精简 Checkstyle 配置中的重复模块与默认值属性")
+    parser.add_argument("config")
+    parser.add_argument("--output", default=None, help="默认在原文件名后追加 _min")
+    parser.add_argument("--strip-comments", action="store_true")
+    parser.add_argument("--fix-nesting", action="store_true",
+                        help="把放错父模块的 Check 移到 Checker / TreeWalker 下，而不是报错退出")
+    parser.add_argument("--code", nargs="*", default=[], help="用于测量 lint 耗时的代码路径")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        original_text = f.read()
+
+    tree_builder = ET.TreeBuilder(insert_comments=not args.strip_comments)
+    root = ET.fromstring(original_text, parser=ET.XMLParser(target=tree_builder))
+    kb = CheckstyleKB()
+
+    if args.fix_nesting and (root.tag != "module" or root.get("name") == "Checker"):
+        for name, actual, expected in fix_nesting(root, kb):
+            print(f"已移动: {name} ({actual} -> {expected})")
+    misplaced = misplaced_modules(root, kb)
+    if misplaced:
+        for name, actual, expected in misplaced:
+            print(f"错误: {name} 位于 {actual} 下，应放在 {expected} 下")
+        if root.tag != "module" or root.get("name") == "Checker":
+            print("可加 --fix-nesting 自动移动。")
+        return 2
+
+    before_model = effective_config(root, kb)
+    before_modules = count_elements(root, "module")
+    before_props = count_elements(root, "property")
+
+    stats = minimize(root, kb)
+    if args.strip_comments:
+        strip_comments(root)
+
+    # 按知识库默认值的一致性检查，不一致说明精简逻辑有误，不写出
+    if effective_config(root, kb) != before_model:
+        print("错误: 一致性检查失败（按知识库默认值补全后的配置与原配置不同），已放弃写出。")
+        return 2
+
+    # 删除子元素后残留的空白文本会导致空模块无法输出为自闭合标签
+    for element in root.iter():
+        if len(element) == 0 and element.text is not None and not element.text.strip():
+            element.text = None
+    ET.indent(root, space="    ")
+    minimized_text = read_prolog(original_text) + ET.tostring(root, encoding="unicode") + "\n"
+    output_path = args.output or re.sub(r'(\.xml)?$', '_min.xml', args.config, count=1)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(minimized_text)
+
+    before_size = len(original_text.encode('utf-8'))
+    after_size = len(minimized_text.encode('utf-8'))
+    print("一致性检查（按知识库默认值）: 通过" + ("" if args.code else "；未用 --code 实际运行 Checkstyle 确认"))
+    print(f"模块数: {before_modules} -> {count_elements(root, 'module')} (合并 {stats['merged_modules']})")
+    print(f"属性数: {before_props} -> {count_elements(root, 'property')} (删除默认值 {stats['removed_properties']})")
+    print(f"文件大小: {before_size} -> {after_size} 字节 ({100 * (after_size - before_size) / before_size:+.1f}%)")
+    print(f"输出文件: {output_path}")
+
+    if args.code:
+        try:
+            before_time, before_found = measure_lint(args.config, args.code, args.runs)
+            after_time, after_found = measure_lint(output_path, args.code, args.runs)
+        except RuntimeError as e:
+            print(f"跳过耗时测量: {e}")
+            return 0
+        print(f"Lint 耗时 (中位数, {args.runs} 次): {before_time:.3f}s -> {after_time:.3f}s")
+        print(f"违规集合: {'一致' if before_found == after_found else '不一致！'}")
+        if before_found != after_found:
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from lint_runner import LINTERS, MAX_FILES_PER_CALL, OUTPUT_DIR, resolve_linter, run_linter
+
+# 多语言仓库模式：只遍历一次仓库，按扩展名把文件分桶到各 Linter，
+# 每个 Linter 使用各自生成的配置，在全局 worker 上限内并发执行，最后合并为一份归一化报告。
+# 配置默认从 output/<LinterName>Config.* 中查找，也可以用 --config Ruff=path 显式指定。
+# 各 Linter 的 wall_seconds_sum 是其文件块墙钟时间之和；子进程的 CPU 时间只能按整次运行统计（cpu_seconds）。
+# 用法示例:
+# python scripts/monorepo.py --config Ruff=output/ruff.toml --config Checkstyle=output/CheckstyleConfig.xml --workers 8 .
+
+SKIP_DIRS = {".git", "node_modules", "build", "dist", "target", "vendor", "__pycache__", ".venv", "venv"}
+
+
+def discover_configs(config_dir, overrides):
+    """返回 {LinterName: 配置路径}；显式指定的配置优先"""
+    configs = {}
+    for linter in LINTERS:
+        matches = sorted(glob.glob(os.path.join(config_dir, f"{linter}Config.*")))
+        if matches:
+            configs[linter] = matches[0]
+    for item in overrides:
+        name, _, path = item.partition("=")
+        configs[resolve_linter(name)] = path
+    return configs
+
+
+def scan_repository(root, linters):
+    """遍历一次仓库，返回 {LinterName: [文件]}"""
+    by_extension = {}
+    for linter in linters:
+        for ext in LINTERS[linter]["extensions"]:
+            by_extension.setdefault(ext, []).append(linter)
+
+    buckets = {linter: [] for linter in linters}
+    for current, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in names:
+            for linter in by_extension.get(os.path.splitext(name)[1], []):
+                buckets[linter].append(os.path.join(current, name))
+    return buckets
+
+
+def lint_chunk(linter, config, files):
+    start = time.perf_counter()
+    violations = run_linter(linter, config, files)
+    return violations, start, time.perf_counter()
+
+
+def children_cpu_seconds():
+    """已结束子进程的 user + sys CPU 时间；线程池中各 Linter 并发运行，无法按 Linter 拆分"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_all(configs, buckets, workers):
+    """所有 Linter 的文件块共用一个线程池，保证并发进程数不超过 workers"""
+    jobs = []
+    for linter, files in buckets.items():
+        if not files:
+            continue
+        # 文件块大小: 让单个 Linter 也能铺满 worker，同时不超过命令行长度上限
+        size = max(1, min(MAX_FILES_PER_CALL, math.ceil(len(files) / workers)))
+        for i in range(0, len(files), size):
+            jobs.append((linter, files[i:i + size]))
+
+    stats = {linter: {"files": len(files), "violations": 0, "wall_seconds_sum": 0.0, "start": None, "end": None,
+                      "error": None} for linter, files in buckets.items() if files}
+    violations = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(lint_chunk, linter, configs[linter], chunk): linter for linter, chunk in jobs}
+        for future in as_completed(futures):
+            linter = futures[future]
+            s = stats[linter]
+            try:
+                found, start, end = future.result()
+            except Exception as e:
+                # 单个 Linter 失败（包括输出解析器的 KeyError / ValueError）不影响其他 Linter
+                s["error"] = str(e) if isinstance(e, RuntimeError) else f"{type(e).__name__}: {e}"
+                continue
+            violations.extend(found)
+            s["violations"] += len(found)
+            s["wall_seconds_sum"] += end - start
+            s["start"] = start if s["start"] is None else min(s["start"], start)
+            s["end"] = end if s["end"] is None else max(s["end"], end)
+
+    timings = {}
+    for linter, s in stats.items():
+        timings[linter] = {
+            "files": s["files"],
+            "violations": s["violations"],
+            "wall_seconds": round(s["end"] - s["start"], 3) if s["start"] is not None else 0.0,
+            "wall_seconds_sum": round(s["wall_seconds_sum"], 3),
+            "error": s["error"],
+        }
+    violations.sort(key=lambda v: (v["file"], v["line"], v["column"], v["linter"]))
+    return violations, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按语言分桶并发执行多个 Linter")
+    parser.add_argument("root", help="仓库根目录")
+    parser.add_argument("--config", action="append", default=[], metavar="LINTER=PATH")
+    parser.add_argument("--config-dir", default=OUTPUT_DIR, help="自动查找 <LinterName>Config.* 的目录")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="全局并发进程上限")
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "MonorepoLintResult.json"))
+    args = parser.parse_args()
+
+    configs = discover_configs(args.config_dir, args.config)
+    if not configs:
+        print("没有找到任何 Linter 配置，请先生成配置或使用 --config 指定。")
+        return 2
+
+    start = time.perf_counter()
+    buckets = scan_repository(args.root, configs)
+    scan_seconds = time.perf_counter() - start
+    print(f"扫描完成 ({scan_seconds:.2f}s): " + ", ".join(f"{k} {len(v)} 个文件" for k, v in buckets.items()))
+
+    cpu_start = children_cpu_seconds()
+    violations, timings = run_all(configs, buckets, args.workers)
+    total_seconds = time.perf_counter() - start
+    cpu_seconds = children_cpu_seconds() - cpu_start if resource else None
+
+    print(f"\n{'Linter':<12}{'文件':>8}{'违规':>8}{'墙钟(s)':>10}{'块耗时和(s)':>12}")
+    for linter, t in timings.items():
+        print(f"{linter:<12}{t['files']:>8}{t['violations']:>8}{t['wall_seconds']:>10.2f}{t['wall_seconds_sum']:>12.2f}")
+        if t["error"]:
+            print(f"  [Error] {t['error'].splitlines()[0]}")
+    cpu_text = f"，Linter 进程 CPU 时间: {cpu_seconds:.2f}s" if cpu_seconds is not None else ""
+    print(f"\n总耗时: {total_seconds:.2f}s{cpu_text}，违规总数: {len(violations)}")
+
+    report = {
+        "root": os.path.abspath(args.root),
+        "workers": args.workers,
+        "configs": configs,
+        "scan_seconds": round(scan_seconds, 3),
+        "total_seconds": round(total_seconds, 3),
+        "cpu_seconds": round(cpu_seconds, 3) if cpu_seconds is not None else None,
+        "linters": timings,
+        "violations": violations,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"合并报告: {args.output}")
+    return 1 if violations or any(t["error"] for t in timings.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
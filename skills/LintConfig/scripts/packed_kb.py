@@ -0,0 +1,344 @@
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import time
+import zlib
+from collections import Counter
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，未安装时使用 zlib 预置字典
+    zstandard = None
+
+from kb import DATA_DIR, SKILL_DIR, linter_dirs, list_linters, unwrap_rule
+
+# 知识库压缩存储：每个 Linter（及语言子目录）的规则文件打包为 rules.pack，
+# 用该 Linter 的规则训练共享字典，再逐条压缩，按规则名随机读取时只解压一条记录。
+# 安装了 zstandard 时使用 zstd 字典，否则退回到 zlib 预置字典 (zdict)。
+# kb.load_rule / kb_server 在 rules/ 目录不存在时会透明地读取 rules.pack。
+# 用法示例:
+# python scripts/packed_kb.py pack
+# python scripts/packed_kb.py report
+# python scripts/packed_kb.py export ~/.claude/skills/LintConfig --force
+# python scripts/packed_kb.py show RuboCop Style/Alias
+
+PACK_NAME = "rules.pack"
+MAGIC = b"LCPK"
+VERSION = 1
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+# 头部: magic, version u16, codec u16, count u32, dict_len u32, table_offset u32, blob_offset u32
+HEADER = struct.Struct("<4sHHIIII")
+ENTRY = struct.Struct("<IIII")  # name_off, name_len, data_off, data_len（相对 blob_offset）
+
+ZLIB_DICT_SIZE = 32 * 1024  # zlib 窗口上限
+ZSTD_DICT_SIZE = 64 * 1024
+ZSTD_LEVEL = 19
+MIN_TRAIN_SAMPLES = 8
+
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# --- 字典训练 ---
+def train_zlib_dict(samples, size=ZLIB_DICT_SIZE):
+    """
+    zlib 没有字典训练接口：统计在多条记录中重复出现的片段（按转义换行切分），
+    按 出现次数 × 长度 排序填满字典；收益最高的片段放在末尾，离待压缩数据最近。
+    """
+    counts = Counter()
+    for sample in samples:
+        counts.update(set(p for p in sample.split(b"\\n") if len(p) >= 8))
+    ranked = sorted((p for p, n in counts.items() if n >= 2), key=lambda p: counts[p] * len(p), reverse=True)
+    chosen, total = [], 0
+    for piece in ranked:
+        if total + len(piece) > size:
+            continue
+        chosen.append(piece)
+        total += len(piece)
+    return b"".join(reversed(chosen))
+
+
+def train_dict(codec, samples):
+    if len(samples) < MIN_TRAIN_SAMPLES:
+        return b""
+    if codec == CODEC_ZSTD:
+        try:
+            return zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+        except zstandard.ZstdError:
+            # 样本太少或太相似时训练会失败，退回无字典压缩
+            return b""
+    return train_zlib_dict(samples)
+
+
+def make_compressor(codec, dictionary):
+    if codec == CODEC_ZSTD:
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress
+
+    def compress(data):
+        c = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+        return c.compress(data) + c.flush()
+    return compress
+
+
+def make_decompressor(codec, dictionary):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("该 rules.pack 使用 zstd 压缩，请先 pip install zstandard")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress
+
+    def decompress(data):
+        d = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return d.decompress(data) + d.flush()
+    return decompress
+
+
+# --- 打包 ---
+def read_rule_files(rules_dir):
+    """返回 [(文件名去掉 .json, 紧凑 JSON 字节)]，按文件名排序"""
+    records = []
+    for entry in sorted(os.scandir(rules_dir), key=lambda e: e.name):
+        if entry.name.endswith(".json"):
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                records.append((entry.name[:-len(".json")], compact(json.load(f))))
+    return records
+
+
+def write_pack(records, out_path, codec=None):
+    codec = codec or (CODEC_ZSTD if zstandard else CODEC_ZLIB)
+    dictionary = train_dict(codec, [data for _, data in records])
+    compress = make_compressor(codec, dictionary)
+
+    table, blob = bytearray(), bytearray()
+    for name, data in sorted(records):
+        name = name.encode("utf-8")
+        packed = compress(data)
+        table += ENTRY.pack(len(blob), len(name), len(blob) + len(name), len(packed))
+        blob += name + packed
+
+    table_offset = HEADER.size + len(dictionary)
+    blob_offset = table_offset + len(table)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, codec, len(records), len(dictionary), table_offset, blob_offset))
+        f.write(dictionary)
+        f.write(table)
+        f.write(blob)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def pack_directory(directory, codec=None):
+    rules_dir = os.path.join(directory, "rules")
+    if not os.path.isdir(rules_dir):
+        return None
+    return write_pack(read_rule_files(rules_dir), os.path.join(directory, PACK_NAME), codec)
+
+
+class PackedRules:
+    """rules.pack 的只读访问：打开时只读取条目表，get() 时解压单条记录"""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.codec, count, dict_len, table_offset, self.blob_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} 不是受支持的规则包")
+        self.decompress = make_decompressor(self.codec, bytes(self.mm[HEADER.size:HEADER.size + dict_len]))
+        self.entries = {}
+        for i in range(count):
+            name_off, name_len, data_off, data_len = ENTRY.unpack_from(self.mm, table_offset + i * ENTRY.size)
+            start = self.blob_offset + name_off
+            self.entries[self.mm[start:start + name_len].decode("utf-8")] = (data_off, data_len)
+
+    def raw(self, name):
+        data_off, data_len = self.entries[name]
+        start = self.blob_offset + data_off
+        return self.decompress(self.mm[start:start + data_len])
+
+    def get(self, name, default=None):
+        if name not in self.entries:
+            return default
+        return json.loads(self.raw(name))
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+
+# --- 报告 ---
+def dir_size(path):
+    total = 0
+    for root, _, names in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, n)) for n in names)
+    return total
+
+
+def measure_read(directory, rounds):
+    """返回 (JSON 读取 MB/s, rules.pack 读取 MB/s, 单条随机读取 us)，吞吐按原始 JSON 字节计算"""
+    rules_dir = os.path.join(directory, "rules")
+    paths = sorted(e.path for e in os.scandir(rules_dir) if e.name.endswith(".json"))
+    raw_bytes = sum(os.path.getsize(p) for p in paths)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+    json_seconds = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        pack = PackedRules(os.path.join(directory, PACK_NAME))
+        for name in pack:
+            pack.get(name)
+        pack.close()
+    pack_seconds = (time.perf_counter() - start) / rounds
+
+    pack = PackedRules(os.path.join(directory, PACK_NAME))
+    names = list(pack)
+    start = time.perf_counter()
+    for name in names:
+        pack.get(name)
+    single = (time.perf_counter() - start) / max(1, len(names))
+    pack.close()
+    mb = raw_bytes / 1024 / 1024
+    return mb / max(json_seconds, 1e-9), mb / max(pack_seconds, 1e-9), 1e6 * single
+
+
+def report(data_dir, rounds):
+    rows = []
+    for linter in list_linters(data_dir):
+        for language, directory in linter_dirs(linter, data_dir):
+            pack_path = os.path.join(directory, PACK_NAME)
+            if not os.path.isdir(os.path.join(directory, "rules")):
+                continue
+            if not os.path.exists(pack_path):
+                pack_directory(directory)
+            json_rate, pack_rate, single = measure_read(directory, rounds)
+            complete = sum(os.path.getsize(os.path.join(directory, n)) for n in os.listdir(directory)
+                           if n.endswith("CompleteInformation.json"))
+            rows.append({
+                "linter": f"{linter}/{language}" if language else linter,
+                "rules_bytes": dir_size(os.path.join(directory, "rules")) + complete,
+                "pack_bytes": os.path.getsize(pack_path),
+                "json_mb_s": json_rate,
+                "pack_mb_s": pack_rate,
+                "get_us": single,
+            })
+    return rows
+
+
+# --- 导出压缩安装包 ---
+def overlaps(a, b):
+    """a 与 b 是同一目录，或其中一个位于另一个之内"""
+    a, b = os.path.realpath(a), os.path.realpath(b)
+    return os.path.commonpath([a, b]) in (a, b)
+
+
+def export(dest, codec=None, data_dir=DATA_DIR, force=False):
+    """
+    把 skill 目录复制到 dest（例如 ~/.claude/skills/LintConfig），知识库取自 data_dir，
+    rules/ 目录替换为 rules.pack，并去掉与规则文件重复的 *CompleteInformation.json。
+    dest 已存在时只有 force=True 才会先删除；dest 与源目录重叠时拒绝（删除会毁掉源目录，复制会递归进自身）
+    """
+    for source in (SKILL_DIR, data_dir):
+        if overlaps(dest, source):
+            raise ValueError(f"{dest} 与源目录 {source} 重叠，请导出到 skill 目录之外")
+    if os.path.exists(dest):
+        if not force:
+            raise FileExistsError(f"{dest} 已存在，确认覆盖请加 --force")
+        shutil.rmtree(dest)
+    ignore = shutil.ignore_patterns("rules", "*CompleteInformation.json", "*.idx", "__pycache__")
+    # 知识库单独从 data_dir 复制
+    shutil.copytree(SKILL_DIR, dest, ignore=lambda path, names: [
+        n for n in names if n == "__pycache__" or (path == SKILL_DIR and n == "data")])
+    data_dest = os.path.join(dest, os.path.relpath(DATA_DIR, SKILL_DIR))
+    shutil.copytree(data_dir, data_dest, ignore=ignore)
+    for linter in list_linters(data_dir):
+        for _, directory in linter_dirs(linter, data_dir):
+            rules_dir = os.path.join(directory, "rules")
+            if os.path.isdir(rules_dir):
+                target = os.path.join(data_dest, os.path.relpath(directory, data_dir), PACK_NAME)
+                write_pack(read_rule_files(rules_dir), target, codec)
+    return dir_size(SKILL_DIR) - dir_size(DATA_DIR) + dir_size(data_dir), dir_size(dest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="知识库压缩存储")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--codec", choices=["zstd", "zlib"], default=None, help="默认: 已安装 zstandard 时为 zstd")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("pack", help="在每个 rules/ 旁生成 rules.pack")
+    p_report = sub.add_parser("report", help="对比磁盘占用与读取吞吐")
+    p_report.add_argument("--rounds", type=int, default=3)
+    p_export = sub.add_parser("export", help="导出使用 rules.pack 的 skill 副本")
+    p_export.add_argument("dest")
+    p_export.add_argument("--force", action="store_true", help="dest 已存在时先删除")
+    p_show = sub.add_parser("show", help="从 rules.pack 读取一条规则")
+    p_show.add_argument("linter")
+    p_show.add_argument("rule")
+    p_show.add_argument("--language", default=None)
+    args = parser.parse_args()
+
+    codec = {"zstd": CODEC_ZSTD, "zlib": CODEC_ZLIB, None: None}[args.codec]
+    if codec == CODEC_ZSTD and zstandard is None:
+        print("错误: 未安装 zstandard，请 pip install zstandard 或使用 --codec zlib")
+        return 2
+
+    if args.command == "pack":
+        for linter in list_linters(args.data_dir):
+            for _, directory in linter_dirs(linter, args.data_dir):
+                out = pack_directory(directory, codec)
+                if out:
+                    print(f"{os.path.relpath(out, args.data_dir)}: {os.path.getsize(out) / 1024:.1f} KB")
+        return 0
+
+    if args.command == "report":
+        rows = report(args.data_dir, args.rounds)
+        print(f"{'Linter':<30}{'JSON KB':>10}{'pack KB':>10}{'比例':>8}{'JSON MB/s':>12}{'pack MB/s':>12}{'单条 us':>10}")
+        for r in rows:
+            print(f"{r['linter']:<30}{r['rules_bytes'] / 1024:>10.1f}{r['pack_bytes'] / 1024:>10.1f}"
+                  f"{r['pack_bytes'] / r['rules_bytes']:>8.1%}{r['json_mb_s']:>12.1f}{r['pack_mb_s']:>12.1f}"
+                  f"{r['get_us']:>10.1f}")
+        raw, packed = sum(r["rules_bytes"] for r in rows), sum(r["pack_bytes"] for r in rows)
+        print(f"\n合计: {raw / 1024 / 1024:.2f} MB -> {packed / 1024 / 1024:.2f} MB ({packed / raw:.1%})")
+        return 0
+
+    if args.command == "export":
+        try:
+            before, after = export(os.path.expanduser(args.dest), codec, args.data_dir, args.force)
+        except (FileExistsError, ValueError) as e:
+            print(f"错误: {e}")
+            return 2
+        print(f"已导出至 {args.dest}: {before / 1024 / 1024:.2f} MB -> {after / 1024 / 1024:.2f} MB")
+        return 0
+
+    from kb import load_rule
+    rule = load_rule(args.linter, args.rule, args.language, args.data_dir)
+    if rule is None:
+        print(f"{args.linter} 中不存在规则: {args.rule}")
+        return 1
+    print(json.dumps(unwrap_rule(rule, args.rule), ensure_ascii=False, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import argparse
+import configparser
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from kb import load_index
+from lint_runner import (LINTERS, OUTPUT_DIR, build_command, collect_files, lint_template, resolve_linter,
+                         run_command)
+
+# 生成配置的逐规则耗时剖析：
+# - ESLint: 直接使用 TIMING=all 输出的每条规则耗时
+# - 其他 Linter: 只启用部分规则重复运行，对规则集合做二分，
+#   只继续拆分耗时超过阈值的子集，最后输出按耗时排序的成本表
+# 有常驻模式的 Linter（rubocop --server）在常驻进程中测量；其余 Linter 没有常驻模式，
+# 每次测量都是一次独立的子进程（冷启动），先运行一次预热文件系统缓存，启动开销由第一层拆分估计后扣除。
+# 退出码表明 Linter 失败（规则名无效、崩溃）时直接报错，不把失败的运行计入耗时。
+# 用法示例:
+# python scripts/profile_config.py --linter Ruff --config output/ruff.toml --runs 3 src/
+
+DEFAULT_THRESHOLD = 0.05  # 子集耗时低于总规则耗时的 5% 时不再拆分
+NIGHTLY_SHARE = 0.2       # 单条规则占比超过 20% 时建议移到夜间任务
+# 报告违规时的退出码（默认 0 / 1）；Checkstyle 与 Pylint 在 lint_ok 中单独处理
+LINT_EXIT_CODES = {"PMD": (0, 4)}
+
+
+# --- 枚举配置中启用的规则 ---
+def enabled_rules(linter, config):
+    with open(config, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if linter == "Checkstyle":
+        return [key for key in map(checkstyle_key, ET.fromstring(text).iter()) if key]
+    if linter == "PMD":
+        return [key for key in map(pmd_key, ET.fromstring(text).iter()) if key]
+    if linter == "Ruff":
+        data = tomllib.loads(text)
+        ruff = data.get("tool", {}).get("ruff", data)  # pyproject.toml 或 ruff.toml
+        lint = ruff.get("lint", ruff)
+        return list(lint.get("select", [])) + list(lint.get("extend-select", []))
+    if linter == "Flake8":
+        parser = configparser.ConfigParser()
+        parser.read_string(text)
+        section = parser["flake8"] if parser.has_section("flake8") else {}
+        return [c.strip() for c in re.split(r'[,\s]+', section.get("select", "")) if c.strip()]
+    if linter == "Pylint":
+        parser = configparser.ConfigParser()
+        parser.read_string(text)
+        for name in ("MESSAGES CONTROL", "messages control", "tool.pylint.messages_control"):
+            if parser.has_section(name):
+                return [c.strip() for c in re.split(r'[,\s]+', parser[name].get("enable", "")) if c.strip()]
+        return []
+    if linter == "ClangTidy":
+        checks = (yaml.safe_load(text) or {}).get("Checks", "")
+        if isinstance(checks, list):
+            checks = ",".join(checks)
+        return [c.strip() for c in checks.split(",") if c.strip() and not c.strip().startswith("-")]
+    if linter == "RuboCop":
+        data = yaml.safe_load(text) or {}
+        return [cop for cop, conf in data.items()
+                if "/" in cop and not (isinstance(conf, dict) and conf.get("Enabled") is False)]
+    if linter == "Biome":
+        rules = json.loads(text).get("linter", {}).get("rules", {})
+        found = []
+        for group, group_rules in rules.items():
+            if isinstance(group_rules, dict):
+                for name, level in group_rules.items():
+                    level = level.get("level") if isinstance(level, dict) else level
+                    if level != "off":
+                        found.append(f"{group}/{name}")
+        return found
+    raise ValueError(f"{linter} 不支持按规则剖析")
+
+
+# --- 生成只启用部分规则的运行命令 ---
+@lru_cache(maxsize=None)
+def checkstyle_checks():
+    return frozenset(load_index("Checkstyle"))
+
+
+def checkstyle_key(element):
+    """Checker / TreeWalker 等结构模块不计入规则"""
+    name = element.get("name")
+    return name if element.tag == "module" and name in checkstyle_checks() else None
+
+
+def pmd_key(element):
+    return element.get("ref") if element.tag.endswith("rule") else None
+
+
+def restrict_xml(config, keep, rule_key):
+    """删除不在 keep 中的规则元素，返回临时配置文件路径"""
+    tree = ET.parse(config)
+    for parent in list(tree.getroot().iter()):
+        for child in list(parent):
+            key = rule_key(child)
+            if key and key not in keep:
+                parent.remove(child)
+    fd, path = tempfile.mkstemp(suffix=".xml")
+    os.close(fd)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+    return path
+
+
+def restricted_command(linter, config, rules, files):
+    """返回 (命令, 需要清理的临时文件)"""
+    template = lint_template(linter, warm=True)
+    keep = set(rules)
+    if linter == "Checkstyle":
+        path = restrict_xml(config, keep, checkstyle_key)
+        return build_command(template, path, files), path
+    if linter == "PMD":
+        ET.register_namespace("", "http://pmd.sourceforge.net/ruleset/2.0.0")
+        path = restrict_xml(config, keep, pmd_key)
+        return build_command(template, path, files), path
+
+    extra = {
+        "Ruff": ["--select", ",".join(rules)],
+        "Flake8": ["--select=" + ",".join(rules)],
+        "Pylint": ["--disable=all", "--enable=" + ",".join(rules)],
+        "ClangTidy": ["--checks=-*," + ",".join(rules)],
+        "RuboCop": ["--only", ",".join(rules)],
+        "Biome": [f"--only={r}" for r in rules],
+    }[linter]
+    return build_command(template + extra, config, files), None
+
+
+def lint_ok(linter, returncode):
+    """区分“报告了违规”与“运行失败”"""
+    if linter == "Checkstyle":
+        return 0 <= returncode < 254    # 退出码为违规数；-1 / -2 (255 / 254) 为参数或配置错误
+    if linter == "Pylint":
+        return not returncode & (1 | 32)  # 位标志：1 致命错误，32 用法错误
+    return returncode in LINT_EXIT_CODES.get(linter, (0, 1))
+
+
+def check_run(linter, proc):
+    if not lint_ok(linter, proc.returncode):
+        raise RuntimeError(f"{linter} 执行失败 (exit {proc.returncode})，规则选择无效或 Linter 崩溃:\n"
+                           f"{proc.stderr.strip() or proc.stdout.strip()}")
+
+
+def measure(linter, config, rules, files, runs):
+    """只启用 rules 运行 runs 次，返回中位数耗时"""
+    cmd, temp = restricted_command(linter, config, rules, files)
+    try:
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = run_command(cmd)
+            timings.append(time.perf_counter() - start)
+            check_run(linter, proc)
+        return statistics.median(timings)
+    finally:
+        if temp:
+            os.remove(temp)
+
+
+def bisect_profile(linter, config, rules, files, runs, threshold):
+    """
+    对规则集合二分测量。假设耗时可加: t(S) = 启动与解析开销 + sum(cost(r) for r in S)，
+    第一层拆分即可估计开销: overhead = t(A) + t(B) - t(A ∪ B)
+    """
+    total = measure(linter, config, rules, files, runs)
+    if len(rules) == 1:
+        return [(rules, total)], 0.0, total
+
+    mid = len(rules) // 2
+    left, right = rules[:mid], rules[mid:]
+    t_left = measure(linter, config, left, files, runs)
+    t_right = measure(linter, config, right, files, runs)
+    overhead = max(0.0, t_left + t_right - total)
+    limit = threshold * max(total - overhead, 1e-9)
+
+    results = []
+
+    def split(subset, elapsed):
+        cost = max(0.0, elapsed - overhead)
+        if len(subset) == 1 or cost < limit:
+            results.append((subset, cost))
+            return
+        half = len(subset) // 2
+        for part in (subset[:half], subset[half:]):
+            split(part, measure(linter, config, part, files, runs))
+
+    split(left, t_left)
+    split(right, t_right)
+    return results, overhead, total
+
+
+def eslint_timing(config, files):
+    """ESLint 自带的 TIMING 输出: "no-unused-vars | 52.472 | 6.1%" """
+    spec = LINTERS["ESLint"]
+    proc = run_command(build_command(spec["lint"], config, files), env={"TIMING": "all"})
+    check_run("ESLint", proc)
+    pattern = re.compile(r'^(\S+)\s*\|\s*([\d.]+)\s*\|\s*([\d.]+)%$')
+    results = []
+    for line in proc.stdout.splitlines():
+        m = pattern.match(line.strip())
+        if m:
+            results.append(([m.group(1)], float(m.group(2)) / 1000))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="剖析生成的 Linter 配置中每条规则的耗时")
+    parser.add_argument("--linter", required=True)
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--runs", type=int, default=3, help="每次测量重复次数（取中位数）")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="子集耗时占比低于该值时不再拆分；0 表示测量每条规则")
+    parser.add_argument("--output", default=None, help="默认 output/<LinterName>CostProfile.json")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    linter = resolve_linter(args.linter)
+    files = collect_files(args.paths, linter)
+    if not files:
+        print("没有找到可检查的文件。")
+        return 0
+
+    try:
+        if linter == "ESLint":
+            results, overhead = eslint_timing(args.config, files), 0.0
+        else:
+            rules = enabled_rules(linter, args.config)
+            if not rules:
+                print(f"无法从 {args.config} 中枚举到启用的规则。")
+                return 2
+            print(f"共 {len(rules)} 条规则，预热一次后开始二分测量...")
+            measure(linter, args.config, rules, files, 1)
+            results, overhead, _ = bisect_profile(linter, args.config, rules, files, args.runs, args.threshold)
+    except (RuntimeError, ValueError) as e:
+        print(f"错误: {e}")
+        return 2
+
+    results.sort(key=lambda r: r[1], reverse=True)
+    rule_total = sum(cost for _, cost in results) or 1e-9
+    table = []
+    for subset, cost in results:
+        share = cost / rule_total
+        table.append({
+            "rules": subset,
+            "seconds": round(cost, 4),
+            "share": round(share, 4),
+            "nightly": len(subset) == 1 and share >= NIGHTLY_SHARE,
+        })
+
+    print(f"\n启动与解析开销: {overhead:.3f}s")
+    print(f"{'规则':<50}{'耗时(s)':>10}{'占比':>8}")
+    for row in table:
+        label = row["rules"][0] if len(row["rules"]) == 1 else f"{row['rules'][0]} 等 {len(row['rules'])} 条"
+        flag = "  -> 建议移到夜间任务" if row["nightly"] else ""
+        print(f"{label:<50}{row['seconds']:>10.3f}{100 * row['share']:>7.1f}%{flag}")
+
+    output_path = args.output or os.path.join(OUTPUT_DIR, f"{linter}CostProfile.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"linter": linter, "config": args.config, "overhead": round(overhead, 4), "rules": table},
+                  f, ensure_ascii=False, indent=4)
+    print(f"\n成本表已保存至: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+try:
+    import tiktoken
+except ImportError:  # 可选依赖，未安装时按字符规律估算 token 数
+    tiktoken = None
+
+from kb import DATA_DIR, index_path, linter_dirs, list_linters, load_index, load_rule
+from lint_runner import resolve_linter
+from workflow_trace import span
+
+# 按 token 预算取规则文档：知识库构建时为每条规则预先生成三级视图，
+#   summary : 一行摘要
+#   options : 摘要 + 全部选项
+#   full    : 完整描述 + 全部选项（即规则文件内容）
+# 并记录每级视图的字节数与 token 数，保存为 <LinterName>Views.json（与索引同目录）。
+# 取文档时先保证每条候选规则都有摘要，再按候选顺序逐条升级到 options、full，直到用完预算。
+# 用法示例:
+# python scripts/rule_views.py build
+# python scripts/rule_views.py fetch --linter Ruff --budget 2000 PT008 E501 B006
+
+TIERS = ["summary", "options", "full"]
+SUMMARY_CHARS = 200
+NO_OPTIONS = "(no options)"
+
+_encoding = tiktoken.get_encoding("cl100k_base") if tiktoken else None
+
+
+def count_tokens(text):
+    """安装了 tiktoken 时精确计数；否则估算: 单词约每 6 个字符 1 个 token，数字每 3 位 1 个，标点各 1 个"""
+    if _encoding:
+        return len(_encoding.encode(text))
+    tokens = 0
+    for piece in re.findall(r'[A-Za-z]+|\d+|[^\sA-Za-z\d]', text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        elif piece[0].isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+# --- 生成视图 ---
+def clean_description(text):
+    text = re.sub(r'\[(Status|Name|Message): [^\]]*\]', ' ', text or "")
+    text = re.sub(r'^\s*((Description|Introduction|What it does)\s*)+', '', text.strip())
+    return text.strip()
+
+
+def first_sentence(text):
+    text = " ".join(text.split())
+    m = re.match(r'(.+?[.!?])(\s|$)', text)
+    sentence = m.group(1) if m else text
+    return sentence if len(sentence) <= SUMMARY_CHARS else sentence[:SUMMARY_CHARS - 1].rstrip() + "…"
+
+
+def summary_line(name, entry, rule):
+    """优先使用索引描述；索引描述为空或只是标题（如 Reek 的 Introduction）时取规则文档第一句"""
+    name_tag = re.search(r'\[Name: ([^\]]+)\]', entry.get("description", ""))
+    label = f"{name} ({name_tag.group(1)})" if name_tag else name
+    text = clean_description(entry.get("description", ""))
+    if len(text.split()) < 3 and rule:
+        text = clean_description(rule.get("description", ""))
+    return f"{label}: {first_sentence(text)}" if text else label
+
+
+def option_text(rule):
+    option = rule.get("option") if rule else None
+    if not option:
+        return NO_OPTIONS
+    if isinstance(option, dict):
+        return json.dumps(option, ensure_ascii=False, indent=1)
+    text = option.strip()
+    # 各 Linter 的"无选项"说明统一为一个标记
+    if re.match(r'(This rule has no (specific )?options|Static analysis does not have options)', text) \
+            and "\n" not in text.split(".", 1)[-1].strip():
+        return NO_OPTIONS
+    return text
+
+
+def make_views(name, entry, rule):
+    summary = summary_line(name, entry, rule)
+    options = f"{summary}\nOptions:\n{option_text(rule)}"
+    description = clean_description(rule.get("description", "")) if rule else ""
+    full = f"{summary}\n\n{description}\n\nOptions:\n{option_text(rule)}" if description else options
+    return {"summary": summary, "options": options, "full": full}
+
+
+def views_path(directory):
+    return index_path(directory)[:-len("Index.json")] + "Views.json"
+
+
+def build_views(linter, language, directory, data_dir=DATA_DIR):
+    """生成该目录的 <LinterName>Views.json；full 视图只记录大小，文本读取时从规则文件生成"""
+    with open(index_path(directory), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    result = {}
+    for name, entry in index.items():
+        rule = load_rule(linter, name, language, data_dir)
+        views = make_views(name, entry, rule)
+        record = {}
+        for tier in TIERS:
+            text = views[tier]
+            record[tier] = {"bytes": len(text.encode("utf-8")), "tokens": count_tokens(text)}
+            if tier != "full":
+                record[tier]["text"] = text
+        result[name] = record
+    path = views_path(directory)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=4)
+    return path, result
+
+
+def load_views(linter, language=None, data_dir=DATA_DIR):
+    """
+    读取视图；不存在或旧于索引时先为该目录重新生成。
+    PMD / Biome 中同名规则出现在多个语言下，视图按规则名合并会互相覆盖，因此必须指定 language
+    """
+    dirs = [(lang, directory) for lang, directory in linter_dirs(linter, data_dir)
+            if not (language and lang and lang.lower() != language.lower())]
+    if len(dirs) > 1:
+        raise ValueError(f"{linter} 按语言分目录，请用 --language 指定: {', '.join(lang for lang, _ in dirs)}")
+    views = {}
+    with span("read views", "kb", linter=linter, language=language) as trace:
+        trace["bytes"] = 0
+        for lang, directory in dirs:
+            path = views_path(directory)
+            if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(index_path(directory)):
+                trace["rebuilt"] = True
+                views.update(build_views(linter, lang, directory, data_dir)[1])
+                continue
+            with open(path, 'rb') as f:
+                raw = f.read()
+            trace["bytes"] += len(raw)
+            views.update(json.loads(raw))
+    return views
+
+
+# --- 按预算组装 ---
+def plan_tiers(candidates, views, budget):
+    """
+    返回 {规则: 视图级别}。先按候选顺序给每条规则摘要（预算不够时后面的规则被丢弃），
+    再依次尝试把每条规则升级到 options、full；升级的增量放不下时保留当前级别。
+    """
+    plan, used = {}, 0
+    for name in candidates:
+        cost = views[name]["summary"]["tokens"]
+        if used + cost <= budget:
+            plan[name] = "summary"
+            used += cost
+    for tier in TIERS[1:]:
+        for name in candidates:
+            if name not in plan:
+                continue
+            extra = views[name][tier]["tokens"] - views[name][plan[name]]["tokens"]
+            if extra > 0 and used + extra <= budget:
+                plan[name] = tier
+                used += extra
+            elif extra <= 0:
+                plan[name] = tier
+    return plan, used
+
+
+def assemble(linter, candidates, budget, language=None, data_dir=DATA_DIR):
+    """返回 {"text", "tokens", "bytes", "rules": [{name, tier, tokens}], "dropped", "unknown"}"""
+    views = load_views(linter, language, data_dir)
+    unknown = [n for n in candidates if n not in views]
+    candidates = [n for n in dict.fromkeys(candidates) if n in views]
+    plan, used = plan_tiers(candidates, views, budget)
+
+    index = load_index(linter, language, data_dir) if any(t == "full" for t in plan.values()) else {}
+    blocks, rules = [], []
+    for name in candidates:
+        tier = plan.get(name)
+        if tier is None:
+            continue
+        if tier == "full":
+            text = make_views(name, index.get(name, {}), load_rule(linter, name, language, data_dir))["full"]
+        else:
+            text = views[name][tier]["text"]
+        blocks.append(text)
+        rules.append({"name": name, "tier": tier, "tokens": views[name][tier]["tokens"]})
+    text = "\n\n---\n\n".join(blocks)
+    return {
+        "text": text,
+        "tokens": used,
+        "bytes": len(text.encode("utf-8")),
+        "budget": budget,
+        "rules": rules,
+        "dropped": [n for n in candidates if n not in plan],
+        "unknown": unknown,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按 token 预算组装规则文档")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="为所有规则生成 summary / options / full 视图")
+    p_fetch = sub.add_parser("fetch", help="在预算内取一组候选规则的文档")
+    p_fetch.add_argument("--linter", required=True)
+    p_fetch.add_argument("--language", default=None)
+    p_fetch.add_argument("--budget", type=int, required=True, help="token 预算")
+    p_fetch.add_argument("--json", action="store_true", help="输出 JSON（含各规则的视图级别）")
+    p_fetch.add_argument("rules", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for linter in list_linters(args.data_dir):
+            for language, directory in linter_dirs(linter, args.data_dir):
+                path, views = build_views(linter, language, directory, args.data_dir)
+                totals = {t: sum(v[t]["tokens"] for v in views.values()) for t in TIERS}
+                print(f"{os.path.relpath(path, args.data_dir):<50}{len(views):>5} 条规则  "
+                      + "  ".join(f"{t} {totals[t] / max(1, len(views)):.0f}" for t in TIERS) + " tokens/条")
+        if not tiktoken:
+            print("\n未安装 tiktoken，token 数为估算值。")
+        return 0
+
+    try:
+        result = assemble(resolve_linter(args.linter), args.rules, args.budget, args.language, args.data_dir)
+    except ValueError as e:
+        print(f"错误: {e}")
+        return 2
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=4))
+        return 0
+    print(result["text"])
+    tiers = ", ".join(f"{r['name']}={r['tier']}" for r in result["rules"])
+    print(f"\n[{result['tokens']}/{result['budget']} tokens] {tiers}", file=sys.stderr)
+    if result["dropped"]:
+        print(f"[预算不足，未包含] {', '.join(result['dropped'])}", file=sys.stderr)
+    if result["unknown"]:
+        print(f"[不存在的规则] {', '.join(result['unknown'])}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
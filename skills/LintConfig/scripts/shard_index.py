@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+from kb import DATA_DIR, index_path, linter_dirs, list_linters
+
+# 按规则类别切分索引：每个类别一个分片 data/<LinterName>/[<Language>/]shards/<Category>.json，
+# 并生成顶层清单 data/CategoryManifest.json（类别说明、规则数、分片路径）。
+# Step 1 先读清单，只打开与编码规则相关的分片，而不是整个 100–300 KB 的索引。
+# 没有可用类别信息的 Linter（ESLint、Biome、Cppcheck、Reek）不切分，清单中指向完整索引。
+# 用法示例:
+# python scripts/shard_index.py
+# python scripts/shard_index.py --check
+
+MANIFEST_NAME = "CategoryManifest.json"
+SHARD_DIR = "shards"
+
+# --- 类别说明 ---
+CLANG_TIDY_MODULES = {
+    "abseil": "Checks related to the Abseil library.",
+    "altera": "Checks related to OpenCL programming for FPGAs.",
+    "android": "Checks related to Android.",
+    "boost": "Checks related to the Boost library.",
+    "bugprone": "Checks that target bug-prone code constructs.",
+    "cert": "Checks related to CERT Secure Coding Guidelines.",
+    "clang-analyzer": "Clang Static Analyzer checks.",
+    "concurrency": "Checks related to concurrent programming (including threads, fibers, coroutines, etc.).",
+    "cppcoreguidelines": "Checks related to C++ Core Guidelines.",
+    "darwin": "Checks related to Darwin coding conventions.",
+    "fuchsia": "Checks related to Fuchsia coding conventions.",
+    "google": "Checks related to Google coding conventions.",
+    "hicpp": "Checks related to High Integrity C++ Coding Standard.",
+    "linuxkernel": "Checks related to the Linux Kernel coding conventions.",
+    "llvm": "Checks related to the LLVM coding conventions.",
+    "llvmlibc": "Checks related to the LLVM-libc coding standards.",
+    "misc": "Checks that we didn't have a better category for.",
+    "modernize": "Checks that advocate usage of modern (currently \"modern\" means \"C++11\") language constructs.",
+    "mpi": "Checks related to MPI (Message Passing Interface).",
+    "objc": "Checks related to Objective-C coding conventions.",
+    "openmp": "Checks related to OpenMP API.",
+    "performance": "Checks that target performance-related issues.",
+    "portability": "Checks that target portability-related issues that don't relate to any particular coding style.",
+    "readability": "Checks that target readability-related issues that don't relate to any particular coding style.",
+    "zircon": "Checks related to Zircon kernel coding conventions.",
+}
+
+RUBOCOP_DEPARTMENTS = {
+    "Bundler": "Cops that check Gemfile and gems.rb.",
+    "Gemspec": "Cops that check .gemspec files.",
+    "Layout": "Cops that check whitespace, indentation and other formatting.",
+    "Lint": "Cops that check for possible errors and ambiguous or suspicious code.",
+    "Metrics": "Cops that check size and complexity metrics (method length, ABC size, ...).",
+    "Migration": "Cops that help migrating between RuboCop versions.",
+    "Naming": "Cops that check naming conventions.",
+    "Security": "Cops that check for security problems.",
+    "Style": "Cops that check stylistic consistency of the code.",
+}
+
+# Ruff 规则码前缀 -> 来源插件；按最长前缀匹配（C4 / C90、T10 / T20、PLC / PLE ...）
+RUFF_LINTERS = {
+    "AIR": "Airflow", "ERA": "eradicate", "FAST": "FastAPI", "YTT": "flake8-2020", "ANN": "flake8-annotations",
+    "ASYNC": "flake8-async", "S": "flake8-bandit", "BLE": "flake8-blind-except", "FBT": "flake8-boolean-trap",
+    "B": "flake8-bugbear", "A": "flake8-builtins", "COM": "flake8-commas", "C4": "flake8-comprehensions",
+    "CPY": "flake8-copyright", "DTZ": "flake8-datetimez", "T10": "flake8-debugger", "DJ": "flake8-django",
+    "EM": "flake8-errmsg", "EXE": "flake8-executable", "FIX": "flake8-fixme", "FA": "flake8-future-annotations",
+    "INT": "flake8-gettext", "ISC": "flake8-implicit-str-concat", "ICN": "flake8-import-conventions",
+    "LOG": "flake8-logging", "G": "flake8-logging-format", "INP": "flake8-no-pep420", "PIE": "flake8-pie",
+    "T20": "flake8-print", "PYI": "flake8-pyi", "PT": "flake8-pytest-style", "Q": "flake8-quotes",
+    "RSE": "flake8-raise", "RET": "flake8-return", "SLF": "flake8-self", "SIM": "flake8-simplify",
+    "SLOT": "flake8-slots", "TID": "flake8-tidy-imports", "TD": "flake8-todos", "TC": "flake8-type-checking",
+    "ARG": "flake8-unused-arguments", "PTH": "flake8-use-pathlib", "FLY": "flynt", "I": "isort",
+    "C90": "mccabe", "NPY": "NumPy-specific rules", "PD": "pandas-vet", "N": "pep8-naming", "PERF": "Perflint",
+    "E": "pycodestyle errors", "W": "pycodestyle warnings", "DOC": "pydoclint", "D": "pydocstyle",
+    "F": "Pyflakes", "PGH": "pygrep-hooks", "PLC": "Pylint conventions", "PLE": "Pylint errors",
+    "PLR": "Pylint refactoring suggestions", "PLW": "Pylint warnings", "UP": "pyupgrade", "FURB": "refurb",
+    "RUF": "Ruff-specific rules", "TRY": "tryceratops",
+}
+
+PYLINT_CLASSES = {
+    "C": "Convention: coding standard violations.",
+    "R": "Refactor: bad code smells.",
+    "W": "Warning: Python-specific problems.",
+    "E": "Error: probable bugs in the code.",
+    "F": "Fatal: errors that prevented further processing.",
+    "I": "Informational messages.",
+}
+
+FLAKE8_CLASSES = {
+    "E": "pycodestyle errors.",
+    "W": "pycodestyle warnings.",
+    "F": "Pyflakes checks.",
+    "C": "mccabe complexity (C901).",
+}
+
+PMD_CATEGORIES = {
+    "bestpractices": "Rules which enforce generally accepted best practices.",
+    "codestyle": "Rules which enforce a specific coding style.",
+    "design": "Rules that help you discover design issues.",
+    "documentation": "Rules that are related to code documentation.",
+    "errorprone": "Rules to detect constructs that are either broken, extremely confusing or prone to runtime errors.",
+    "multithreading": "Rules that flag issues when dealing with multiple threads of execution.",
+    "performance": "Rules that flag suboptimal code.",
+    "security": "Rules that flag potential security flaws.",
+}
+
+CHECKSTYLE_CATEGORIES = {
+    "annotation": "Checks for annotation usage and placement.",
+    "blocks": "Checks for code blocks and braces.",
+    "coding": "Checks for common coding problems.",
+    "design": "Checks for class design.",
+    "header": "Checks for file headers.",
+    "imports": "Checks for import statements.",
+    "javadoc": "Checks for Javadoc comments.",
+    "metrics": "Checks for code metrics (complexity, coupling, ...).",
+    "misc": "Miscellaneous checks.",
+    "modifier": "Checks for modifiers and their order.",
+    "naming": "Checks for naming conventions.",
+    "regexp": "Regular-expression based checks.",
+    "sizes": "Checks for size limits (line length, method length, ...).",
+    "whitespace": "Checks for whitespace and line wrapping.",
+}
+
+
+# --- 规则 -> 类别 ---
+def ruff_prefix(code):
+    letters = re.match(r'[A-Z]+', code)
+    for length in range(len(code), 0, -1):
+        if code[:length] in RUFF_LINTERS:
+            return code[:length]
+    return letters.group() if letters else None
+
+
+def category_of(linter, name, entry):
+    """返回规则所属类别；无法归类时返回 None"""
+    url = entry.get("url") or entry.get("ruleurl") or ""
+    if linter == "ClangTidy":
+        return "clang-analyzer" if name.startswith("clang-analyzer-") else name.split("-")[0]
+    if linter == "RuboCop":
+        return name.split("/")[0] if "/" in name else None
+    if linter == "Ruff":
+        return ruff_prefix(name)
+    if linter in ("Pylint", "Flake8"):
+        return name[0]
+    if linter == "PMD":
+        m = re.search(r'pmd_rules_[a-z]+_([a-z]+)\.html', url)
+        return m.group(1) if m else None
+    if linter == "Checkstyle":
+        m = re.search(r'/checks/([a-z]+)/', url)
+        return m.group(1) if m else None
+    return None
+
+
+def describe(linter, category):
+    table = {
+        "ClangTidy": CLANG_TIDY_MODULES, "RuboCop": RUBOCOP_DEPARTMENTS, "Ruff": RUFF_LINTERS,
+        "Pylint": PYLINT_CLASSES, "Flake8": FLAKE8_CLASSES, "PMD": PMD_CATEGORIES,
+        "Checkstyle": CHECKSTYLE_CATEGORIES,
+    }.get(linter, {})
+    return table.get(category, "")
+
+
+def relative(path, data_dir):
+    return os.path.relpath(path, data_dir).replace(os.sep, "/")
+
+
+def build_shards(linter, language, directory, data_dir):
+    """为一个索引生成分片，返回清单条目"""
+    source = index_path(directory)
+    with open(source, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    shards = {}
+    for name, entry in index.items():
+        category = category_of(linter, name, entry)
+        if category is None:
+            # 任意一条规则无法归类则不切分，避免漏掉规则
+            shards = None
+            break
+        shards.setdefault(category, {})[name] = entry
+
+    record = {"index": relative(source, data_dir), "index_bytes": os.path.getsize(source), "rules": len(index)}
+    if language:
+        record["language"] = language
+    if not shards:
+        record["categories"] = None
+        return record
+
+    shard_dir = os.path.join(directory, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    expected = set()
+    categories = {}
+    for category in sorted(shards):
+        path = os.path.join(shard_dir, f"{category}.json")
+        expected.add(os.path.basename(path))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(shards[category], f, ensure_ascii=False, indent=4)
+        categories[category] = {
+            "description": describe(linter, category),
+            "rules": len(shards[category]),
+            "bytes": os.path.getsize(path),
+            "shard": relative(path, data_dir),
+        }
+    # 清理上游已删除类别的旧分片
+    for stale in set(os.listdir(shard_dir)) - expected:
+        os.remove(os.path.join(shard_dir, stale))
+    record["categories"] = categories
+    return record
+
+
+def build_manifest(data_dir):
+    manifest = {}
+    for linter in list_linters(data_dir):
+        for language, directory in linter_dirs(linter, data_dir):
+            key = f"{linter}/{language}" if language else linter
+            manifest[key] = build_shards(linter, language, directory, data_dir)
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+    return path, manifest
+
+
+def check_manifest(data_dir):
+    """分片是否与当前索引一致（规则集合相同），返回不一致的 Linter 列表"""
+    path = os.path.join(data_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return ["<manifest missing>"]
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    stale = []
+    for key, record in manifest.items():
+        with open(os.path.join(data_dir, record["index"]), 'r', encoding='utf-8') as f:
+            names = set(json.load(f))
+        if not record["categories"]:
+            continue
+        sharded = set()
+        for info in record["categories"].values():
+            shard = os.path.join(data_dir, info["shard"])
+            if not os.path.exists(shard):
+                stale.append(key)
+                break
+            with open(shard, 'r', encoding='utf-8') as f:
+                sharded |= set(json.load(f))
+        else:
+            if sharded != names:
+                stale.append(key)
+    return stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按类别切分规则索引并生成类别清单")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--check", action="store_true", help="只检查分片是否与索引一致")
+    args = parser.parse_args()
+
+    if args.check:
+        stale = check_manifest(args.data_dir)
+        for key in stale:
+            print(f"  [Stale] {key}")
+        print("分片与索引一致。" if not stale else "请重新运行 shard_index.py。")
+        return 1 if stale else 0
+
+    path, manifest = build_manifest(args.data_dir)
+    for key, record in manifest.items():
+        if not record["categories"]:
+            print(f"{key:<32}{record['rules']:>5} 条规则，未切分")
+            continue
+        largest = max(c["bytes"] for c in record["categories"].values())
+        print(f"{key:<32}{record['rules']:>5} 条规则 -> {len(record['categories']):>3} 个分片，"
+              f"索引 {record['index_bytes'] / 1024:.1f} KB，最大分片 {largest / 1024:.1f} KB")
+    print(f"\n类别清单已保存至: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
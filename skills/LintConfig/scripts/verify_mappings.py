@@ -0,0 +1,538 @@
+import argparse
+import ast
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import tokenize
+
+from kb import DATA_DIR, index_path, linter_dirs, load_index, load_rule
+from lint_runner import OUTPUT_DIR, lint_template, resolve_linter, run_linter
+from monorepo import discover_configs
+from profile_config import enabled_rules
+
+# 用规则文档中的正反例验证映射表中的覆盖关系声明（Exact Match / Over-Approximation / Under-Approximation）。
+# build : 知识库构建时从规则文档提取示例语料，保存为 <LinterName>Examples.json（与索引同目录）
+#   ESLint     "Examples of incorrect / correct code" 中的每个代码段（行内 /*eslint rule: [...]*/ 记为该示例对应的选项），
+#              用 node 的解析器检查，module / script 两种模式都无法解析的丢弃
+#   ClangTidy  "Before: / After:" 与 "Example ... transforms to:" 成对的代码（不含 // 注释），按用到的 std:: 名补上头文件，
+#              用本机 C++ 编译器 (-fsyntax-only) 检查，仍无法编译的（如使用文档中未声明的类型）丢弃。
+#              文档中成对的示例很少（目前只有 7 条规则有示例），ClangTidy 的声明绝大多数只能报告为 unverified
+#   Ruff       "Example ... Use instead: ..."（知识库中的文本已被压成一行，只保留仍能解析、且没有被压进同一行的
+#              # 注释吞掉后续代码的 Python 示例）
+#   没有 node / C++ 编译器时不做解析检查，保留全部示例
+# verify: 对每个生成的配置，把启用规则的全部示例写入临时目录，每个 Linter 只调用一次 lint_runner 批量检查，
+#   示例与配置的选项都先按规则的默认选项补全再比较（"error" 与 ["error", "always"] 等价），选项不同的示例跳过。
+#   再按声明比较：应报告的反例没有报告（漏报）与不应报告的正例被报告（误报）即为与声明矛盾。
+#   Exact Match 两者都不允许；Over-Approximation 允许误报；Under-Approximation 允许漏报。
+#   Linter 对示例报告解析错误 (parse-error / syntax-error / clang-diagnostic-error) 时，该示例记为无法验证，不算漏报或误报。
+#   映射表中在知识库里找不到的规则名单独列出。
+# 用法示例:
+# python scripts/verify_mappings.py build
+# python scripts/verify_mappings.py verify --config ESLint=output/ESLintConfig.json --claims output/RULE_MAPPING_TABLE.txt
+# python scripts/verify_mappings.py verify --config Ruff=output/ruff.toml --config ClangTidy=output/.clang-tidy
+
+# --- 配置 ---
+LABELS = {"invalid": "Invalid Configuration", "exact": "Exact Match", "over": "Over-Approximation",
+          "under": "Under-Approximation", "mismatch": "Mismatches"}
+# 各声明下不允许出现的偏差；没有声明的规则按文档行为（等同 Exact Match）检查
+FORBIDDEN = {"Exact Match": {"missed", "false_positive"}, "Over-Approximation": {"missed"},
+             "Under-Approximation": {"false_positive"}, None: {"missed", "false_positive"}}
+EXTENSIONS = {"ESLint": ".js", "ClangTidy": ".cpp", "Ruff": ".py"}
+COLLAPSED_LINES = re.compile(r'[(\[{] \S|\S [)\]}]')
+RUFF_SECTIONS = r'Fix safety|Options|References|Known problems|Error suppression|Notes?|Preview|Formatter compatibility'
+# ESLint 文档中每个代码段以配置注释开头
+ESLINT_BLOCK_START = re.compile(r'/\*\s*(?:eslint|global|globals|exported)\s')
+# 规则的默认选项：npm 包导入的知识库中是 meta.defaultOptions 的 JSON，爬取的文档中是 "always"(default) 一类的说明
+ESLINT_DEFAULTS_HEADER = "Default options:\n"
+ESLINT_DEFAULT_STRING = re.compile(r'"([\w-]+)"\s*(?:option\s*)?\(default\)|default\s*"([\w-]+)"\s*option')
+# 在 module 与 script 两种模式下解析 stdin 中的 JSON 代码列表，输出每段代码能否解析
+NODE_PARSE = """
+const vm = require("vm");
+const codes = JSON.parse(require("fs").readFileSync(0, "utf8"));
+console.log(JSON.stringify(codes.map(code => [c => new vm.SourceTextModule(c), c => new vm.Script(c)].some(parse => {
+    try { parse(code); return true; } catch (e) { return false; }
+}))));
+"""
+CXX_COMPILERS = ("clang++", "g++", "c++")
+# 示例中用到的 std:: 名 -> 头文件；文档中的示例通常省略 #include
+CPP_HEADERS = {
+    "vector": "vector", "string": "string", "wstring": "string", "to_string": "string", "string_view": "string_view",
+    "map": "map", "multimap": "map", "set": "set", "unordered_map": "unordered_map", "unordered_set": "unordered_set",
+    "list": "list", "deque": "deque", "array": "array", "pair": "utility", "make_pair": "utility",
+    "move": "utility", "forward": "utility", "swap": "utility", "tuple": "tuple", "make_tuple": "tuple",
+    "unique_ptr": "memory", "shared_ptr": "memory", "weak_ptr": "memory", "make_unique": "memory",
+    "make_shared": "memory", "auto_ptr": "memory", "optional": "optional", "function": "functional",
+    "bind": "functional", "mutex": "mutex", "lock_guard": "mutex", "unique_lock": "mutex", "thread": "thread",
+    "cout": "iostream", "cerr": "iostream", "endl": "iostream", "ostream": "ostream", "istream": "istream",
+    "stringstream": "sstream", "ostringstream": "sstream", "sort": "algorithm", "find": "algorithm",
+    "find_if": "algorithm", "remove_if": "algorithm", "min": "algorithm", "max": "algorithm",
+    "accumulate": "numeric", "size_t": "cstddef", "nullptr_t": "cstddef", "int32_t": "cstdint",
+    "int64_t": "cstdint", "uint8_t": "cstdint", "uint32_t": "cstdint", "uint64_t": "cstdint",
+    "memcpy": "cstring", "memset": "cstring", "strlen": "cstring", "strcmp": "cstring", "printf": "cstdio",
+    "abs": "cstdlib", "atoi": "cstdlib", "malloc": "cstdlib", "free": "cstdlib", "sqrt": "cmath",
+    "pow": "cmath", "exception": "exception", "runtime_error": "stdexcept", "numeric_limits": "limits",
+    "atomic": "atomic", "chrono": "chrono", "initializer_list": "initializer_list",
+}
+# Linter 报告这些规则时示例本身无法解析，不能用来判断被验证规则的行为
+PARSE_ERRORS = {"parse-error", "syntax-error", "clang-diagnostic-error", "E999"}
+
+
+def examples_path(directory):
+    return index_path(directory)[:-len("Index.json")] + "Examples.json"
+
+
+# --- 提取示例 ---
+def rule_text(rule):
+    option = rule.get("option") if rule else None
+    return (rule.get("description") or "" if rule else "") + ("\n\n" + option if isinstance(option, str) else "")
+
+
+def eslint_options(comment_value):
+    """'["error", "multi"]' -> ["multi"]；'"error"' -> []；无法解析时返回 None"""
+    text = re.sub(r"'([^'\\]*)'", r'"\1"', comment_value.strip())
+    text = re.sub(r'([{,]\s*)([A-Za-z_$][\w$]*)\s*:', r'\1"\2":', text)
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return value[1:] if isinstance(value, list) else []
+
+
+def eslint_default_options(text):
+    """规则的默认选项列表：优先取从 npm 包导入的 meta.defaultOptions；否则取文档中标为 (default) 的字符串选项，
+    对象属性的默认值（如 "mode": "strict" (default)）不算；都没有时返回 []"""
+    header = text.find(ESLINT_DEFAULTS_HEADER)
+    if header >= 0:
+        try:
+            value = json.JSONDecoder().raw_decode(text[header + len(ESLINT_DEFAULTS_HEADER):].lstrip())[0]
+            return value if isinstance(value, list) else []
+        except json.JSONDecodeError:
+            pass
+    for m in ESLINT_DEFAULT_STRING.finditer(text):
+        if not text[:m.start()].rstrip().endswith(":"):
+            return [m.group(1) or m.group(2)]
+    return []
+
+
+def with_defaults(options, defaults):
+    """按位置用默认选项补全：省略的位置取默认值，对象选项在默认对象上合并；"error" 与 ["error", "always"] 因此相等"""
+    if options is None:
+        return None
+    result = list(options)
+    for i, default in enumerate(defaults):
+        if i >= len(result):
+            result.append(default)
+        elif isinstance(default, dict) and isinstance(result[i], dict):
+            result[i] = {**default, **result[i]}
+    return result
+
+
+def looks_like_prose(paragraph):
+    """代码段之后的说明文字或选项标题（如 "multi"、“never”、"hoist: functions"、"enums (TypeScript only)"）；多行段落按第一行判断"""
+    if re.fullmatch(r'“?[A-Za-z][\w ,:-]*”?(?: \([\w ]+\))?', paragraph):
+        return True
+    first = paragraph.split("\n")[0]
+    return len(first.split()) >= 4 and re.fullmatch(r'[A-Z][^;{}=<>]*[.:?]', first) is not None
+
+
+def eslint_blocks(body):
+    """把一个小节拆成各个代码段：新的配置注释段落开始一个代码段，遇到说明文字结束"""
+    blocks, header = [], False
+    for paragraph in body.split("\n\n"):
+        if looks_like_prose(paragraph.strip()):
+            break
+        starts = ESLINT_BLOCK_START.match(paragraph.strip()) is not None
+        if not blocks or (starts and not header):
+            blocks.append([])
+        blocks[-1].append(paragraph)
+        header = starts
+    return ["\n\n".join(block) for block in blocks]
+
+
+def extract_eslint(name, text):
+    examples = []
+    sections = re.split(r'\n\n(?=Examples? of\s*(?:incorrect|correct))', text)
+    for section in sections:
+        m = re.match(r'Examples? of\s*(incorrect|correct)\s*(\w*?)\s*code[^\n]*:\n\n(.*)', section, re.DOTALL)
+        if not m or m.group(2):  # TypeScript / JSX 示例需要额外的解析器配置
+            continue
+        kind = m.group(1)
+        # 同一小节的多个代码段在文档中是相互独立的文件，合并后会出现重复声明
+        for code in eslint_blocks(m.group(3)):
+            options = []
+            comment = re.search(rf'/\*\s*eslint\s+{re.escape(name)}\s*:\s*(.*?)\*/', code, re.DOTALL)
+            if comment:
+                options = eslint_options(comment.group(1))
+            # 行内配置会覆盖被验证的配置，去掉后由 options 决定示例是否适用
+            code = re.sub(r'/\*\s*eslint\s+[^*]*\*/\n?', '', code).strip()
+            if code:
+                examples.append({"kind": kind, "code": code + "\n", "options": options})
+    return examples
+
+
+def js_parses(codes):
+    """用 node 的解析器检查示例（一次进程）；没有 node 时返回 None"""
+    if not shutil.which("node"):
+        return None
+    proc = subprocess.run(["node", "--experimental-vm-modules", "--no-warnings", "-e", NODE_PARSE],
+                          input=json.dumps(codes), capture_output=True, text=True, encoding="utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(f"node 解析检查失败: {proc.stderr.strip()[:200]}")
+    return json.loads(proc.stdout)
+
+
+def join_tokens(block):
+    """ClangTidy 文档中的代码被拆成每行一个记号；预处理指令单独成行"""
+    lines, current = [], []
+    for token in (t.strip() for t in block.splitlines()):
+        if not token:
+            continue
+        if token.startswith("#"):
+            if current:
+                lines.append(" ".join(current))
+                current = []
+            lines.append(token)
+        else:
+            current.append(token)
+    if current:
+        lines.append(" ".join(current))
+    return "\n".join(lines)
+
+
+def balanced(code):
+    return all(code.count(a) == code.count(b) for a, b in ("()", "{}", "[]")) and code.rstrip()[-1:] in (";", "}")
+
+
+def wrap_statements(code):
+    """只有语句、没有函数定义的示例放进一个函数体，否则在文件作用域无法编译"""
+    if "{" in code or code.lstrip().startswith("#"):
+        return code
+    return "void lintconfig_example() {\n" + code + "\n}"
+
+
+def add_includes(code):
+    """按示例中用到的 std:: 名补上头文件"""
+    headers = sorted({CPP_HEADERS[n] for n in re.findall(r'\bstd\s*::\s*(\w+)', code) if n in CPP_HEADERS})
+    return "".join(f"#include <{h}>\n" for h in headers) + code
+
+
+def cpp_compiles(codes):
+    """用本机 C++ 编译器做语法与语义检查（-fsyntax-only）；没有编译器时返回 None"""
+    compiler = next((c for c in CXX_COMPILERS if shutil.which(c)), None)
+    if compiler is None:
+        return None
+    return [subprocess.run([compiler, "-fsyntax-only", "-std=c++17", "-x", "c++", "-"], input=code,
+                           capture_output=True, text=True).returncode == 0 for code in codes]
+
+
+def extract_clang_tidy(name, text):
+    description = text.split("\n\nOptions\n")[0]
+    pairs = re.findall(r'(?:^|\n)Before:\n(.*?)\n\s*After:\n(.*?)(?=\n\n|\Z)', description, re.DOTALL)
+    pairs += re.findall(r'(?:^|\n)Example\n(.*?)\ntransforms to:\n(.*?)(?=\n\n|\Z)', description, re.DOTALL)
+    examples = []
+    for before, after in pairs:
+        before, after = wrap_statements(join_tokens(before)), wrap_statements(join_tokens(after))
+        # 记号拼回一行后，// 注释会吞掉其后的全部代码
+        if balanced(before) and balanced(after) and "//" not in before + after:
+            examples.append({"kind": "incorrect", "code": add_includes(before) + "\n", "options": []})
+            examples.append({"kind": "correct", "code": add_includes(after) + "\n", "options": []})
+    return examples
+
+
+def parses(code):
+    try:
+        ast.parse(code)
+    except SyntaxError:
+        return False
+    return True
+
+
+def has_comment(code):
+    """压成一行后，# 注释会吞掉同一行中其后的全部代码"""
+    try:
+        return any(t.type == tokenize.COMMENT for t in tokenize.generate_tokens(iter([code]).__next__))
+    except (tokenize.TokenError, SyntaxError):
+        return True
+
+
+def extract_ruff(name, text):
+    m = re.search(rf'\bExample (.*?) Use instead: (.*?)(?= (?:{RUFF_SECTIONS})\b|$)', text, re.DOTALL)
+    if not m:
+        return []
+    # "( param1, ..." 说明原本的换行被压掉了，这样的示例对排版类规则没有意义
+    return [{"kind": kind, "code": code.strip() + "\n", "options": []}
+            for kind, code in (("incorrect", m.group(1)), ("correct", m.group(2)))
+            if parses(code) and not COLLAPSED_LINES.search(code) and not has_comment(code)]
+
+
+EXTRACTORS = {"ESLint": extract_eslint, "ClangTidy": extract_clang_tidy, "Ruff": extract_ruff}
+# 构建语料时的解析检查：[code] -> [是否可解析]，工具不可用时返回 None（Ruff 在提取时已用 ast 检查）
+PARSE_CHECKS = {"ESLint": js_parses, "ClangTidy": cpp_compiles}
+
+
+def build_examples(linter, language, directory, data_dir=DATA_DIR):
+    """生成该目录的 <LinterName>Examples.json: {规则: [{"kind", "code", "options"}]}"""
+    with open(index_path(directory), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    extracted = [(name, example) for name in index
+                 for example in EXTRACTORS[linter](name, rule_text(load_rule(linter, name, language, data_dir)))]
+    check = PARSE_CHECKS.get(linter)
+    valid = check([example["code"] for _, example in extracted]) if check and extracted else None
+    if valid is None and check and extracted:
+        print(f"  [Warn] {linter}: 没有可用的解析器，示例未做解析检查")
+    corpus = {}
+    for i, (name, example) in enumerate(extracted):
+        if valid is None or valid[i]:
+            corpus.setdefault(name, []).append(example)
+    path = examples_path(directory)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=4)
+    return path, corpus
+
+
+def load_examples(linter, data_dir=DATA_DIR):
+    """读取示例语料；不存在或旧于索引时先重新生成。没有提取器的 Linter 返回空语料"""
+    corpus = {}
+    if linter not in EXTRACTORS:
+        return corpus
+    for lang, directory in linter_dirs(linter, data_dir):
+        path = examples_path(directory)
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(index_path(directory)):
+            corpus.update(build_examples(linter, lang, directory, data_dir)[1])
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.update(json.load(f))
+    return corpus
+
+
+# --- 覆盖关系声明 ---
+def normalize_label(text):
+    text = text.strip().lower()
+    return next((label for prefix, label in LABELS.items() if text.startswith(prefix)), None)
+
+
+def parse_claims(path, linter):
+    """
+    解析 RULE_MAPPING_TABLE.txt 这类表格: 表头含 CODING RULE / <LINTER> RULE / COVERAGE，
+    每行以序号开头，单元格可以折行。返回 ({Linter 规则名: [{"no", "coding_rule", "coverage"}]},
+    {知识库中没有的规则名: [序号]})
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    known = set(load_index(linter))
+    columns, rows = None, []
+    for line in lines:
+        cells = [c.strip() for c in line.split("|")]
+        if columns is None:
+            upper = [c.upper() for c in cells]
+            if "COVERAGE" in upper and "CODING RULE" in upper:
+                rule_col = next(i for i, c in enumerate(upper) if c.endswith("RULE") and c != "CODING RULE")
+                columns = {"coding": upper.index("CODING RULE"), "rule": rule_col, "coverage": upper.index("COVERAGE")}
+            continue
+        if len(cells) <= max(columns.values()):
+            continue
+        if re.fullmatch(r'\d+', cells[0]):
+            rows.append({"no": int(cells[0]), **{k: [cells[i]] for k, i in columns.items()}})
+        elif not cells[0] and rows and not set(line) <= set("-|= "):
+            for key, i in columns.items():
+                rows[-1][key].append(cells[i])
+
+    claims, unknown = {}, {}
+    for row in rows:
+        coverage = normalize_label(" ".join(row["coverage"]))
+        coding_rule = " ".join(c for c in row["coding"] if c)
+        cell = " ".join(c for c in row["rule"] if c)
+        if re.fullmatch(r'(?i)not available|n/?a|none|-*', cell):
+            continue
+        names = [piece.split(".")[0] for piece in re.split(r'[,\s]+', cell) if piece]
+        while names:
+            name = names.pop(0)
+            # 折行的单元格会把一个长规则名拆成两段
+            if name not in known and names and name + names[0] in known:
+                name += names.pop(0)
+            if name in known:
+                claims.setdefault(name, []).append({"no": row["no"], "coding_rule": coding_rule, "coverage": coverage})
+            else:
+                unknown.setdefault(name, []).append(row["no"])
+    return claims, unknown
+
+
+# --- 验证 ---
+def eslint_rules(config):
+    """ESLint 配置 (.eslintrc JSON) 中启用的规则 -> 选项列表"""
+    with open(config, 'r', encoding='utf-8') as f:
+        rules = json.load(f).get("rules", {})
+    result = {}
+    for name, value in rules.items():
+        level = value[0] if isinstance(value, list) else value
+        if level not in ("off", 0):
+            result[name] = value[1:] if isinstance(value, list) else []
+    return result
+
+
+def configured_rules(linter, config):
+    if linter == "ESLint":
+        return eslint_rules(config)
+    # 其他 Linter 的示例不带选项，只需要规则是否启用
+    return {name: None for name in enabled_rules(linter, config)}
+
+
+def default_options(linter, names, data_dir=DATA_DIR):
+    """{规则: 默认选项列表}；只有 ESLint 的示例带选项"""
+    if linter != "ESLint":
+        return {}
+    return {name: eslint_default_options(rule_text(load_rule(linter, name, data_dir=data_dir))) for name in names}
+
+
+def select_examples(configured, corpus, claims, defaults=None):
+    """返回 ([(规则, 示例)], {规则: 因选项不同而跳过的示例数})；两边的选项都先用规则的默认选项补全再比较"""
+    defaults = defaults or {}
+    selected, skipped = [], {}
+    for name in sorted(set(configured) | set(claims)):
+        options = with_defaults(configured.get(name), defaults.get(name, []))
+        for example in corpus.get(name, []):
+            example_options = with_defaults(example["options"], defaults.get(name, []))
+            if name in configured and (options is None or example_options == options):
+                selected.append((name, example))
+            else:
+                skipped[name] = skipped.get(name, 0) + 1
+    return selected, skipped
+
+
+def lint_examples(linter, config, selected):
+    """把所有示例写入一个临时目录，只调用一次 run_linter；返回每个示例报告的规则集合"""
+    workdir = tempfile.mkdtemp(prefix="lintconfig-examples-")
+    try:
+        files = []
+        for i, (_, example) in enumerate(selected):
+            path = os.path.join(workdir, f"example_{i:05d}{EXTENSIONS[linter]}")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(example["code"])
+            files.append(path)
+        violations = run_linter(linter, config, files) if files else []
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    reported = [set() for _ in selected]
+    for v in violations:
+        m = re.match(r'example_(\d+)\.', os.path.basename(v["file"]))
+        if m and int(m.group(1)) < len(reported):
+            reported[int(m.group(1))].add(v["rule"])
+    return reported
+
+
+def verify(linter, config, claims, data_dir=DATA_DIR, unknown=None):
+    configured = configured_rules(linter, config)
+    corpus = load_examples(linter, data_dir)
+    defaults = default_options(linter, [name for name in corpus if name in configured], data_dir)
+    selected, skipped = select_examples(configured, corpus, claims, defaults)
+    executable = lint_template(linter)[0]
+    if selected and not shutil.which(executable):
+        raise RuntimeError(f"未安装 {executable}，无法检查 {len(selected)} 个示例")
+    reported = lint_examples(linter, config, selected)
+
+    results = {}
+    for name in sorted(set(configured) | set(claims)):
+        rule_claims = claims.get(name, [])
+        results[name] = {"claims": rule_claims, "enabled": name in configured,
+                         "incorrect": {"total": 0, "flagged": 0}, "correct": {"total": 0, "flagged": 0},
+                         "skipped_for_options": skipped.get(name, 0), "unverifiable": 0, "contradictions": []}
+    for (name, example), rules in zip(selected, reported):
+        result = results[name]
+        if rules & PARSE_ERRORS:
+            result["unverifiable"] += 1
+            continue
+        flagged = name in rules
+        result[example["kind"]]["total"] += 1
+        result[example["kind"]]["flagged"] += flagged
+        deviation = "missed" if example["kind"] == "incorrect" and not flagged else \
+            "false_positive" if example["kind"] == "correct" and flagged else None
+        if deviation is None:
+            continue
+        for claim in result["claims"] or [{"no": None, "coding_rule": None, "coverage": None}]:
+            if deviation in FORBIDDEN.get(claim["coverage"], set()):
+                result["contradictions"].append({"deviation": deviation, "claim": claim["coverage"],
+                                                 "coding_rule_no": claim["no"], "code": example["code"]})
+
+    for name, result in results.items():
+        claimed = [c for c in result["claims"] if c["coverage"] in FORBIDDEN]
+        if claimed and not result["enabled"]:
+            result["verdict"] = "not_enabled"
+        elif result["contradictions"]:
+            result["verdict"] = "contradicted"
+        elif result["incorrect"]["total"] + result["correct"]["total"] == 0:
+            result["verdict"] = "unverifiable" if result["unverifiable"] else "unverified"
+        else:
+            result["verdict"] = "consistent"
+    return {"linter": linter, "config": config, "examples": len(selected), "rules": results,
+            "unknown_claims": unknown or {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用规则文档中的示例验证映射表的覆盖关系声明")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="从规则文档提取示例语料")
+    p.add_argument("--data-dir", default=DATA_DIR)
+    p = sub.add_parser("verify", help="用示例验证生成的配置")
+    p.add_argument("--config", action="append", default=[], metavar="LINTER=PATH")
+    p.add_argument("--config-dir", default=OUTPUT_DIR, help="自动查找 <LinterName>Config.* 的目录")
+    p.add_argument("--claims", default=None, help="映射表，如 output/RULE_MAPPING_TABLE.txt")
+    p.add_argument("--data-dir", default=DATA_DIR)
+    p.add_argument("--output", default=None, help="默认 output/<LinterName>MappingVerification.json")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for linter in EXTRACTORS:
+            for language, directory in linter_dirs(linter, args.data_dir):
+                path, corpus = build_examples(linter, language, directory, args.data_dir)
+                kinds = [e["kind"] for examples in corpus.values() for e in examples]
+                print(f"{os.path.relpath(path, args.data_dir):<40}{len(corpus):>5} 条规则  "
+                      f"反例 {kinds.count('incorrect')}  正例 {kinds.count('correct')}")
+        return 0
+
+    # 显式指定 --config 时只验证这些配置
+    configs = discover_configs(args.config_dir, []) if not args.config else \
+        {resolve_linter(name): path for name, _, path in (item.partition("=") for item in args.config)}
+    if not configs:
+        print("没有找到任何 Linter 配置，请先生成配置或使用 --config 指定。")
+        return 2
+    contradicted = 0
+    for linter, config in configs.items():
+        try:
+            claims, unknown = parse_claims(args.claims, linter) if args.claims else ({}, {})
+            report = verify(linter, config, claims, args.data_dir, unknown)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"错误: {linter}: {e}")
+            contradicted += 1
+            continue
+        output = args.output if args.output and len(configs) == 1 else \
+            os.path.join(OUTPUT_DIR, f"{linter}MappingVerification.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+        verdicts = [r["verdict"] for r in report["rules"].values()]
+        summary = "，".join(f"{v} {verdicts.count(v)}" for v in sorted(set(verdicts)))
+        if linter in EXTRACTORS:
+            print(f"{linter}: {report['examples']} 个示例，一次批量检查；{summary}")
+        else:
+            print(f"{linter}: 知识库中没有示例，只检查声明的规则是否启用；{summary}")
+        for name, rows in report["unknown_claims"].items():
+            print(f"  {name}: 映射表（序号 {', '.join(map(str, rows))}）中的规则名在知识库中不存在，未验证")
+        for name, result in report["rules"].items():
+            if result["verdict"] == "not_enabled":
+                print(f"  {name}: 映射表声明 {', '.join(c['coverage'] for c in result['claims'])}，但配置中未启用")
+            for c in result["contradictions"]:
+                what = "反例未报告" if c["deviation"] == "missed" else "正例被报告"
+                rule_no = f"（编码规则 {c['coding_rule_no']}）" if c["coding_rule_no"] else ""
+                print(f"  {name}: 声明 {c['claim'] or '未声明'}{rule_no}，但{what}: {c['code'].strip()[:60]!r}")
+            contradicted += result["verdict"] in ("contradicted", "not_enabled")
+        print(f"报告: {output}")
+    return 1 if contradicted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+import argparse
+import datetime
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+
+from kb import DATA_DIR, index_path, linter_dirs, sanitize_filename, unwrap_rule
+
+# 多版本知识库：同一 Linter 的不同发布版本保存为 "基准快照 + 各版本增量"，存放在该 Linter（或语言子目录）的 versions.json.gz 中。
+#   - 基准快照是第一次记录的版本的完整索引与规则文件；其余每个版本只保存相对基准新增 / 修改 / 删除的索引条目与规则文件，
+#     因此查询任意版本的一条规则只需一次增量查找，不需要逐版本回放
+#   - current 记录 data/ 中当前文件对应的版本（snapshot 时未指定 --from 即表示当前数据就是该版本）
+#   - diff 列出两个版本之间新增、删除、修改的规则，以及修改的规则中新增、删除、修改的配置项
+# 用法示例:
+# python scripts/versioned_kb.py snapshot Cppcheck 2.18.0
+# python scripts/versioned_kb.py snapshot Checkstyle 10.12.0 --from build/kb/Checkstyle
+# python scripts/versioned_kb.py list Checkstyle
+# python scripts/versioned_kb.py show Checkstyle MissingJavadocType --version 10.12.0
+# python scripts/versioned_kb.py diff Checkstyle 10.12.0 10.20.1
+# python scripts/versioned_kb.py export PMD/Java 6.55.0 /tmp/pmd-6.55.0
+
+# --- 配置 ---
+STORE_NAME = "versions.json.gz"
+STORE_FORMAT = 1
+# 文本格式 option 中可以识别出配置项名的行: "name, desc, type, default"、"Name\tType..."、"Key: value (type: ...)"
+OPTION_LINE = re.compile(r'^([A-Za-z_][\w.-]*)(?:\t|, |: )')
+
+
+def version_key(version):
+    """10.20.1 > 10.9.0；数字段按数值比较，字母段（rc、beta）排在同位置的数字之前"""
+    return [(1, int(p), "") if p.isdigit() else (0, 0, p) for p in re.findall(r'\d+|[A-Za-z]+', version)]
+
+
+def target_dir(target, data_dir=DATA_DIR):
+    """Checkstyle -> data/Checkstyle；PMD/Java、Biome/JavaScript -> 语言子目录"""
+    linter, _, language = target.partition("/")
+    for lang, directory in linter_dirs(linter, data_dir):
+        if lang is None or (language and lang.lower() == language.lower()):
+            return directory
+    raise ValueError(f"知识库中没有 {target}（按语言分目录的 Linter 需写成 Linter/Language）")
+
+
+def read_snapshot(directory):
+    """读取一个知识库目录: (索引文件名, 索引, {规则文件名(不含 .json): 文件内容})"""
+    path = index_path(directory)
+    if path is None:
+        raise ValueError(f"{directory} 中没有 *Index.json")
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    rules = {}
+    for rule_file in glob.glob(os.path.join(directory, "rules", "*.json")):
+        with open(rule_file, 'r', encoding='utf-8') as f:
+            rules[os.path.splitext(os.path.basename(rule_file))[0]] = json.load(f)
+    return os.path.basename(path), index, rules
+
+
+def content_hash(index, rules):
+    canonical = json.dumps([index, rules], ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def make_delta(base, new):
+    """{键: 值} 之间的增量: set 为新增或修改的键，removed 为删除的键"""
+    return {
+        "set": {k: v for k, v in new.items() if base.get(k) != v},
+        "removed": sorted(k for k in base if k not in new),
+    }
+
+
+# --- 存储 ---
+class VersionStore:
+    """一个知识库目录的多版本存储"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, STORE_NAME)
+        self.data = None
+        if os.path.exists(self.path):
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                self.data = json.load(f)
+
+    def versions(self):
+        return sorted(self.data["versions"], key=version_key) if self.data else []
+
+    def current(self):
+        return self.data.get("current") if self.data else None
+
+    def _delta(self, version):
+        if not self.data or version not in self.data["versions"]:
+            known = ", ".join(self.versions()) or "无"
+            raise KeyError(f"{self.directory} 没有记录版本 {version}（已记录: {known}）")
+        return self.data["versions"][version]
+
+    def record(self, version, index_name, index, rules, is_current):
+        """记录一个版本；第一个记录的版本成为基准快照，已存在的版本会被覆盖"""
+        if self.data is None:
+            self.data = {"format": STORE_FORMAT, "index_name": index_name, "current": None,
+                         "base": {"version": version, "index": index, "rules": rules}, "versions": {}}
+        base = self.data["base"]
+        self.data["versions"][version] = {
+            "recorded": datetime.date.today().isoformat(),
+            "hash": content_hash(index, rules),
+            "index": make_delta(base["index"], index),
+            "rules": make_delta(base["rules"], rules),
+        }
+        if is_current:
+            self.data["current"] = version
+        return self.data["versions"][version]
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _resolve(self, section, key, version):
+        delta = self._delta(version)[section]
+        if key in delta["set"]:
+            return delta["set"][key]
+        if key in delta["removed"]:
+            return None
+        return self.data["base"][section].get(key)
+
+    def _materialize(self, section, version):
+        delta = self._delta(version)[section]
+        removed = set(delta["removed"])
+        result = {k: v for k, v in self.data["base"][section].items() if k not in removed}
+        result.update(delta["set"])
+        return result
+
+    def index(self, version):
+        return self._materialize("index", version)
+
+    def rules(self, version):
+        return self._materialize("rules", version)
+
+    def entry(self, name, version):
+        return self._resolve("index", name, version)
+
+    def rule(self, name, version):
+        data = self._resolve("rules", sanitize_filename(name), version)
+        return unwrap_rule(data, name) if data is not None else None
+
+
+@lru_cache(maxsize=None)
+def open_store(target, data_dir=DATA_DIR):
+    return VersionStore(target_dir(target, data_dir))
+
+
+def load_rule_as_of(target, rule_name, version, data_dir=DATA_DIR):
+    """规则在指定版本中的 {"description", "option"}；该版本没有这条规则时返回 None"""
+    return open_store(target, data_dir).rule(rule_name, version)
+
+
+# --- 比较 ---
+def option_entries(option):
+    """把 option 拆成 {配置项名: 内容}；dict 直接按键，文本按可识别的配置项行，无法识别时整体作为一项"""
+    if isinstance(option, dict):
+        return {k: json.dumps(v, ensure_ascii=False, sort_keys=True) for k, v in option.items()}
+    entries = {}
+    for line in (option or "").splitlines():
+        m = OPTION_LINE.match(line)
+        if m:
+            entries[m.group(1)] = line
+    return entries or ({"<option>": option} if option else {})
+
+
+def diff_versions(store, old, new):
+    old_index, new_index = store.index(old), store.index(new)
+    old_rules, new_rules = store.rules(old), store.rules(new)
+    old_names = {sanitize_filename(n): n for n in old_index}
+    new_names = {sanitize_filename(n): n for n in new_index}
+
+    result = {"from": old, "to": new, "added": [], "removed": [], "changed": {}}
+    for stem in sorted(set(old_names) | set(new_names)):
+        if stem not in old_names:
+            result["added"].append(new_names[stem])
+            continue
+        if stem not in new_names:
+            result["removed"].append(old_names[stem])
+            continue
+        name = new_names[stem]
+        before = unwrap_rule(old_rules.get(stem) or {}, name)
+        after = unwrap_rule(new_rules.get(stem) or {}, name)
+        changes = {}
+        if old_index[old_names[stem]] != new_index[name] or before.get("description") != after.get("description"):
+            changes["description"] = True
+        old_opts, new_opts = option_entries(before.get("option")), option_entries(after.get("option"))
+        options = {
+            "added": sorted(k for k in new_opts if k not in old_opts),
+            "removed": sorted(k for k in old_opts if k not in new_opts),
+            "changed": sorted(k for k in new_opts if k in old_opts and old_opts[k] != new_opts[k]),
+        }
+        if any(options.values()):
+            changes["options"] = {k: v for k, v in options.items() if v}
+        if changes:
+            result["changed"][name] = changes
+    return result
+
+
+def print_diff(diff):
+    print(f"{diff['from']} -> {diff['to']}: 新增 {len(diff['added'])}，删除 {len(diff['removed'])}，"
+          f"修改 {len(diff['changed'])} 条规则")
+    for name in diff["added"]:
+        print(f"  + {name}")
+    for name in diff["removed"]:
+        print(f"  - {name}")
+    for name, changes in diff["changed"].items():
+        parts = ["描述"] if changes.get("description") else []
+        for kind, sign in (("added", "+"), ("removed", "-"), ("changed", "~")):
+            parts += [f"{sign}{k}" for k in changes.get("options", {}).get(kind, [])]
+        print(f"  ~ {name}: {', '.join(parts)}")
+
+
+# --- 导出 ---
+def export(store, version, dest):
+    """把指定版本还原为普通的知识库目录（索引 + rules/），可直接作为 data/<Linter> 使用"""
+    rules_dir = os.path.join(dest, "rules")
+    os.makedirs(rules_dir, exist_ok=True)
+    with open(os.path.join(dest, store.data["index_name"]), 'w', encoding='utf-8') as f:
+        json.dump(store.index(version), f, ensure_ascii=False, indent=4)
+    rules = store.rules(version)
+    for stem, data in rules.items():
+        with open(os.path.join(rules_dir, f"{stem}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    return len(rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多版本知识库：记录、查询与比较 Linter 各版本的规则")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_snapshot = sub.add_parser("snapshot", help="把知识库目录记录为某个版本")
+    p_snapshot.add_argument("target", help="例如 Checkstyle、PMD/Java")
+    p_snapshot.add_argument("version")
+    p_snapshot.add_argument("--from", dest="source", default=None,
+                            help="从其他目录（如 build/kb/Checkstyle）读取该版本；默认读取 data/ 中的当前文件并记为 current")
+    p_list = sub.add_parser("list", help="列出已记录的版本")
+    p_list.add_argument("target")
+    p_show = sub.add_parser("show", help="查询一条规则在某个版本中的内容")
+    p_show.add_argument("target")
+    p_show.add_argument("rule")
+    p_show.add_argument("--version", default=None, help="默认为 current")
+    p_diff = sub.add_parser("diff", help="比较两个版本的规则与配置项")
+    p_diff.add_argument("target")
+    p_diff.add_argument("old")
+    p_diff.add_argument("new", nargs="?", default=None, help="默认为 current")
+    p_diff.add_argument("--json", action="store_true", help="以 JSON 输出")
+    p_export = sub.add_parser("export", help="把某个版本还原为普通知识库目录")
+    p_export.add_argument("target")
+    p_export.add_argument("version")
+    p_export.add_argument("dest")
+    args = parser.parse_args()
+
+    try:
+        store = VersionStore(target_dir(args.target, args.data_dir))
+        if args.command == "snapshot":
+            index_name, index, rules = read_snapshot(args.source or store.directory)
+            delta = store.record(args.version, index_name, index, rules, args.source is None)
+            store.save()
+            changed = sum(len(delta[s]["set"]) + len(delta[s]["removed"]) for s in ("index", "rules"))
+            print(f"{args.target} {args.version}: {len(index)} 条规则，相对基准 {store.data['base']['version']} "
+                  f"有 {changed} 处增量，{STORE_NAME} {os.path.getsize(store.path) / 1024:.1f} KB")
+            return 0
+
+        if store.data is None:
+            print(f"{args.target} 还没有记录任何版本，先运行 snapshot")
+            return 1
+
+        if args.command == "list":
+            base = store.data["base"]["version"]
+            for version in store.versions():
+                delta = store.data["versions"][version]
+                marks = [m for m, on in (("base", version == base), ("current", version == store.current())) if on]
+                changes = len(delta["rules"]["set"]) + len(delta["rules"]["removed"])
+                print(f"  {version:<16}{delta['recorded']:<12}增量 {changes:>5} 条规则  {' '.join(marks)}")
+            return 0
+
+        if args.command == "show":
+            version = args.version or store.current()
+            rule = store.rule(args.rule, version)
+            if rule is None:
+                print(f"{args.target} {version} 中不存在规则: {args.rule}")
+                return 1
+            print(json.dumps({"version": version, "index": store.entry(args.rule, version), "rule": rule},
+                             ensure_ascii=False, indent=4))
+            return 0
+
+        if args.command == "diff":
+            diff = diff_versions(store, args.old, args.new or store.current())
+            if args.json:
+                print(json.dumps(diff, ensure_ascii=False, indent=4))
+            else:
+                print_diff(diff)
+            return 0
+
+        count = export(store, args.version, args.dest)
+        print(f"已导出 {args.target} {args.version}: {count} 条规则 -> {args.dest}")
+        return 0
+    except (ValueError, KeyError, OSError) as e:
+        print(f"错误: {e.args[0] if isinstance(e, KeyError) else e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+
+from lint_runner import LINTERS, collect_files, lint_template, resolve_linter, run_linter
+
+# Step 5 修复循环中的监听模式：监听 CodeFilePath，合并短时间内的多次保存，
+# 只对变化的文件重新 lint，并以 JSON Lines 输出新增 / 已修复的违规。
+# Linux 下使用 inotify，其他平台退回到轮询 mtime。
+# 用法示例:
+# python scripts/watch.py --linter Ruff --config output/ruff.toml src/
+
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL = 1.0
+# 持续有事件（如构建目录不断写入）时，最多合并这么久就开始 lint
+MAX_BATCH_SECONDS = 5.0
+
+# --- inotify 常量 (linux/inotify.h) ---
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """基于 inotify 的递归目录监听（通过 ctypes 调用 libc，无额外依赖）"""
+
+    def __init__(self, paths):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.watches = {}
+        for path in paths:
+            if os.path.isdir(path):
+                for root, dirs, _ in os.walk(os.path.abspath(path)):
+                    dirs[:] = [d for d in dirs if not d.startswith('.') and d != "node_modules"]
+                    self.add_watch(root)
+            else:
+                # 单个文件：监听其所在目录，事件按文件名过滤
+                self.add_watch(os.path.dirname(os.path.abspath(path)))
+
+    def add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = directory
+
+    def read(self, timeout):
+        """等待最多 timeout 秒，返回变化的文件路径集合；超时没有任何事件时返回 None"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        changed = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            directory = self.watches.get(wd)
+            if not directory or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watch(path)
+                continue
+            changed.add(os.path.normpath(path))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """非 Linux 平台的兜底实现：定期比较文件 mtime"""
+
+    def __init__(self, paths, linter):
+        self.paths = paths
+        self.linter = linter
+        self.mtimes = self.scan()
+
+    def scan(self):
+        mtimes = {}
+        for path in collect_files(self.paths, self.linter):
+            try:
+                mtimes[os.path.abspath(path)] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def read(self, timeout):
+        time.sleep(POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL))
+        current = self.scan()
+        changed = {p for p in current if current[p] != self.mtimes.get(p)}
+        changed |= set(self.mtimes) - set(current)
+        self.mtimes = current
+        return changed or None
+
+    def close(self):
+        pass
+
+
+def violation_key(v):
+    # 不使用行号：在文件上方插入代码会让下方所有违规的行号变化
+    return v["rule"], v["message"]
+
+
+def diff_violations(old, new):
+    """按 (rule, message) 计数比较同一文件的前后违规，返回 (新增, 已修复)"""
+    old_counts = Counter(map(violation_key, old))
+    added = []
+    for v in new:
+        if old_counts[violation_key(v)] > 0:
+            old_counts[violation_key(v)] -= 1
+        else:
+            added.append(v)
+    new_counts = Counter(map(violation_key, new))
+    fixed = []
+    for v in old:
+        if new_counts[violation_key(v)] > 0:
+            new_counts[violation_key(v)] -= 1
+        else:
+            fixed.append(v)
+    return added, fixed
+
+
+def emit(event, **payload):
+    print(json.dumps(dict(event=event, **payload), ensure_ascii=False), flush=True)
+
+
+def group_by_file(violations):
+    """RuboCop、Pylint 等输出相对于工作目录的路径，统一为绝对路径后才能与 inotify 事件中的路径对应"""
+    grouped = {}
+    for v in violations:
+        grouped.setdefault(os.path.abspath(v["file"]), []).append(v)
+    return grouped
+
+
+def make_filter(paths, extensions):
+    """只接受监听目录下、或显式给出的文件"""
+    dirs = tuple(os.path.join(os.path.abspath(p), "") for p in paths if os.path.isdir(p))
+    explicit = {os.path.abspath(p) for p in paths if not os.path.isdir(p)}
+    return lambda p: p.endswith(extensions) and (p in explicit or p.startswith(dirs))
+
+
+def watch(linter, config, paths, debounce):
+    linter = resolve_linter(linter)
+    accept = make_filter(paths, tuple(LINTERS[linter]["extensions"]))
+    # 统一使用绝对路径，与 inotify 事件中的路径保持一致
+    files = [os.path.abspath(f) for f in collect_files(paths, linter)]
+    state = group_by_file(run_linter(linter, config, files, warm=True))
+    for f in files:
+        state.setdefault(f, [])
+    emit("baseline", files=len(files), violations=sum(len(v) for v in state.values()),
+         command=lint_template(linter, warm=True)[0])
+
+    watcher = InotifyWatcher(paths) if sys.platform.startswith("linux") else PollingWatcher(paths, linter)
+    pending, first_seen = set(), None
+    try:
+        while True:
+            # 有待处理的变更时只等待 debounce 秒，期间有任何事件（包括被过滤掉的编辑器临时文件）都继续合并
+            changed = watcher.read(debounce if pending else None)
+            if changed is not None:
+                pending |= {p for p in changed if accept(p)}
+                if pending and first_seen is None:
+                    first_seen = time.perf_counter()
+                if not pending or time.perf_counter() - first_seen < MAX_BATCH_SECONDS:
+                    continue
+            if not pending:
+                continue
+
+            start = time.perf_counter()
+            existing = sorted(p for p in pending if os.path.exists(p))
+            try:
+                current = group_by_file(run_linter(linter, config, existing, warm=True)) if existing else {}
+            except RuntimeError as e:
+                # 例如文件保存到一半导致 Linter 崩溃；保留原有状态，下次保存时重试
+                emit("error", files=len(pending), message=str(e))
+                pending, first_seen = set(), None
+                continue
+            total_added = total_fixed = 0
+            for path in sorted(pending):
+                added, fixed = diff_violations(state.get(path, []), current.get(path, []))
+                for v in added:
+                    emit("new", violation=v)
+                for v in fixed:
+                    emit("fixed", violation=v)
+                total_added += len(added)
+                total_fixed += len(fixed)
+                if path in current or os.path.exists(path):
+                    state[path] = current.get(path, [])
+                else:
+                    state.pop(path, None)
+            emit("summary", files=len(pending), new=total_added, fixed=total_fixed,
+                 violations=sum(len(v) for v in state.values()),
+                 seconds=round(time.perf_counter() - start, 3))
+            pending, first_seen = set(), None
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="监听代码变化并增量重新 lint")
+    parser.add_argument("--linter", required=True)
+    parser.add_argument("--config", required=True)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="合并连续保存的静默时间（秒）")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    try:
+        watch(args.linter, args.config, args.paths, args.debounce)
+    except RuntimeError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
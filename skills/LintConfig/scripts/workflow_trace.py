@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# 工作流追踪：记录 SKILL.md 五个步骤及其子操作的耗时，导出为 Chrome trace-event JSON，
+# 可用 chrome://tracing、Perfetto (ui.perfetto.dev，本地打开文件不上传) 或 speedscope 查看。
+#   步骤       extraction / Prompt_Parse_CodingStandard / Prompt_Configure_Linter / linting / repair
+#   子操作     索引读取、规则文件读取（字节数）、模型调用（token 数）、Linter 运行（墙钟时间）
+# 设置环境变量 LINTCONFIG_TRACE=<事件文件> 后启用；未设置时各脚本中的 span() 不做任何事。
+# 各进程把事件逐行追加到同一个事件文件（JSONL），export 时合并为一个 trace。
+# 用法示例:
+# export LINTCONFIG_TRACE=skills/LintConfig/output/trace.jsonl
+# python scripts/workflow_trace.py reset
+# python scripts/workflow_trace.py begin extraction
+# python scripts/workflow_trace.py end extraction
+# python scripts/workflow_trace.py begin Prompt_Parse_CodingStandard
+# python scripts/workflow_trace.py model --step Prompt_Parse_CodingStandard --duration 12.5 --input-file prompt.md --output-file rules.json
+# python scripts/workflow_trace.py end Prompt_Parse_CodingStandard
+# python scripts/workflow_trace.py export --output skills/LintConfig/output/trace.json
+
+# --- 配置 ---
+TRACE_ENV = "LINTCONFIG_TRACE"
+STEPS = ["extraction", "Prompt_Parse_CodingStandard", "Prompt_Configure_Linter", "linting", "repair"]
+# 步骤与模型调用由多次独立的 CLI 调用记录，放在固定的虚拟进程中，使 begin / end 能配对
+WORKFLOW_PID = 0
+STEP_TID = 1
+MODEL_TID = 2
+TOP_SPANS = 10
+
+
+def trace_file():
+    return os.environ.get(TRACE_ENV) or None
+
+
+def now_us():
+    return time.time_ns() // 1000
+
+
+_lock = threading.Lock()
+_named = set()
+
+
+def emit(event):
+    """追加一个事件；多个进程同时写入时，单行 O_APPEND 写入不会交错"""
+    path = trace_file()
+    if not path:
+        return
+    line = json.dumps(event, ensure_ascii=False) + "\n"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _lock:
+        pid = event.get("pid")
+        if pid != WORKFLOW_PID and pid not in _named:
+            # 每个脚本进程第一次写事件时附带进程名，查看器中按脚本区分泳道
+            _named.add(pid)
+            name = " ".join([os.path.basename(sys.argv[0])] + sys.argv[1:3])
+            line = json.dumps({"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                               "args": {"name": name}}, ensure_ascii=False) + "\n" + line
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+@contextmanager
+def span(name, cat, **args):
+    """
+    记录一个完整事件 (ph "X")；yield 出的 dict 可在块内补充参数（如读取的字节数）。
+    未启用追踪时直接返回，开销只有一次环境变量查询。
+    """
+    if not trace_file():
+        yield args
+        return
+    start = now_us()
+    try:
+        yield args
+    finally:
+        emit({"ph": "X", "name": name, "cat": cat, "ts": start, "dur": now_us() - start,
+              "pid": os.getpid(), "tid": threading.get_native_id(), "args": args})
+
+
+# --- 导出 ---
+def read_events(path):
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue    # 进程被中断时最后一行可能不完整
+    return events
+
+
+def close_open_steps(events):
+    """未 end 的步骤（中途失败）在最后一个事件处补上 E，避免查看器中无限延长"""
+    open_steps = {}
+    for e in events:
+        if e.get("pid") == WORKFLOW_PID and e.get("ph") in ("B", "E"):
+            key = (e["tid"], e["name"])
+            open_steps[key] = open_steps.get(key, 0) + (1 if e["ph"] == "B" else -1)
+    last = max((e.get("ts", 0) + e.get("dur", 0) for e in events), default=0)
+    return [{"ph": "E", "name": name, "cat": "step", "ts": last, "pid": WORKFLOW_PID, "tid": tid,
+             "args": {"unfinished": True}}
+            for (tid, name), n in open_steps.items() for _ in range(max(n, 0))]
+
+
+def to_chrome_trace(events):
+    metadata = [
+        {"ph": "M", "name": "process_name", "pid": WORKFLOW_PID, "tid": 0, "args": {"name": "LintConfig workflow"}},
+        {"ph": "M", "name": "thread_name", "pid": WORKFLOW_PID, "tid": STEP_TID, "args": {"name": "steps"}},
+        {"ph": "M", "name": "thread_name", "pid": WORKFLOW_PID, "tid": MODEL_TID, "args": {"name": "model calls"}},
+    ]
+    events = events + close_open_steps(events)
+    return {"traceEvents": metadata + sorted(events, key=lambda e: (e.get("ts", 0), e.get("ph") != "B")),
+            "displayTimeUnit": "ms"}
+
+
+def summarize(events):
+    """按 (cat, name) 汇总 X 事件与配对后的步骤，返回 [(cat, name, 次数, 总毫秒)]，按总耗时降序"""
+    totals = {}
+    starts = {}
+    for e in sorted(events, key=lambda e: e.get("ts", 0)):
+        if e.get("ph") == "X":
+            key, dur = (e.get("cat"), e["name"]), e.get("dur", 0)
+        elif e.get("ph") == "B":
+            starts.setdefault((e["tid"], e["name"]), []).append(e["ts"])
+            continue
+        elif e.get("ph") == "E" and starts.get((e["tid"], e["name"])):
+            key, dur = (e.get("cat"), e["name"]), e["ts"] - starts[(e["tid"], e["name"])].pop()
+        else:
+            continue
+        count, total = totals.get(key, (0, 0))
+        totals[key] = (count + 1, total + dur)
+    return sorted(((cat, name, count, total / 1000) for (cat, name), (count, total) in totals.items()),
+                  key=lambda item: -item[3])
+
+
+# --- 命令行 ---
+def step_name(value):
+    """接受步骤名（不区分大小写）或序号 1-5"""
+    if value.isdigit() and 1 <= int(value) <= len(STEPS):
+        return STEPS[int(value) - 1]
+    for step in STEPS:
+        if step.lower() == value.lower():
+            return step
+    raise argparse.ArgumentTypeError(f"未知步骤 {value}，可选: {', '.join(STEPS)} 或 1-{len(STEPS)}")
+
+
+def read_tokens(path):
+    from rule_views import count_tokens
+    with open(path, 'r', encoding='utf-8') as f:
+        return count_tokens(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="记录 LintConfig 工作流的步骤耗时并导出 Chrome trace")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("reset", help="清空事件文件，开始新的一次追踪")
+    for name in ("begin", "end"):
+        p = sub.add_parser(name, help=f"标记步骤{'开始' if name == 'begin' else '结束'}")
+        p.add_argument("step", type=step_name)
+    p = sub.add_parser("model", help="记录一次模型调用")
+    p.add_argument("--step", type=step_name, required=True)
+    p.add_argument("--duration", type=float, required=True, help="调用耗时（秒），记为刚刚结束的调用")
+    p.add_argument("--input-tokens", type=int)
+    p.add_argument("--output-tokens", type=int)
+    p.add_argument("--input-file", nargs="+", default=[], help="未给出 token 数时按文件内容估算输入 token")
+    p.add_argument("--output-file", nargs="+", default=[])
+    p = sub.add_parser("export", help="导出为 Chrome trace-event JSON")
+    p.add_argument("--output", default=None, help="默认与事件文件同名，扩展名 .json")
+    args = parser.parse_args()
+
+    path = trace_file()
+    if not path:
+        print(f"错误: 未设置环境变量 {TRACE_ENV}（事件文件路径）")
+        return 2
+
+    if args.command == "reset":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        open(path, 'w').close()
+        print(f"追踪事件文件: {path}")
+    elif args.command in ("begin", "end"):
+        emit({"ph": args.command[0].upper(), "name": args.step, "cat": "step", "ts": now_us(),
+              "pid": WORKFLOW_PID, "tid": STEP_TID, "args": {}})
+    elif args.command == "model":
+        try:
+            input_tokens = args.input_tokens if args.input_tokens is not None else \
+                sum(read_tokens(f) for f in args.input_file)
+            output_tokens = args.output_tokens if args.output_tokens is not None else \
+                sum(read_tokens(f) for f in args.output_file)
+        except OSError as e:
+            print(f"错误: {e}")
+            return 2
+        dur = int(args.duration * 1_000_000)
+        emit({"ph": "X", "name": f"model: {args.step}", "cat": "model", "ts": now_us() - dur, "dur": dur,
+              "pid": WORKFLOW_PID, "tid": MODEL_TID,
+              "args": {"step": args.step, "input_tokens": input_tokens, "output_tokens": output_tokens}})
+    elif args.command == "export":
+        if not os.path.exists(path):
+            print(f"错误: 事件文件 {path} 不存在")
+            return 2
+        events = read_events(path)
+        output = args.output or os.path.splitext(path)[0] + ".json"
+        if os.path.abspath(output) == os.path.abspath(path):
+            output = os.path.splitext(path)[0] + ".trace.json"
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(to_chrome_trace(events), f, ensure_ascii=False)
+        print(f"共 {len(events)} 个事件，已导出 {output}")
+        print("耗时最多的操作:")
+        for cat, name, count, total_ms in summarize(events)[:TOP_SPANS]:
+            print(f"  {total_ms:10.1f} ms  {count:4d}x  [{cat}] {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
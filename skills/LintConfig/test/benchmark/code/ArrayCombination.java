@@ -0,0 +1,38 @@
+package com.example.combination;
+
+import java.util.ArrayList;
+import java.util.List;
+
+public class ArrayCombination {
+
+    public static List<List<Integer>> combine(int[] values, int size) {
+        List<List<Integer>> result = new ArrayList<>();
+        if (size <= 0 || size > values.length) return result;
+        backtrack(values, size, 0, new ArrayList<>(), result);
+        return result;
+    }
+
+    private static void backtrack(int[] values, int size, int start, List<Integer> current, List<List<Integer>> result) {
+        if (current.size() == size) {
+            result.add(new ArrayList<>(current));
+            return;
+        }
+        for (int i = start; i < values.length; i++) {
+            current.add(values[i]);
+            backtrack(values, size, i + 1, current, result);
+            current.remove(current.size() - 1);
+        }
+    }
+
+    public static String describe(int[] values, int size) {
+        return "combinations of " + values.length + " values taken " + size +
+            " at a time: " + combine(values, size).size();
+    }
+
+    public static void main(String[] args) {
+        int[] values = {1, 2, 3, 4};
+        for (List<Integer> combination : combine(values, 2))
+            System.out.println(combination);
+        System.out.println(describe(values, 2));
+    }
+}